@@ -5,6 +5,10 @@ from dotenv import load_dotenv
 from app.database.run_migrations import run_all_migrations
 from app.database.run_seeders import run_all_seeders
 from app.routes import register_blueprints
+from app.routes.wire_format import install_json_provider
+from app.routes.compression import install_compression
+from app.routes.static_assets import static_assets
+from app.services.provider_health_service import provider_health
 
 load_dotenv()
 
@@ -15,9 +19,16 @@ def create_app():
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
     app.config['DEBUG'] = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
 
+    # orjson kuruluysa hızlı JSON sağlayıcısı
+    install_json_provider(app)
+
     # Blueprint'leri kaydet
     register_blueprints(app)
 
+    # Yanıt sıkıştırma ve parmak izli / önceden sıkıştırılmış static dosyalar
+    install_compression(app)
+    static_assets.init_app(app)
+
     # Gunicorn logger ile entegre
     gunicorn_logger = logging.getLogger('gunicorn.error')
     app.logger.handlers = gunicorn_logger.handlers
@@ -32,4 +43,7 @@ def create_app():
     run_all_seeders()
     app.logger.info("Database seeders completed.")
 
+    # Provider sağlık kontrolleri (arka plan, hafif probe)
+    provider_health.start()
+
     return app
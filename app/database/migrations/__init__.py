@@ -9,6 +9,11 @@ from .migration_0001_users import run_migration as users_migration_run
 from .migration_0002_categories import run_migration as categories_migration_run
 from .migration_0003_chats import run_migration as chats_migration_run
 from .migration_0004_messages import run_migration as messages_migration_run, drop_messages_table
+from .migration_0005_api_keys import run_migration as api_keys_migration_run, drop_model_api_keys_table
+from .migration_0006_provider_calls import run_migration as provider_calls_migration_run, drop_provider_calls_table
+from .migration_0007_auto_routing import run_migration as auto_routing_migration_run
+from .migration_0008_message_checkpoints import run_migration as message_checkpoints_migration_run
+from .migration_0009_message_window_index import run_migration as message_window_index_migration_run
 
 __all__ = [
     'create_models_table',
@@ -18,4 +23,11 @@ __all__ = [
     'chats_migration_run',
     'messages_migration_run',
     'drop_messages_table',
+    'api_keys_migration_run',
+    'drop_model_api_keys_table',
+    'provider_calls_migration_run',
+    'drop_provider_calls_table',
+    'auto_routing_migration_run',
+    'message_checkpoints_migration_run',
+    'message_window_index_migration_run',
 ]
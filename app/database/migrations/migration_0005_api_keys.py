@@ -0,0 +1,76 @@
+# =============================================================================
+# 0005 MODEL API KEYS MIGRATION
+# =============================================================================
+# Bu dosya, model_api_keys tablosunun oluşturulması için migration işlemlerini
+# tanımlar. Bir model (model_id) ya da bir provider'ın tüm modelleri
+# (provider_type, model_id NULL) için birden fazla API anahtarı tutulur.
+# =============================================================================
+
+from app.database.db_connection import execute_query
+
+
+def create_model_api_keys_table():
+    """
+    model_api_keys tablosunu oluşturur.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        create_sql = """
+            CREATE TABLE IF NOT EXISTS model_api_keys (
+                key_id INT AUTO_INCREMENT PRIMARY KEY,
+                model_id INT NULL,
+                provider_type ENUM('gemini', 'openrouter', 'openai', 'anthropic') NULL,
+                api_key VARCHAR(500) NOT NULL,
+                label VARCHAR(100) NULL,
+                is_active BOOLEAN DEFAULT TRUE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+                -- Foreign key constraints
+                FOREIGN KEY (model_id) REFERENCES models(model_id) ON DELETE CASCADE,
+
+                -- Indexler
+                INDEX idx_model_id (model_id),
+                INDEX idx_provider_type (provider_type),
+                INDEX idx_is_active (is_active)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+
+        execute_query(create_sql, fetch=False)
+        return True
+
+    except Exception as e:
+        return False
+
+
+def drop_model_api_keys_table():
+    """
+    model_api_keys tablosunu siler.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        execute_query("DROP TABLE IF EXISTS model_api_keys", fetch=False)
+        return True
+
+    except Exception as e:
+        return False
+
+
+def run_migration():
+    """
+    Migration'ı çalıştırır.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        if not create_model_api_keys_table():
+            return False
+        return True
+
+    except Exception as e:
+        return False
@@ -0,0 +1,82 @@
+# =============================================================================
+# 0006 PROVIDER CALLS MIGRATION
+# =============================================================================
+# Bu dosya, provider_calls (telemetri) tablosunun oluşturulması için migration
+# işlemlerini tanımlar. Her provider çağrısı için gecikme, ilk token süresi ve
+# token kullanımı tutulur; kayıtlar uygulamada toplu (batch) yazılır.
+# =============================================================================
+
+from app.database.db_connection import execute_query
+
+
+def create_provider_calls_table():
+    """
+    provider_calls tablosunu oluşturur.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        create_sql = """
+            CREATE TABLE IF NOT EXISTS provider_calls (
+                call_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                model_id INT NULL,
+                provider_type VARCHAR(50) NOT NULL,
+                request_model_name VARCHAR(255) NULL,
+                chat_id VARCHAR(255) NULL,
+                user_id INT NULL,
+                status VARCHAR(20) NOT NULL,
+                status_code SMALLINT NULL,
+                latency_ms INT NOT NULL,
+                ttft_ms INT NULL,
+                prompt_tokens INT NULL,
+                completion_tokens INT NULL,
+                total_tokens INT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+                -- Foreign key constraints
+                FOREIGN KEY (model_id) REFERENCES models(model_id) ON DELETE SET NULL,
+
+                -- Indexler
+                INDEX idx_created_at (created_at),
+                INDEX idx_model_created (model_id, created_at),
+                INDEX idx_provider_type (provider_type)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+
+        execute_query(create_sql, fetch=False)
+        return True
+
+    except Exception as e:
+        return False
+
+
+def drop_provider_calls_table():
+    """
+    provider_calls tablosunu siler.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        execute_query("DROP TABLE IF EXISTS provider_calls", fetch=False)
+        return True
+
+    except Exception as e:
+        return False
+
+
+def run_migration():
+    """
+    Migration'ı çalıştırır.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        if not create_provider_calls_table():
+            return False
+        return True
+
+    except Exception as e:
+        return False
@@ -0,0 +1,51 @@
+# =============================================================================
+# 0007 AUTO ROUTING MIGRATION
+# =============================================================================
+# Kategori bazlı otomatik model yönlendirmesi için şema değişiklikleri:
+# - chats.route_category_id: sohbet "auto" modundaysa modelin seçileceği kategori
+# - messages.route_reason: yanıtı veren modelin neden seçildiği
+# =============================================================================
+
+from app.database.db_connection import execute_query
+from app.database.migrations.migration_0002_categories import _check_if_exists
+
+
+def alter_tables_add_routing_columns():
+    """
+    chats ve messages tablolarına yönlendirme sütunlarını ekler.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        if not _check_if_exists('chats', column_name='route_category_id'):
+            execute_query("ALTER TABLE chats ADD COLUMN route_category_id INT NULL AFTER model_id", fetch=False)
+
+        if not _check_if_exists('chats', constraint_name='fk_chats_route_category'):
+            execute_query(
+                "ALTER TABLE chats ADD CONSTRAINT fk_chats_route_category FOREIGN KEY (route_category_id) REFERENCES categories(category_id) ON DELETE SET NULL",
+                fetch=False
+            )
+
+        if not _check_if_exists('messages', column_name='route_reason'):
+            execute_query("ALTER TABLE messages ADD COLUMN route_reason VARCHAR(255) NULL AFTER model_id", fetch=False)
+
+        return True
+    except Exception as e:
+        return False
+
+
+def run_migration():
+    """
+    Migration'ı çalıştırır.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        if not alter_tables_add_routing_columns():
+            return False
+        return True
+
+    except Exception as e:
+        return False
@@ -0,0 +1,44 @@
+# =============================================================================
+# 0008 MESSAGE CHECKPOINTS MIGRATION
+# =============================================================================
+# Uzun yanıtların üretim sırasında mesaj satırına periyodik olarak
+# kaydedilmesi (checkpoint) için şema değişikliği:
+# - messages.is_complete: FALSE ise satır henüz tamamlanmamış (kısmi) bir yanıttır
+# =============================================================================
+
+from app.database.db_connection import execute_query
+from app.database.migrations.migration_0002_categories import _check_if_exists
+
+
+def alter_messages_add_is_complete():
+    """
+    messages tablosuna is_complete sütununu ekler.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        if not _check_if_exists('messages', column_name='is_complete'):
+            execute_query(
+                "ALTER TABLE messages ADD COLUMN is_complete BOOLEAN NOT NULL DEFAULT TRUE AFTER is_user",
+                fetch=False
+            )
+        return True
+    except Exception as e:
+        return False
+
+
+def run_migration():
+    """
+    Migration'ı çalıştırır.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        if not alter_messages_add_is_complete():
+            return False
+        return True
+
+    except Exception as e:
+        return False
@@ -0,0 +1,43 @@
+# =============================================================================
+# 0009 MESSAGE WINDOW INDEX MIGRATION
+# =============================================================================
+# Sohbetin son N mesajını (pane hydration) sıralama yapmadan okuyabilmek için
+# messages (chat_id, created_at, message_id) bileşik index'i.
+# =============================================================================
+
+from app.database.db_connection import execute_query
+from app.database.migrations.migration_0002_categories import _check_if_exists
+
+
+def add_chat_window_index():
+    """
+    messages tablosuna idx_chat_created bileşik index'ini ekler.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        if not _check_if_exists('messages', index_name='idx_chat_created'):
+            execute_query(
+                "ALTER TABLE messages ADD INDEX idx_chat_created (chat_id, created_at, message_id)",
+                fetch=False
+            )
+        return True
+    except Exception as e:
+        return False
+
+
+def run_migration():
+    """
+    Migration'ı çalıştırır.
+
+    Returns:
+        bool: Başarılı ise True
+    """
+    try:
+        if not add_chat_window_index():
+            return False
+        return True
+
+    except Exception as e:
+        return False
@@ -10,6 +10,8 @@ from .model_category_repository import ModelCategoryRepository
 from .user_repository import UserRepository
 from .chat_repository import ChatRepository
 from .message_repository import MessageRepository
+from .api_key_repository import ApiKeyRepository
+from .telemetry_repository import TelemetryRepository
 
 __all__ = [
     'ModelRepository',
@@ -18,4 +20,6 @@ __all__ = [
     'UserRepository',
     'ChatRepository',
     'MessageRepository',
+    'ApiKeyRepository',
+    'TelemetryRepository',
 ]
@@ -0,0 +1,90 @@
+# =============================================================================
+# API KEY REPOSITORY
+# =============================================================================
+# model_api_keys tablosu için CRUD işlemlerini yönetir.
+# =============================================================================
+
+from typing import Any, Dict, List, Optional
+
+from app.database.db_connection import get_connection, get_cursor, execute_query
+
+
+class ApiKeyRepository:
+    """model_api_keys tablosu için veri erişim katmanı."""
+
+    # --------------------------- CREATE --------------------------- #
+    @staticmethod
+    def create_key(api_key: str, model_id: Optional[int] = None, provider_type: Optional[str] = None,
+                   label: Optional[str] = None, is_active: bool = True) -> Optional[int]:
+        sql = (
+            "INSERT INTO model_api_keys (model_id, provider_type, api_key, label, is_active) "
+            "VALUES (%s, %s, %s, %s, %s)"
+        )
+        conn = None
+        try:
+            conn = get_connection()
+            cur = get_cursor(conn)
+            cur.execute(sql, (model_id, provider_type, api_key, label, is_active))
+            conn.commit()
+            key_id = cur.lastrowid
+            cur.close(); conn.close()
+            return int(key_id) if key_id else None
+        except Exception as e:
+            try:
+                if conn and conn.is_connected():
+                    conn.rollback(); conn.close()
+            except Exception:
+                pass
+            return None
+
+    # --------------------------- READ --------------------------- #
+    @staticmethod
+    def list_for_model(model_id: int, provider_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Modelin kendi anahtarları ile provider geneli anahtarları (model_id NULL) birlikte döndürür.
+        """
+        sql = (
+            "SELECT key_id, model_id, provider_type, api_key, label, is_active "
+            "FROM model_api_keys WHERE is_active = TRUE AND (model_id = %s"
+        )
+        params: List[Any] = [model_id]
+        if provider_type:
+            sql += " OR (model_id IS NULL AND provider_type = %s)"
+            params.append(provider_type)
+        sql += ") ORDER BY model_id IS NULL, key_id ASC"
+        try:
+            return execute_query(sql, tuple(params), fetch=True) or []
+        except Exception as e:
+            return []
+
+    @staticmethod
+    def list_keys(model_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Admin listesi için tüm anahtarlar (opsiyonel model filtresi)."""
+        sql = "SELECT key_id, model_id, provider_type, api_key, label, is_active, created_at FROM model_api_keys"
+        params: tuple = ()
+        if model_id is not None:
+            sql += " WHERE model_id = %s"
+            params = (model_id,)
+        sql += " ORDER BY key_id ASC"
+        try:
+            return execute_query(sql, params, fetch=True) or []
+        except Exception as e:
+            return []
+
+    # --------------------------- UPDATE --------------------------- #
+    @staticmethod
+    def set_active(key_id: int, active: bool) -> bool:
+        try:
+            execute_query("UPDATE model_api_keys SET is_active = %s WHERE key_id = %s", (active, key_id), fetch=False)
+            return True
+        except Exception as e:
+            return False
+
+    # --------------------------- DELETE --------------------------- #
+    @staticmethod
+    def delete_key(key_id: int) -> bool:
+        try:
+            execute_query("DELETE FROM model_api_keys WHERE key_id = %s", (key_id,), fetch=False)
+            return True
+        except Exception as e:
+            return False
@@ -5,6 +5,7 @@
 # =============================================================================
 
 from app.database.db_connection import execute_query, get_connection, get_cursor
+from app.database.repositories.model_repository import ModelRepository
 
 
 class CategoryRepository:
@@ -24,8 +25,8 @@ class CategoryRepository:
         """Belirli bir kategoriye bağlı modelleri getirir."""
         try:
             rows = execute_query(
-                """
-                SELECT m.* FROM models m
+                f"""
+                SELECT {ModelRepository.columns(ModelRepository.LIST_COLUMNS, 'm')} FROM models m
                 INNER JOIN model_categories mc ON mc.model_id = m.model_id
                 WHERE mc.category_id = %s
                 ORDER BY m.model_name ASC
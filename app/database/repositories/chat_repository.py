@@ -14,19 +14,32 @@ from app.database.db_connection import get_connection, get_cursor, execute_query
 class ChatRepository:
     """Chats tablosu için veri erişim katmanı."""
 
+    # Chat satırı + listelenen model alanları (models tablosundan gizli alan okunmaz)
+    COLUMNS = (
+        "c.chat_id, c.user_id, c.model_id, c.route_category_id, c.title, c.is_active, "
+        "c.created_at, c.updated_at, c.last_message_at, m.model_name, m.provider_name, m.provider_type"
+    )
+    # Sohbet listesi satırları (ChatService._format_list_item) için gereken sütunlar
+    LIST_COLUMNS = (
+        "c.chat_id, c.model_id, c.title, c.is_active, c.created_at, c.updated_at, c.last_message_at, "
+        "m.model_name, m.provider_name"
+    )
+
     # --------------------------- CREATE --------------------------- #
     @staticmethod
-    def create_chat(model_id: int, title: Optional[str] = None, user_id: Optional[int] = None, chat_id: Optional[str] = None) -> Optional[str]:
+    def create_chat(model_id: int, title: Optional[str] = None, user_id: Optional[int] = None, chat_id: Optional[str] = None,
+                    route_category_id: Optional[int] = None) -> Optional[str]:
         """
         Yeni bir chat oluşturur ve chat_id'yi döndürür.
+        route_category_id verilirse sohbet o kategoride otomatik yönlendirilir.
         """
         chat_id = chat_id or str(uuid.uuid4())
         now = datetime.now()
         sql = (
-            "INSERT INTO chats (chat_id, user_id, model_id, title, is_active, created_at, updated_at) "
-            "VALUES (%s, %s, %s, %s, %s, %s, %s)"
+            "INSERT INTO chats (chat_id, user_id, model_id, route_category_id, title, is_active, created_at, updated_at) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
         )
-        params = (chat_id, user_id, model_id, title, True, now, now)
+        params = (chat_id, user_id, model_id, route_category_id, title, True, now, now)
         conn = None
         try:
             conn = get_connection()
@@ -48,7 +61,7 @@ class ChatRepository:
     @staticmethod
     def get_chat(chat_id: str, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         sql = (
-            "SELECT c.*, m.model_name, m.provider_name, m.provider_type "
+            f"SELECT {ChatRepository.COLUMNS} "
             "FROM chats c LEFT JOIN models m ON c.model_id = m.model_id "
             "WHERE c.chat_id = %s"
         )
@@ -62,13 +75,72 @@ class ChatRepository:
         except Exception as e:
             return None
 
+    @staticmethod
+    def list_search_entries(user_id: int, limit: int = 5000) -> List[Dict[str, Any]]:
+        """Sohbet araması için kullanıcının tüm sohbetlerinin başlık satırları (son mesaj sırasıyla)."""
+        sql = (
+            "SELECT c.chat_id, c.title, c.is_active, c.last_message_at, m.model_name "
+            "FROM chats c LEFT JOIN models m ON c.model_id = m.model_id "
+            "WHERE c.user_id = %s ORDER BY c.last_message_at DESC, c.created_at DESC LIMIT %s"
+        )
+        try:
+            rows = execute_query(sql, (user_id, limit), fetch=True)
+            return rows or []
+        except Exception as e:
+            return []
+
+    @staticmethod
+    def is_owner(chat_id: str, user_id: int) -> bool:
+        """Sahiplik kontrolü; satır okunmadan birincil anahtar üzerinden yapılır."""
+        try:
+            rows = execute_query("SELECT 1 AS ok FROM chats WHERE chat_id = %s AND user_id = %s",
+                                 (chat_id, user_id), fetch=True)
+            return bool(rows)
+        except Exception as e:
+            return False
+
+    @staticmethod
+    def get_sync_state(chat_id: str, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Koşullu GET (ETag) için chat'in değişim durumu: last_message_at, updated_at ve
+        mesaj sayısı. Sayım idx_chat_id üzerinden yapılır; mesaj satırları okunmaz.
+        """
+        sql = (
+            "SELECT c.chat_id, c.last_message_at, c.updated_at, "
+            "(SELECT COUNT(*) FROM messages WHERE chat_id = c.chat_id) AS message_count "
+            "FROM chats c WHERE c.chat_id = %s"
+        )
+        params = [chat_id]
+        if user_id is not None:
+            sql += " AND c.user_id = %s"
+            params.append(user_id)
+        try:
+            rows = execute_query(sql, tuple(params), fetch=True)
+            return rows[0] if rows else None
+        except Exception as e:
+            return None
+
+    @staticmethod
+    def get_chats(chat_ids: List[str], user_id: int) -> List[Dict[str, Any]]:
+        """Birden fazla chat'i tek sorguda getirir; yalnızca kullanıcının sahip olduğu chat'ler döner."""
+        if not chat_ids:
+            return []
+        placeholders = ", ".join(["%s"] * len(chat_ids))
+        sql = (
+            f"SELECT {ChatRepository.COLUMNS} "
+            "FROM chats c LEFT JOIN models m ON c.model_id = m.model_id "
+            f"WHERE c.chat_id IN ({placeholders}) AND c.user_id = %s"
+        )
+        try:
+            return execute_query(sql, tuple(chat_ids) + (user_id,), fetch=True) or []
+        except Exception as e:
+            return []
+
     @staticmethod
     def list_user_chats(user_id: int, active: Optional[bool] = True, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
         base_sql = (
-            "SELECT c.*, m.model_name, m.provider_name, "
-            "(SELECT COUNT(*) FROM messages WHERE chat_id = c.chat_id) AS message_count, "
-            "(SELECT content FROM messages WHERE chat_id = c.chat_id ORDER BY created_at DESC LIMIT 1) AS last_message_content, "
-            "(SELECT is_user FROM messages WHERE chat_id = c.chat_id ORDER BY created_at DESC LIMIT 1) AS last_message_is_user "
+            f"SELECT {ChatRepository.COLUMNS}, "
+            "(SELECT COUNT(*) FROM messages WHERE chat_id = c.chat_id) AS message_count "
             "FROM chats c LEFT JOIN models m ON c.model_id = m.model_id "
             "WHERE c.user_id = %s"
         )
@@ -85,6 +157,32 @@ class ChatRepository:
         except Exception as e:
             return []
 
+    @staticmethod
+    def list_user_chat_index(user_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Aktif ve arşiv sohbetlerin ilk sayfaları ile toplamları tek sorguda.
+        Her satırda active_total / archived_total sütunları bulunur; kullanıcının hiç
+        sohbeti yoksa liste boş döner. message_count yalnızca sayfadaki satırlar için sayılır.
+        Sorgu hatası yutulmaz, çağırana iletilir (boş liste başarılı sonuç gibi önbelleğe girmesin).
+        """
+        page_sql = (
+            "(SELECT " + ChatRepository.LIST_COLUMNS + " FROM chats c LEFT JOIN models m ON c.model_id = m.model_id "
+            "WHERE c.user_id = %s AND c.is_active = {active} "
+            "ORDER BY c.last_message_at DESC, c.created_at DESC LIMIT %s)"
+        )
+        sql = (
+            "SELECT p.chat_id, p.model_id, p.title, p.is_active, p.created_at, p.updated_at, p.last_message_at, "
+            "p.model_name, p.provider_name, "
+            "(SELECT COUNT(*) FROM messages WHERE chat_id = p.chat_id) AS message_count, "
+            "t.active_total, t.archived_total FROM ("
+            + page_sql.format(active="TRUE") + " UNION ALL " + page_sql.format(active="FALSE") +
+            ") p CROSS JOIN (SELECT COALESCE(SUM(is_active = TRUE), 0) AS active_total, "
+            "COALESCE(SUM(is_active = FALSE), 0) AS archived_total FROM chats WHERE user_id = %s) t "
+            "ORDER BY p.is_active DESC, p.last_message_at DESC, p.created_at DESC"
+        )
+        rows = execute_query(sql, (user_id, limit, user_id, limit, user_id), fetch=True)
+        return rows or []
+
     # --------------------------- UPDATE --------------------------- #
     @staticmethod
     def update_last_message_time(chat_id: str, when: Optional[datetime] = None) -> bool:
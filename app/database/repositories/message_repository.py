@@ -13,15 +13,19 @@ from app.database.db_connection import get_connection, get_cursor, execute_query
 class MessageRepository:
     """Messages tablosu için veri erişim katmanı."""
 
+    # API'nin döndürdüğü mesaj alanları
+    COLUMNS = "message_id, chat_id, model_id, route_reason, content, is_user, is_complete, timestamp, created_at"
+
     # --------------------------- CREATE --------------------------- #
     @staticmethod
-    def create_message(chat_id: str, content: str, is_user: bool, model_id: Optional[int] = None, when: Optional[datetime] = None) -> Optional[int]:
+    def create_message(chat_id: str, content: str, is_user: bool, model_id: Optional[int] = None, when: Optional[datetime] = None,
+                       route_reason: Optional[str] = None, is_complete: bool = True) -> Optional[int]:
         sql = (
-            "INSERT INTO messages (chat_id, model_id, content, is_user, timestamp, created_at) "
-            "VALUES (%s, %s, %s, %s, %s, %s)"
+            "INSERT INTO messages (chat_id, model_id, route_reason, content, is_user, is_complete, timestamp, created_at) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
         )
         when = when or datetime.now()
-        params = (chat_id, model_id, content, is_user, when, when)
+        params = (chat_id, model_id, route_reason[:255] if route_reason else None, content, is_user, is_complete, when, when)
         conn = None
         try:
             conn = get_connection()
@@ -43,7 +47,7 @@ class MessageRepository:
     @staticmethod
     def list_by_chat(chat_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         sql = (
-            "SELECT message_id, chat_id, model_id, content, is_user, timestamp, created_at "
+            f"SELECT {MessageRepository.COLUMNS} "
             "FROM messages WHERE chat_id = %s ORDER BY created_at ASC LIMIT %s OFFSET %s"
         )
         try:
@@ -52,11 +56,48 @@ class MessageRepository:
         except Exception as e:
             return []
 
+    @staticmethod
+    def list_since(chat_id: str, since_message_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """since_message_id'den sonra eklenen mesajlar (delta senkronizasyon)."""
+        sql = (
+            f"SELECT {MessageRepository.COLUMNS} "
+            "FROM messages WHERE chat_id = %s AND message_id > %s ORDER BY created_at ASC, message_id ASC LIMIT %s"
+        )
+        try:
+            rows = execute_query(sql, (chat_id, since_message_id, limit), fetch=True)
+            return rows or []
+        except Exception as e:
+            return []
+
+    @staticmethod
+    def list_latest_by_chats(chat_ids: List[str], limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Her chat için en son `limit` mesajı tek sorguda getirir (chat başına
+        idx_chat_created üzerinden ters sıralı alt sorgular, UNION ALL).
+        Sonuç chat_id ve kronolojik sıraya göre döner.
+        """
+        if not chat_ids:
+            return []
+        part = (
+            f"(SELECT {MessageRepository.COLUMNS} "
+            "FROM messages WHERE chat_id = %s ORDER BY created_at DESC, message_id DESC LIMIT %s)"
+        )
+        sql = " UNION ALL ".join([part] * len(chat_ids))
+        params: List[Any] = []
+        for chat_id in chat_ids:
+            params.extend([chat_id, limit])
+        try:
+            rows = execute_query(sql, tuple(params), fetch=True) or []
+            rows.sort(key=lambda r: (r["chat_id"], r["created_at"] or datetime.min, r["message_id"]))
+            return rows
+        except Exception as e:
+            return []
+
     @staticmethod
     def get_by_id(message_id: int) -> Optional[Dict[str, Any]]:
         try:
             rows = execute_query(
-                "SELECT * FROM messages WHERE message_id = %s",
+                f"SELECT {MessageRepository.COLUMNS} FROM messages WHERE message_id = %s",
                 (message_id,),
                 fetch=True,
             )
@@ -79,6 +120,21 @@ class MessageRepository:
         except Exception as e:
             return False
 
+    @staticmethod
+    def checkpoint_message(message_id: int, content: str, is_complete: bool = False,
+                           model_id: Optional[int] = None, route_reason: Optional[str] = None) -> bool:
+        """Üretim süren yanıtın içeriğini günceller; is_complete=True ile satırı kesinleştirir."""
+        try:
+            execute_query(
+                "UPDATE messages SET content = %s, is_complete = %s, model_id = COALESCE(%s, model_id), "
+                "route_reason = COALESCE(%s, route_reason), updated_at = CURRENT_TIMESTAMP WHERE message_id = %s",
+                (content, is_complete, model_id, route_reason[:255] if route_reason else None, message_id),
+                fetch=False,
+            )
+            return True
+        except Exception as e:
+            return False
+
     # --------------------------- DELETE --------------------------- #
     @staticmethod
     def delete_message(message_id: int) -> bool:
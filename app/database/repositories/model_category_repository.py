@@ -4,9 +4,13 @@
 # model_categories ilişki tablosu için CRUD ve toplu işlemler
 # =============================================================================
 
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict, Tuple
 from app.database.db_connection import get_connection, get_cursor, execute_query
 
+# Tek bir çok satırlı ifadede gönderilecek azami satır/parametre grubu
+# (max_allowed_packet sınırını aşmamak için)
+BULK_CHUNK_SIZE = 1000
+
 
 class ModelCategoryRepository:
     @staticmethod
@@ -104,34 +108,172 @@ class ModelCategoryRepository:
                 pass
             return False
 
+    # --------- Set-based bulk operations (tek transaction) ---------
+    @staticmethod
+    def _chunks(items: List, size: int = BULK_CHUNK_SIZE):
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
+
+    @staticmethod
+    def _insert_pairs(cur, pairs: List[Tuple[int, int]]) -> None:
+        """(model_id, category_id) çiftlerini çok satırlı INSERT IGNORE ile ekler."""
+        for chunk in ModelCategoryRepository._chunks(pairs):
+            values = ','.join(['(%s, %s)'] * len(chunk))
+            params = tuple(v for pair in chunk for v in pair)
+            cur.execute(f"INSERT IGNORE INTO model_categories (model_id, category_id) VALUES {values}", params)
+
+    @staticmethod
+    def _delete_for_models(cur, model_ids: List[int], category_ids: Optional[List[int]] = None) -> None:
+        """Verilen modellerin ilişkilerini tek DELETE ... WHERE model_id IN (...) ile siler."""
+        for chunk in ModelCategoryRepository._chunks(model_ids):
+            placeholders = ','.join(['%s'] * len(chunk))
+            sql = f"DELETE FROM model_categories WHERE model_id IN ({placeholders})"
+            params = list(chunk)
+            if category_ids is not None:
+                sql += f" AND category_id IN ({','.join(['%s'] * len(category_ids))})"
+                params.extend(category_ids)
+            cur.execute(sql, tuple(params))
+
+    @staticmethod
+    def _set_primary(cur, primary_by_model: Dict[int, int]) -> None:
+        """models.primary_category_id alanını tek UPDATE ... CASE ile günceller."""
+        items = list(primary_by_model.items())
+        for chunk in ModelCategoryRepository._chunks(items):
+            cases = ' '.join(['WHEN %s THEN %s'] * len(chunk))
+            placeholders = ','.join(['%s'] * len(chunk))
+            params = [v for pair in chunk for v in pair] + [mid for mid, _ in chunk]
+            cur.execute(
+                f"UPDATE models SET primary_category_id = CASE model_id {cases} END WHERE model_id IN ({placeholders})",
+                tuple(params)
+            )
+
+    @staticmethod
+    def apply_assignments(assignments: List[Dict[str, Any]]) -> bool:
+        """Model başına farklı kategori setlerini tek transaction içinde uygular.
+
+        assignments: [{ model_id, category_ids: [int], primary_category_id?: int }]
+        Aşamalar: tek DELETE, tek çok satırlı INSERT IGNORE, tek UPDATE (primary).
+        """
+        if not assignments:
+            return True
+        # Aynı model birden fazla gelirse son kayıt geçerlidir
+        by_model: Dict[int, Dict[str, Any]] = {}
+        for a in assignments:
+            by_model[int(a['model_id'])] = a
+
+        model_ids = list(by_model.keys())
+        pairs: List[Tuple[int, int]] = []
+        primary_by_model: Dict[int, int] = {}
+        for mid, a in by_model.items():
+            cids = {int(cid) for cid in (a.get('category_ids') or [])}
+            pcid = a.get('primary_category_id')
+            if pcid is not None:
+                pcid = int(pcid)
+                cids.add(pcid)
+                primary_by_model[mid] = pcid
+            pairs.extend((mid, cid) for cid in sorted(cids))
+
+        conn = None
+        cur = None
+        try:
+            conn = get_connection()
+            conn.start_transaction()
+            cur = get_cursor(conn)
+            ModelCategoryRepository._delete_for_models(cur, model_ids)
+            if pairs:
+                ModelCategoryRepository._insert_pairs(cur, pairs)
+            if primary_by_model:
+                ModelCategoryRepository._set_primary(cur, primary_by_model)
+            conn.commit()
+            return True
+        except Exception as e:
+            try:
+                if conn and conn.is_connected():
+                    conn.rollback()
+            except Exception:
+                pass
+            return False
+        finally:
+            try:
+                if cur:
+                    cur.close()
+                if conn and conn.is_connected():
+                    conn.close()
+            except Exception:
+                pass
+
     @staticmethod
     def bulk_replace(models: List[int], category_ids: List[int], primary_category_id: Optional[int] = None) -> bool:
+        """Tüm modellerin kategorilerini aynı set ile değiştirir (tek transaction)."""
+        if not models:
+            return True
+        assignments = [
+            {'model_id': mid, 'category_ids': category_ids or [], 'primary_category_id': primary_category_id}
+            for mid in models
+        ]
+        return ModelCategoryRepository.apply_assignments(assignments)
+
+    @staticmethod
+    def bulk_add(model_ids: List[int], category_ids: List[int]) -> bool:
+        """Tüm modellere verilen kategorileri tek çok satırlı INSERT IGNORE ile ekler."""
+        if not model_ids or not category_ids:
+            return True
+        pairs = [(int(mid), int(cid)) for mid in dict.fromkeys(model_ids) for cid in dict.fromkeys(category_ids)]
         conn = None
         cur = None
         try:
             conn = get_connection()
+            conn.start_transaction()
             cur = get_cursor(conn)
-            for mid in models:
-                # temizle
-                cur.execute("DELETE FROM model_categories WHERE model_id = %s", (mid,))
-                # ekle
-                if category_ids:
-                    vals = [(mid, int(cid)) for cid in category_ids]
-                    cur.executemany("INSERT IGNORE INTO model_categories (model_id, category_id) VALUES (%s, %s)", vals)
-                # primary
-                if primary_category_id is not None:
-                    if primary_category_id not in (category_ids or []):
-                        cur.execute("INSERT IGNORE INTO model_categories (model_id, category_id) VALUES (%s, %s)", (mid, primary_category_id))
-                    cur.execute("UPDATE models SET primary_category_id=%s WHERE model_id=%s", (primary_category_id, mid))
+            ModelCategoryRepository._insert_pairs(cur, pairs)
             conn.commit()
-            cur.close();
-            if conn and conn.is_connected():
-                conn.close()
             return True
         except Exception as e:
             try:
                 if conn and conn.is_connected():
-                    conn.rollback(); conn.close()
+                    conn.rollback()
+            except Exception:
+                pass
+            return False
+        finally:
+            try:
+                if cur:
+                    cur.close()
+                if conn and conn.is_connected():
+                    conn.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def bulk_remove(model_ids: List[int], category_ids: List[int]) -> bool:
+        """Tüm modellerden verilen kategorileri tek DELETE ile kaldırır."""
+        if not model_ids or not category_ids:
+            return True
+        conn = None
+        cur = None
+        try:
+            conn = get_connection()
+            conn.start_transaction()
+            cur = get_cursor(conn)
+            ModelCategoryRepository._delete_for_models(
+                cur,
+                [int(mid) for mid in dict.fromkeys(model_ids)],
+                [int(cid) for cid in dict.fromkeys(category_ids)]
+            )
+            conn.commit()
+            return True
+        except Exception as e:
+            try:
+                if conn and conn.is_connected():
+                    conn.rollback()
             except Exception:
                 pass
             return False
+        finally:
+            try:
+                if cur:
+                    cur.close()
+                if conn and conn.is_connected():
+                    conn.close()
+            except Exception:
+                pass
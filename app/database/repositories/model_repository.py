@@ -9,8 +9,37 @@ from app.database.db_connection import get_connection, get_cursor, execute_query
 class ModelRepository:
     """
     Models tablosu için CRUD operasyonlarını yönetir.
+
+    Sütun projeksiyonları (SELECT * yerine kullanım durumuna göre):
+    - LIST_COLUMNS: katalog / liste görünümü (herkese açık uç noktalar)
+    - DETAIL_COLUMNS: tek model düzenleme görünümü (gizli alanlar hariç)
+    - PROVIDER_COLUMNS: provider çağrısı için iç görünüm (api_key dahil; yanıtlara yazılmaz)
     """
 
+    LIST_COLUMNS = (
+        'model_id', 'model_name', 'request_model_name', 'model_type', 'provider_name', 'provider_type',
+        'logo_path', 'description', 'is_active', 'primary_category_id', 'created_at', 'updated_at',
+    )
+    DETAIL_COLUMNS = LIST_COLUMNS + ('base_url',)
+    PROVIDER_COLUMNS = DETAIL_COLUMNS + ('api_key',)
+
+    # Modelin kullanılabilir bir anahtarı var mı: models.api_key veya aktif havuz anahtarı
+    # (modele özel ya da provider geneli). Yönlendirme ve failover aynı koşulu kullanır.
+    USABLE_KEY_SQL = """(
+        (m.api_key IS NOT NULL AND m.api_key <> '')
+        OR EXISTS (
+            SELECT 1 FROM model_api_keys k
+            WHERE k.is_active = TRUE
+              AND (k.model_id = m.model_id OR (k.model_id IS NULL AND k.provider_type = m.provider_type))
+        )
+    )"""
+
+    @staticmethod
+    def columns(projection, alias=None):
+        """Projeksiyonu SELECT listesine çevirir (alias verilirse 'm.model_id' biçiminde)."""
+        prefix = f"{alias}." if alias else ""
+        return ", ".join(prefix + column for column in projection)
+
     @staticmethod
     def create_model(model_data):
         """
@@ -50,9 +79,9 @@ class ModelRepository:
     @staticmethod
     def get_all_models():
         """
-        Tüm modelleri getirir.
+        Tüm modelleri liste görünümüyle getirir (api_key, base_url içermez).
         """
-        query = "SELECT * FROM models"
+        query = f"SELECT {ModelRepository.columns(ModelRepository.LIST_COLUMNS)} FROM models"
         try:
             return execute_query(query)
         except Exception as e:
@@ -118,9 +147,10 @@ class ModelRepository:
     @staticmethod
     def get_model_by_id(model_id):
         """
-        Belirli bir ID'ye sahip modeli getirir.
+        Belirli bir ID'ye sahip modeli provider görünümüyle (api_key dahil) getirir.
+        Yalnızca sunucu içi kullanım içindir; yanıtlarda get_model_detail kullanılır.
         """
-        query = "SELECT * FROM models WHERE model_id = %s"
+        query = f"SELECT {ModelRepository.columns(ModelRepository.PROVIDER_COLUMNS)} FROM models WHERE model_id = %s"
         params = (model_id,)
         try:
             result = execute_query(query, params)
@@ -128,6 +158,18 @@ class ModelRepository:
         except Exception as e:
             return None
 
+    @staticmethod
+    def get_model_detail(model_id):
+        """
+        Belirli bir ID'ye sahip modeli detay görünümüyle (gizli alanlar hariç) getirir.
+        """
+        query = f"SELECT {ModelRepository.columns(ModelRepository.DETAIL_COLUMNS)} FROM models WHERE model_id = %s"
+        try:
+            result = execute_query(query, (model_id,))
+            return result[0] if result else None
+        except Exception as e:
+            return None
+
     @staticmethod
     def update_model(model_id, model_data):
         """
@@ -182,4 +224,134 @@ class ModelRepository:
             if connection and connection.is_connected():
                 connection.rollback()
                 connection.close()
-            return False
\ No newline at end of file
+            return False
+
+    # --------------------------- CATALOG SYNC --------------------------- #
+    @staticmethod
+    def get_models_by_provider_type(provider_type):
+        """
+        Belirli provider_type için senkronizasyonda kullanılan alanları getirir.
+        """
+        query = """
+            SELECT model_id, model_name, request_model_name, provider_name, description, is_active
+            FROM models WHERE provider_type = %s
+        """
+        try:
+            return execute_query(query, (provider_type,)) or []
+        except Exception as e:
+            return []
+
+    @staticmethod
+    def get_provider_api_key(provider_type):
+        """
+        Belirli provider_type için tanımlı ilk API anahtarını döndürür.
+        """
+        query = """
+            SELECT api_key FROM models
+            WHERE provider_type = %s AND api_key IS NOT NULL AND api_key <> ''
+            ORDER BY is_active DESC, model_id ASC
+            LIMIT 1
+        """
+        try:
+            rows = execute_query(query, (provider_type,))
+            return rows[0]['api_key'] if rows else None
+        except Exception as e:
+            return None
+
+    @staticmethod
+    def upsert_models(new_rows, changed_rows, update_fields, chunk_size=500):
+        """
+        Senkronizasyon sonucunu tek transaction içinde uygular.
+
+        new_rows: create_model ile aynı alanlara sahip yeni kayıtlar (çok satırlı INSERT)
+        changed_rows: model_id + update_fields alanlarını içeren kayıtlar
+            (model_id üzerinden çok satırlı INSERT ... ON DUPLICATE KEY UPDATE)
+        """
+        insert_cols = ['model_name', 'request_model_name', 'model_type', 'provider_name', 'provider_type',
+                       'api_key', 'base_url', 'logo_path', 'description', 'is_active']
+        # model_name/provider_name/provider_type NOT NULL olduğu için upsert satırı tam kolon setiyle gönderilir
+        upsert_cols = ['model_id', 'model_name', 'provider_name', 'provider_type'] + \
+            [f for f in update_fields if f not in ('model_name', 'provider_name', 'provider_type')]
+        connection = None
+        cursor = None
+        try:
+            connection = get_connection()
+            connection.start_transaction()
+            cursor = get_cursor(connection)
+            for i in range(0, len(new_rows), chunk_size):
+                chunk = new_rows[i:i + chunk_size]
+                row_sql = '(' + ', '.join(['%s'] * len(insert_cols)) + ')'
+                query = f"INSERT INTO models ({', '.join(insert_cols)}) VALUES {', '.join([row_sql] * len(chunk))}"
+                params = tuple(row.get(col, True if col == 'is_active' else None) for row in chunk for col in insert_cols)
+                cursor.execute(query, params)
+            for i in range(0, len(changed_rows), chunk_size):
+                chunk = changed_rows[i:i + chunk_size]
+                row_sql = '(' + ', '.join(['%s'] * len(upsert_cols)) + ')'
+                updates = ', '.join(f"{col} = VALUES({col})" for col in update_fields)
+                query = (
+                    f"INSERT INTO models ({', '.join(upsert_cols)}) VALUES {', '.join([row_sql] * len(chunk))} "
+                    f"ON DUPLICATE KEY UPDATE {updates}"
+                )
+                params = tuple(row.get(col) for row in chunk for col in upsert_cols)
+                cursor.execute(query, params)
+            connection.commit()
+            return True
+        except Exception as e:
+            if connection and connection.is_connected():
+                connection.rollback()
+            return False
+        finally:
+            if cursor:
+                cursor.close()
+            if connection and connection.is_connected():
+                connection.close()
+
+    # --------------------------- FAILOVER --------------------------- #
+    @staticmethod
+    def get_failover_candidates(model_id):
+        """
+        Verilen modelle en az bir kategoriyi paylaşan, farklı provider'daki
+        aktif ve kullanılabilir anahtarı olan (models.api_key veya model_api_keys
+        havuzu) modelleri getirir. Aynı primary kategoriye sahip modeller öne alınır.
+        """
+        query = f"""
+            SELECT DISTINCT m.model_id, m.model_name, m.request_model_name, m.provider_name,
+                   m.provider_type, m.api_key,
+                   (m.primary_category_id <=> src.primary_category_id) AS same_primary
+            FROM models src
+            INNER JOIN model_categories src_mc ON src_mc.model_id = src.model_id
+            INNER JOIN model_categories mc ON mc.category_id = src_mc.category_id
+            INNER JOIN models m ON m.model_id = mc.model_id
+            WHERE src.model_id = %s
+              AND m.model_id <> src.model_id
+              AND m.provider_type <> src.provider_type
+              AND m.is_active = TRUE
+              AND {ModelRepository.USABLE_KEY_SQL}
+            ORDER BY same_primary DESC, m.model_id ASC
+        """
+        try:
+            return execute_query(query, (model_id,)) or []
+        except Exception as e:
+            return []
+
+    # --------------------------- ROUTING --------------------------- #
+    @staticmethod
+    def get_routable_models(category_id):
+        """
+        Kategorideki aktif ve kullanılabilir anahtarı olan (models.api_key veya
+        model_api_keys havuzu) modelleri getirir; otomatik yönlendirme adayları.
+        """
+        query = f"""
+            SELECT m.model_id, m.model_name, m.request_model_name, m.provider_name,
+                   m.provider_type, m.api_key
+            FROM model_categories mc
+            INNER JOIN models m ON m.model_id = mc.model_id
+            WHERE mc.category_id = %s
+              AND m.is_active = TRUE
+              AND {ModelRepository.USABLE_KEY_SQL}
+            ORDER BY m.model_id ASC
+        """
+        try:
+            return execute_query(query, (category_id,)) or []
+        except Exception as e:
+            return []
@@ -0,0 +1,76 @@
+# =============================================================================
+# TELEMETRY REPOSITORY
+# =============================================================================
+# provider_calls tablosu için toplu yazma ve okuma işlemlerini yönetir.
+# =============================================================================
+
+from typing import Any, Dict, List
+
+from app.database.db_connection import get_connection, get_cursor, execute_query
+
+
+class TelemetryRepository:
+    """provider_calls tablosu için veri erişim katmanı."""
+
+    COLUMNS = ['model_id', 'provider_type', 'request_model_name', 'chat_id', 'user_id', 'status',
+               'status_code', 'latency_ms', 'ttft_ms', 'prompt_tokens', 'completion_tokens', 'total_tokens']
+
+    # --------------------------- CREATE --------------------------- #
+    @staticmethod
+    def insert_calls(rows: List[Dict[str, Any]], chunk_size: int = 500) -> bool:
+        """Kayıtları çok satırlı INSERT ile tek transaction içinde yazar."""
+        if not rows:
+            return True
+        cols = TelemetryRepository.COLUMNS
+        row_sql = '(' + ', '.join(['%s'] * len(cols)) + ')'
+        connection = None
+        cursor = None
+        try:
+            connection = get_connection()
+            connection.start_transaction()
+            cursor = get_cursor(connection)
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i:i + chunk_size]
+                query = f"INSERT INTO provider_calls ({', '.join(cols)}) VALUES {', '.join([row_sql] * len(chunk))}"
+                cursor.execute(query, tuple(row.get(col) for row in chunk for col in cols))
+            connection.commit()
+            return True
+        except Exception as e:
+            if connection and connection.is_connected():
+                connection.rollback()
+            return False
+        finally:
+            if cursor:
+                cursor.close()
+            if connection and connection.is_connected():
+                connection.close()
+
+    # --------------------------- READ --------------------------- #
+    @staticmethod
+    def list_recent_calls(hours: int = 24, limit: int = 50000) -> List[Dict[str, Any]]:
+        """
+        Son `hours` saat içindeki çağrıları (en yeniden eskiye) getirir.
+        Yüzdelik hesapları servis katmanında yapılır.
+        """
+        query = """
+            SELECT c.model_id, m.model_name, c.provider_type, c.request_model_name, c.status,
+                   c.latency_ms, c.ttft_ms, c.completion_tokens, c.total_tokens
+            FROM provider_calls c
+            LEFT JOIN models m ON m.model_id = c.model_id
+            WHERE c.created_at >= NOW() - INTERVAL %s HOUR
+            ORDER BY c.call_id DESC
+            LIMIT %s
+        """
+        try:
+            return execute_query(query, (int(hours), int(limit)), fetch=True) or []
+        except Exception as e:
+            return []
+
+    # --------------------------- DELETE --------------------------- #
+    @staticmethod
+    def purge_older_than(days: int) -> bool:
+        try:
+            execute_query("DELETE FROM provider_calls WHERE created_at < NOW() - INTERVAL %s DAY", (int(days),), fetch=False)
+            return True
+        except Exception as e:
+            return False
@@ -11,6 +11,11 @@ from app.database.migrations import (
     migration_0002_categories,
     migration_0003_chats,
     migration_0004_messages,
+    migration_0005_api_keys,
+    migration_0006_provider_calls,
+    migration_0007_auto_routing,
+    migration_0008_message_checkpoints,
+    migration_0009_message_window_index,
 )
 
 def run_all_migrations():
@@ -48,6 +53,36 @@ def run_all_migrations():
             return False
         logging.debug("Migration 0004 (messages) completed.")
 
+        logging.debug("Running migration 0005 (api keys)...")
+        if not migration_0005_api_keys.run_migration():
+            logging.error("Migration 0005 (api keys) failed.")
+            return False
+        logging.debug("Migration 0005 (api keys) completed.")
+
+        logging.debug("Running migration 0006 (provider calls)...")
+        if not migration_0006_provider_calls.run_migration():
+            logging.error("Migration 0006 (provider calls) failed.")
+            return False
+        logging.debug("Migration 0006 (provider calls) completed.")
+
+        logging.debug("Running migration 0007 (auto routing)...")
+        if not migration_0007_auto_routing.run_migration():
+            logging.error("Migration 0007 (auto routing) failed.")
+            return False
+        logging.debug("Migration 0007 (auto routing) completed.")
+
+        logging.debug("Running migration 0008 (message checkpoints)...")
+        if not migration_0008_message_checkpoints.run_migration():
+            logging.error("Migration 0008 (message checkpoints) failed.")
+            return False
+        logging.debug("Migration 0008 (message checkpoints) completed.")
+
+        logging.debug("Running migration 0009 (message window index)...")
+        if not migration_0009_message_window_index.run_migration():
+            logging.error("Migration 0009 (message window index) failed.")
+            return False
+        logging.debug("Migration 0009 (message window index) completed.")
+
         return True
     except Exception as e:
         logging.error(f"An unexpected error occurred during migrations: {e}")
@@ -10,6 +10,25 @@ from app.services.user_service import UserService
 from app.services.model_category_service import ModelCategoryService
 from app.services.category_service import CategoryService
 from app.services.branding_service import BrandingService
+from app.services.catalog_sync_service import CatalogSyncService
+from app.services.providers.metrics import provider_metrics
+from app.services.providers.circuit_breaker import circuit_breakers
+from app.services.providers.scheduler import provider_scheduler
+from app.services.failover_service import FailoverService
+from app.services.key_pool_service import KeyPoolService
+from app.services.providers.key_pool import api_key_pool
+from app.services.telemetry_service import TelemetryService
+from app.services.routing_service import model_router
+from app.services.providers.response_cache import response_cache
+from app.services.providers.context_cache import context_cache
+from app.services.generation_registry import generation_registry
+from app.services.idempotency_service import idempotency_store
+from app.services.chat_list_cache import chat_list_cache
+from app.services.catalog_cache import catalog_cache
+from app.services.catalog_index import catalog_index
+from app.services.autocomplete_index import model_autocomplete, chat_autocomplete
+from app.routes.static_assets import static_assets
+from app.services.provider_health_service import provider_health
 
 
 admin_api_bp = Blueprint('admin_api', __name__, url_prefix='/admin/api')
@@ -17,6 +36,7 @@ admin_api_bp = Blueprint('admin_api', __name__, url_prefix='/admin/api')
 user_service = UserService()
 mc_service = ModelCategoryService()
 category_service = CategoryService()
+catalog_sync_service = CatalogSyncService()
 
 
 # -----------------------------
@@ -196,19 +216,8 @@ def api_model_categories_ai_apply():
     data = request.get_json(silent=True) or {}
     suggestions = data.get('suggestions') or []
     # suggestions: [{ model_id, category_ids, primary_category_id? }]
-    ok_all = True
-    for s in suggestions:
-        try:
-            mid = int(s.get('model_id'))
-            cids = [int(x) for x in (s.get('category_ids') or [])]
-            pcid = s.get('primary_category_id')
-            if pcid is not None:
-                pcid = int(pcid)
-            res = mc_service.replace_for_model(mid, cids, pcid)
-            ok_all = ok_all and bool(res.get('success'))
-        except Exception:
-            ok_all = False
-    return jsonify({'success': ok_all}), (200 if ok_all else 400)
+    result = mc_service.apply_suggestions(suggestions)
+    return jsonify(result), (200 if result.get('success') else 400)
 
 
 # Per-model AI auto-categorization
@@ -251,6 +260,163 @@ def api_model_categories_auto(model_id: int):
         return jsonify({ 'success': False, 'error': 'AI auto-categorization error' }), 500
 
 
+# -----------------------------
+# Provider catalog sync
+# -----------------------------
+@admin_api_bp.route('/models/sync', methods=['POST'])
+@admin_required
+def api_models_sync():
+    """Provider kataloğunu models tablosuna senkronize eder.
+    Body: { provider_type?: 'openrouter', dry_run?: bool, activate_new?: bool }
+    Returns: { success, data: { added, changed, unchanged, catalog_size, dry_run } }
+    """
+    data = request.get_json(silent=True) or {}
+    result = catalog_sync_service.sync_provider(
+        provider_type=data.get('provider_type') or 'openrouter',
+        dry_run=bool(data.get('dry_run', False)),
+        activate_new=bool(data.get('activate_new', False)),
+    )
+    return jsonify(result), (200 if result.get('success') else 400)
+
+
+# -----------------------------
+# Provider metrics
+# -----------------------------
+@admin_api_bp.route('/metrics/providers', methods=['GET'])
+@admin_required
+def api_provider_metrics():
+    """Provider deneme sayaçları, gecikme yüzdelikleri (p50/p95/p99), devre ve kuyruk durumları."""
+    data = provider_metrics.snapshot()
+    data['circuits'] = circuit_breakers.snapshot()
+    data['scheduler'] = provider_scheduler.snapshot()
+    data['key_pool'] = api_key_pool.snapshot()
+    data['routing'] = model_router.snapshot()
+    data['response_cache'] = response_cache.stats()
+    data['context_cache'] = context_cache.stats()
+    data['generations'] = generation_registry.active()
+    data['idempotency'] = idempotency_store.stats()
+    data['chat_list_cache'] = chat_list_cache.stats()
+    data['catalog_cache'] = catalog_cache.stats()
+    data['catalog_index'] = catalog_index.stats()
+    data['model_autocomplete'] = model_autocomplete.stats()
+    data['chat_autocomplete'] = chat_autocomplete.stats()
+    data['static_assets'] = static_assets.stats()
+    return jsonify({ 'success': True, 'data': data }), 200
+
+
+@admin_api_bp.route('/telemetry/models', methods=['GET'])
+@admin_required
+def api_telemetry_models():
+    """Query: hours? (varsayılan 24) — model bazında p50/p95 gecikme, ilk token süresi ve tokens/sec."""
+    hours = request.args.get('hours', 24, type=int)
+    result = TelemetryService.model_stats(hours)
+    return jsonify(result), (200 if result.get('success') else 500)
+
+
+@admin_api_bp.route('/response-cache', methods=['POST'])
+@admin_required
+def api_response_cache():
+    """Body: { clear?: bool, model?: str, enabled?: bool } — önbelleği temizler / model bazında açar-kapatır."""
+    payload = request.get_json(silent=True) or {}
+    if payload.get('clear'):
+        response_cache.clear()
+    model = (payload.get('model') or '').strip()
+    if model and 'enabled' in payload:
+        response_cache.set_model_enabled(model, bool(payload.get('enabled')))
+    return jsonify({ 'success': True, 'data': response_cache.stats() }), 200
+
+
+@admin_api_bp.route('/providers/health', methods=['GET'])
+@admin_required
+def api_provider_health():
+    """Arka plan prober'ının model bazında son sonuçları (anlık, provider çağrısı yapmaz)."""
+    return jsonify({ 'success': True, 'data': { 'summary': provider_health.summary(), 'models': provider_health.results() } }), 200
+
+
+@admin_api_bp.route('/providers/health/refresh', methods=['POST'])
+@admin_required
+def api_provider_health_refresh():
+    provider_health.refresh()
+    return jsonify({ 'success': True, 'message': 'Sağlık kontrolü başlatıldı' }), 202
+
+
+@admin_api_bp.route('/failover', methods=['GET'])
+@admin_required
+def api_get_failover():
+    try:
+        return jsonify({ 'success': True, 'data': FailoverService.get_policy() }), 200
+    except Exception:
+        return jsonify({ 'success': False, 'error': 'Failover policy could not be loaded' }), 500
+
+
+@admin_api_bp.route('/failover', methods=['POST'])
+@admin_required
+def api_set_failover():
+    """Body: { enabled?: bool, max_attempts?: int, fallbacks?: { model_id: fallback_model_id } }"""
+    try:
+        payload = request.get_json(silent=True) or {}
+        result = FailoverService.set_policy(payload)
+        return jsonify(result), (200 if result.get('success') else 400)
+    except Exception:
+        return jsonify({ 'success': False, 'error': 'Failover policy could not be saved' }), 500
+
+
+# -----------------------------
+# API Key Pools
+# -----------------------------
+@admin_api_bp.route('/keys', methods=['GET'])
+@admin_required
+def api_list_keys():
+    """Query: model_id? — anahtarlar maskelenmiş olarak ve sağlık bilgisiyle döner."""
+    model_id = request.args.get('model_id', type=int)
+    result = KeyPoolService.list_keys(model_id)
+    return jsonify(result), (200 if result.get('success') else 500)
+
+
+@admin_api_bp.route('/models/<int:model_id>/keys', methods=['GET'])
+@admin_required
+def api_list_model_keys(model_id: int):
+    result = KeyPoolService.list_keys(model_id)
+    return jsonify(result), (200 if result.get('success') else 500)
+
+
+@admin_api_bp.route('/models/<int:model_id>/keys', methods=['POST'])
+@admin_required
+def api_add_model_key(model_id: int):
+    """Body: { api_key: str, label?: str }"""
+    payload = request.get_json(silent=True) or {}
+    payload['model_id'] = model_id
+    result = KeyPoolService.add_key(payload)
+    return jsonify(result), (201 if result.get('success') else 400)
+
+
+@admin_api_bp.route('/keys', methods=['POST'])
+@admin_required
+def api_add_key():
+    """Body: { api_key: str, provider_type?: str, model_id?: int, label?: str } — model_id yoksa provider geneli."""
+    payload = request.get_json(silent=True) or {}
+    result = KeyPoolService.add_key(payload)
+    return jsonify(result), (201 if result.get('success') else 400)
+
+
+@admin_api_bp.route('/keys/<int:key_id>', methods=['PATCH'])
+@admin_required
+def api_update_key(key_id: int):
+    """Body: { is_active: bool }"""
+    payload = request.get_json(silent=True) or {}
+    if 'is_active' not in payload:
+        return jsonify({ 'success': False, 'error': 'is_active zorunludur' }), 400
+    result = KeyPoolService.set_active(key_id, bool(payload.get('is_active')))
+    return jsonify(result), (200 if result.get('success') else 400)
+
+
+@admin_api_bp.route('/keys/<int:key_id>', methods=['DELETE'])
+@admin_required
+def api_delete_key(key_id: int):
+    result = KeyPoolService.delete_key(key_id)
+    return jsonify(result), (200 if result.get('success') else 400)
+
+
 # -----------------------------
 # Branding (Site Logo & Text)
 # -----------------------------
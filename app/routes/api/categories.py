@@ -4,8 +4,10 @@
 # Kategoriler ve kategoriye göre modeller için API endpoint'leri
 # =============================================================================
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from app.services.category_service import CategoryService
+from app.routes.wire_format import negotiated
+from app.services.catalog_index import QUERY_PARAMS
 
 categories_bp = Blueprint('categories_api', __name__, url_prefix='/api/categories')
 service = CategoryService()
@@ -14,12 +16,16 @@ service = CategoryService()
 @categories_bp.route('/', methods=['GET'])
 def get_categories():
     result = service.get_all_categories()
-    status_code = 200 if result.get('success') else 500
-    return jsonify(result), status_code
+    if result.get('success'):
+        return negotiated(result, 'data')
+    return jsonify(result), 500
 
 
 @categories_bp.route('/<int:category_id>/models', methods=['GET'])
 def get_models_for_category(category_id: int):
-    result = service.get_models_by_category(category_id)
-    status_code = 200 if result.get('success') else 500
-    return jsonify(result), status_code
+    # Parametresiz istek tüm listeyi döndürür; provider, active, q, cursor, limit ile sayfalı
+    params = request.args if any(name in request.args for name in QUERY_PARAMS) else None
+    result = service.get_models_by_category(category_id, params)
+    if result.get('success'):
+        return negotiated(result, 'data')
+    return jsonify(result), 400 if result.get('invalid') else 500
@@ -4,18 +4,27 @@
 # Chat ile ilgili API endpoint'leri
 # =============================================================================
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from app.services.chat_service import ChatService
+from app.services.key_pool_service import KeyPoolService
+from app.services.provider_health_service import provider_health
+from app.services.generation_registry import generation_registry
+from app.services.idempotency_service import idempotency_store, IdempotencyConflict
+from app.services.chat_list_cache import chat_list_cache
 from app.services.providers.gemini import GeminiService
 from app.database.db_connection import execute_query
 from app.services.auth_service import AuthService
 from app.database.repositories.chat_repository import ChatRepository
+from app.routes.wire_format import negotiated, requested_format
 
 # Blueprint oluştur
 chats_bp = Blueprint('chats', __name__, url_prefix='/api/chats')
 
 # Servisleri başlat
 chat_service = ChatService()
+
+# Mesaj satırlarında created_at, timestamp ile aynı değeri taşır; compact biçimde yazılmaz
+MESSAGE_DUPLICATE_FIELDS = ('created_at',)
 gemini_service = GeminiService()
 
 @chats_bp.route('/create', methods=['POST'])
@@ -34,10 +43,21 @@ def create_chat():
 
         model_id = data.get('model_id')
         title = data.get('title')
-        if not model_id:
+        # "auto" yönlendirme: model_id="auto" + category_id (veya route_category_id)
+        route_category_id = data.get('route_category_id')
+        if model_id == 'auto':
+            model_id = None
+            route_category_id = route_category_id or data.get('category_id')
+            if not route_category_id:
+                return jsonify({"success": False, "error": "auto yönlendirme için category_id gerekli"}), 400
+        if not model_id and not route_category_id:
             return jsonify({"success": False, "error": "model_id gerekli"}), 400
+        try:
+            route_category_id = int(route_category_id) if route_category_id else None
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "Geçersiz category_id"}), 400
 
-        result = chat_service.create_chat(model_id, title, user_id=user['user_id'])
+        result = chat_service.create_chat(model_id, title, user_id=user['user_id'], route_category_id=route_category_id)
         if result["success"]:
             return jsonify(result), 201
         else:
@@ -45,6 +65,48 @@ def create_chat():
     except Exception as e:
         return jsonify({"success": False, "error": f"Sunucu hatası: {str(e)}"}), 500
 
+# Tek hydration isteğinde kabul edilen azami chat ve mesaj sayısı
+HYDRATE_MAX_CHATS = 16
+HYDRATE_MAX_MESSAGES = 200
+
+@chats_bp.route('/hydrate', methods=['GET', 'POST'])
+def hydrate_chats():
+    """
+    Pane geri yükleme: birden fazla chat'in bilgisini ve son mesaj penceresini tek istekte döndürür.
+    POST body: {"chat_ids": [...], "limit": 100} veya GET ?ids=a,b&limit=100
+    """
+    try:
+        if not AuthService.is_authenticated():
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
+
+        user = AuthService.get_current_user()
+        if not user:
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
+
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            chat_ids = data.get('chat_ids') or []
+            limit = data.get('limit', 100)
+        else:
+            chat_ids = [c for c in (request.args.get('ids') or '').split(',') if c]
+            limit = request.args.get('limit', 100)
+        if not isinstance(chat_ids, list) or not chat_ids:
+            return jsonify({"success": False, "error": "chat_ids gerekli"}), 400
+        if len(chat_ids) > HYDRATE_MAX_CHATS:
+            return jsonify({"success": False, "error": f"En fazla {HYDRATE_MAX_CHATS} chat yüklenebilir"}), 400
+        try:
+            limit = max(1, min(HYDRATE_MAX_MESSAGES, int(limit)))
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "Geçersiz limit"}), 400
+
+        result = chat_service.hydrate_chats(chat_ids, user['user_id'], limit=limit)
+        if result["success"]:
+            return negotiated(result, 'chats.*.messages', drop=MESSAGE_DUPLICATE_FIELDS)
+        else:
+            return jsonify(result), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Sunucu hatası: {str(e)}"}), 500
+
 @chats_bp.route('/<chat_id>', methods=['GET'])
 def get_chat(chat_id):
     try:
@@ -75,15 +137,82 @@ def get_chat_messages(chat_id):
 
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
-
-        result = chat_service.get_chat_messages(chat_id, limit, offset, user_id=user['user_id'])
+        # since: istemcideki son message_id (cursor); yalnızca daha yeni mesajlar döner
+        since = request.args.get('since', type=int)
+
+        # Koşullu GET: chat değişmediyse mesaj satırları okunmadan 304
+        etag = chat_service.messages_etag(chat_id, user['user_id'], limit, offset, since, requested_format())
+        if etag is None:
+            return jsonify({"success": False, "error": "Yetkisiz veya chat bulunamadı"}), 404
+        # Sıkıştırılmış yanıtlarda ETag zayıf (W/) döner; karşılaştırma zayıf yapılır
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+        # Sahiplik messages_etag içinde doğrulandı
+        result = chat_service.get_chat_messages(chat_id, limit, offset, since=since)
         if result["success"]:
-            return jsonify(result), 200
+            response = negotiated(result, 'messages', drop=MESSAGE_DUPLICATE_FIELDS)
+            if result["complete"]:
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'private, no-cache'
+            else:
+                # Kısmi (üretimi süren) yanıt içeriği satır güncellendikçe değişir; önbelleğe alınmaz
+                response.headers['Cache-Control'] = 'no-store'
+            return response, 200
         else:
             return jsonify(result), 404
     except Exception as e:
         return jsonify({"success": False, "error": f"Sunucu hatası: {str(e)}"}), 500
 
+def _send_target(chat_id, user, data):
+    """
+    /send ve /stream için ortak doğrulama: mesaj, sohbet sahipliği ve model/anahtar.
+
+    Returns:
+        Tuple[dict | None, response | None]: send_message argümanları veya hata yanıtı
+    """
+    message = data.get('message')
+    model_id = data.get('model_id')
+    if not message:
+        return None, (jsonify({"success": False, "error": "message gerekli"}), 400)
+    if not model_id:
+        return None, (jsonify({"success": False, "error": "model_id gerekli"}), 400)
+
+    chat_result = chat_service.get_chat(chat_id, user_id=user['user_id'])
+    if not chat_result.get('success'):
+        return None, (jsonify({"success": False, "error": "Chat bulunamadı veya erişim yok"}), 404)
+
+    chat_obj = chat_result.get('chat') or {}
+    chat_model_id = chat_obj.get('model_id')
+    if not chat_model_id:
+        return None, (jsonify({"success": False, "error": "Chat için model atanmadı"}), 400)
+
+    model_id = chat_model_id
+    route_category_id = chat_obj.get('route_category_id')
+
+    model_sql = "SELECT model_id, model_name, provider_name, provider_type, api_key FROM models WHERE model_id = %s"
+    model_result = execute_query(model_sql, (model_id,), fetch=True)
+    if not model_result:
+        return None, (jsonify({"success": False, "error": "Model bulunamadı"}), 404)
+
+    model_data = model_result[0]
+    api_key = model_data["api_key"]
+    # models.api_key boş olsa bile havuzda anahtar varsa mesaj gönderilebilir
+    if not route_category_id and not api_key and not KeyPoolService.keys_for_model(model_data)[1]:
+        return None, (jsonify({"success": False, "error": "Model için API anahtarı tanımlanmamış"}), 400)
+
+    return {
+        "chat_id": chat_id,
+        "user_message": message,
+        "model_id": model_id,
+        "api_key": api_key,
+        "user_id": user['user_id'],
+        "route_category_id": route_category_id,
+        "cache": bool(data.get('cache')),
+    }, None
+
 @chats_bp.route('/<chat_id>/send', methods=['POST'])
 def send_message(chat_id):
     try:
@@ -98,41 +227,141 @@ def send_message(chat_id):
         if not data:
             return jsonify({"success": False, "error": "Request body gerekli"}), 400
 
-        message = data.get('message')
-        model_id = data.get('model_id')
-        if not message:
-            return jsonify({"success": False, "error": "message gerekli"}), 400
-        if not model_id:
-            return jsonify({"success": False, "error": "model_id gerekli"}), 400
+        target, error = _send_target(chat_id, user, data)
+        if error:
+            return error
+
+        # İstemci, iptal uç noktasında kullanmak üzere istek kimliğini kendisi verebilir
+        request_id = data.get('request_id') or request.headers.get('X-Request-Id')
+        send = lambda state=None: chat_service.send_message(request_id=request_id, idempotency_state=state, **target)
+        # Idempotency-Key: çift tıklama / zaman aşımı sonrası tekrarlar aynı üretime bağlanır
+        idempotency_key = request.headers.get('Idempotency-Key')
+        replayed = False
+        if idempotency_key:
+            try:
+                result, replayed = idempotency_store.run(
+                    f"{user['user_id']}:{chat_id}", idempotency_key,
+                    {"message": target["user_message"], "cache": target["cache"]}, send
+                )
+            except IdempotencyConflict as e:
+                return jsonify({"success": False, "error": str(e)}), 409 if e.in_progress else 422
+        else:
+            result = send()
+        if result["success"]:
+            response = jsonify(result)
+            if replayed:
+                response.headers['Idempotent-Replayed'] = 'true'
+            return response, 200
+        elif result.get("cancelled"):
+            return jsonify(result), 409
+        elif result.get("retry_after"):
+            # Provider kuyruğu dolu: istemci Retry-After sonra tekrar denemeli
+            response = jsonify(result)
+            response.headers['Retry-After'] = str(result["retry_after"])
+            return response, 429
+        else:
+            return jsonify(result), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Sunucu hatası: {str(e)}"}), 500
 
-        chat_result = chat_service.get_chat(chat_id, user_id=user['user_id'])
-        if not chat_result.get('success'):
-            return jsonify({"success": False, "error": "Chat bulunamadı veya erişim yok"}), 404
+def _last_event_id():
+    """Last-Event-ID başlığı (EventSource) veya last_event_id sorgu parametresi."""
+    value = request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or 0
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+def _event_stream(generation, last_event_id):
+    return Response(
+        generation_registry.stream(generation, last_event_id),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            # Nginx gibi proxy'lerin olayları tamponlamaması için
+            'X-Accel-Buffering': 'no',
+            'X-Request-Id': generation.request_id,
+        }
+    )
+
+@chats_bp.route('/<chat_id>/stream', methods=['POST'])
+def stream_message(chat_id):
+    """
+    Mesaj gönderir ve yanıtı SSE olarak akıtır (event: delta/reset/done/error).
+    Üretim istek thread'inden bağımsız sürer; bağlantı koparsa istemci
+    GET /<chat_id>/stream/<request_id> ile Last-Event-ID vererek devam eder.
+    Aynı request_id (veya Idempotency-Key) ile tekrar gönderim üretimi yeniden çalıştırmaz.
+    """
+    try:
+        if not AuthService.is_authenticated():
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
 
-        chat_obj = chat_result.get('chat') or {}
-        chat_model_id = chat_obj.get('model_id')
-        if not chat_model_id:
-            return jsonify({"success": False, "error": "Chat için model atanmadı"}), 400
+        user = AuthService.get_current_user()
+        if not user or not user.get('is_active'):
+            return jsonify({"success": False, "error": "Hesap aktif değil"}), 403
 
-        model_id = chat_model_id
+        data = request.get_json()
+        if not data:
+            return jsonify({"success": False, "error": "Request body gerekli"}), 400
 
-        model_sql = "SELECT model_name, provider_name, api_key FROM models WHERE model_id = %s"
-        model_result = execute_query(model_sql, (model_id,), fetch=True)
-        if not model_result:
-            return jsonify({"success": False, "error": "Model bulunamadı"}), 404
+        request_id = (data.get('request_id') or request.headers.get('Idempotency-Key')
+                      or request.headers.get('X-Request-Id'))
+        if request_id:
+            existing = generation_registry.get(chat_id, request_id)
+            if existing is not None and existing.user_id == user['user_id']:
+                return _event_stream(existing, _last_event_id())
+
+        target, error = _send_target(chat_id, user, data)
+        if error:
+            return error
+
+        generation, created = generation_registry.get_or_register(chat_id, request_id, user['user_id'])
+        if created:
+            generation_registry.submit(lambda: chat_service.send_message(generation=generation, **target))
+        return _event_stream(generation, _last_event_id())
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Sunucu hatası: {str(e)}"}), 500
 
-        model_data = model_result[0]
-        model_name = model_data["model_name"]
-        provider_name = model_data["provider_name"]
-        api_key = model_data["api_key"]
-        if not api_key:
-            return jsonify({"success": False, "error": "Model için API anahtarı tanımlanmamış"}), 400
+@chats_bp.route('/<chat_id>/stream/<request_id>', methods=['GET'])
+def resume_stream(chat_id, request_id):
+    """Kopan akışa Last-Event-ID'den sonraki olaylarla yeniden bağlanır (üretim yeniden çalışmaz)."""
+    try:
+        if not AuthService.is_authenticated():
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
 
-        result = chat_service.send_message(chat_id, message, model_id, api_key, user_id=user['user_id'])
-        if result["success"]:
-            return jsonify(result), 200
-        else:
-            return jsonify(result), 400
+        user = AuthService.get_current_user()
+        if not user:
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
+
+        generation = generation_registry.get(chat_id, request_id)
+        if generation is None or generation.user_id != user['user_id']:
+            # Saklama süresi dolmuş olabilir: istemci mesajları /messages ile yeniden yükler
+            return jsonify({"success": False, "error": "Akış bulunamadı veya süresi doldu"}), 404
+        return _event_stream(generation, _last_event_id())
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Sunucu hatası: {str(e)}"}), 500
+
+@chats_bp.route('/<chat_id>/cancel', methods=['POST'])
+def cancel_generation(chat_id):
+    """
+    Sohbette devam eden yanıt üretimini iptal eder.
+    Body'de request_id verilirse yalnızca o istek, verilmezse sohbetin tüm üretimleri iptal edilir.
+    """
+    try:
+        if not AuthService.is_authenticated():
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
+
+        user = AuthService.get_current_user()
+        if not user:
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
+
+        if not ChatRepository.is_owner(chat_id, user['user_id']):
+            return jsonify({"success": False, "error": "Chat bulunamadı veya erişim yok"}), 404
+
+        data = request.get_json(silent=True) or {}
+        request_id = data.get('request_id') or request.headers.get('X-Request-Id')
+        cancelled = generation_registry.cancel(chat_id, request_id)
+        return jsonify({"success": True, "chat_id": chat_id, "request_id": request_id, "cancelled": cancelled}), 200
     except Exception as e:
         return jsonify({"success": False, "error": f"Sunucu hatası: {str(e)}"}), 500
 
@@ -154,6 +383,48 @@ def get_user_chats():
         else: active = None
 
         result = chat_service.get_user_chats(user_id=user['user_id'], active=active, limit=limit, offset=offset)
+        if result["success"]:
+            return negotiated(result, 'chats')
+        else:
+            return jsonify(result), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Sunucu hatası: {str(e)}"}), 500
+
+@chats_bp.route('/overview', methods=['GET'])
+def get_chat_overview():
+    """Aktif ve arşiv sohbetlerin ilk sayfaları ve toplamları tek istekte."""
+    try:
+        if not AuthService.is_authenticated():
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
+
+        user = AuthService.get_current_user()
+        if not user:
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
+
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        result = chat_service.get_chat_overview(user_id=user['user_id'], limit=limit)
+        if result["success"]:
+            return negotiated(result, 'active.chats', 'archived.chats')
+        else:
+            return jsonify(result), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Sunucu hatası: {str(e)}"}), 500
+
+@chats_bp.route('/autocomplete', methods=['GET'])
+def autocomplete_chats():
+    """Kullanıcının sohbet başlıklarında otomatik tamamlama (q, limit)."""
+    try:
+        if not AuthService.is_authenticated():
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
+
+        user = AuthService.get_current_user()
+        if not user:
+            return jsonify({"success": False, "error": "Yetkisiz"}), 401
+
+        query = (request.args.get('q') or '').strip()
+        if not query:
+            return jsonify({"success": True, "data": [], "count": 0}), 200
+        result = chat_service.search_chats(user['user_id'], query, request.args.get('limit', 10, type=int))
         if result["success"]:
             return jsonify(result), 200
         else:
@@ -164,7 +435,7 @@ def get_user_chats():
 @chats_bp.route('/gemini/test/<model_id>', methods=['POST'])
 def test_gemini_connection(model_id):
     try:
-        model_sql = "SELECT model_name, request_model_name, api_key FROM models WHERE model_id = %s"
+        model_sql = "SELECT model_id, model_name, request_model_name, api_key FROM models WHERE model_id = %s"
         model_result = execute_query(model_sql, (model_id,), fetch=True)
         if not model_result:
             return jsonify({"success": False, "error": "Model bulunamadı"}), 404
@@ -175,13 +446,13 @@ def test_gemini_connection(model_id):
         if not api_key:
             return jsonify({"success": False, "error": "Model için API anahtarı tanımlanmamış"}), 400
 
-        gemini_service.set_api_key(api_key)
-        gemini_service.set_model(request_model_name)
-        result = gemini_service.test_connection()
-        if result["success"]:
-            return jsonify(result), 200
+        # Hafif probe (içerik üretmez); sonuç sağlık önbelleğine de yazılır
+        probe = provider_health.check_model(dict(model_result[0], provider_type='gemini'))
+        if probe["status"] == "up":
+            return jsonify({"success": True, "message": "Gemini API bağlantısı başarılı",
+                            "model": request_model_name, "latency_ms": probe.get("latency_ms")}), 200
         else:
-            return jsonify(result), 400
+            return jsonify({"success": False, "error": probe.get("error") or "Bilinmeyen hata"}), 400
     except Exception as e:
         return jsonify({"success": False, "error": f"Sunucu hatası: {str(e)}"}), 500
 
@@ -210,12 +481,15 @@ def soft_delete_chat(chat_id):
             return jsonify({"success": False, "error": "Yetkisiz"}), 401
 
         # Sohbet kullanıcının mı kontrol et
-        chat = ChatRepository.get_chat(chat_id, user_id=user['user_id'])
-        if not chat:
+        if not ChatRepository.is_owner(chat_id, user['user_id']):
             return jsonify({"success": False, "error": "Chat bulunamadı veya erişim yok"}), 404
 
+        # Panel kapandı: devam eden üretimleri iptal et, yanıt yazılmasın
+        generation_registry.cancel(chat_id)
+
         # Pasif hale getir
         ok = ChatRepository.set_active(chat_id, False)
+        chat_list_cache.invalidate(user['user_id'])
         if ok:
             return jsonify({"success": True, "chat_id": chat_id, "is_active": False}), 200
         else:
@@ -11,6 +11,9 @@ from werkzeug.utils import secure_filename
 from app.database.repositories.model_repository import ModelRepository
 from app.services.model_service import ModelService
 from app.routes.auth_decorators import admin_required
+from app.routes.wire_format import negotiated
+from app.services.catalog_cache import catalog_cache
+from app.services.catalog_index import QUERY_PARAMS
 
 # Models API Blueprint oluştur
 models_bp = Blueprint('models_api', __name__, url_prefix='/api/models')
@@ -22,10 +25,32 @@ model_service = ModelService()
 def get_models():
     """
     Tüm modelleri getirir.
+    Filtre / sayfalama parametreleri (provider, category_id, categories=1,2 + match=any|all,
+    active, q, cursor, limit)
+    verilirse sonuç katalog dizininden sayfalı döner: { data, count, total, next_cursor }.
     """
+    if any(name in request.args for name in QUERY_PARAMS):
+        result = model_service.search_models(request.args)
+        if result['success']:
+            return negotiated(result, 'data')
+        return jsonify(result), 400 if result.get('invalid') else 500
     result = model_service.get_all_models()
-    status_code = 200 if result['success'] else 500
-    return jsonify(result), status_code
+    if result['success']:
+        return negotiated(result, 'data')
+    return jsonify(result), 500
+
+
+@models_bp.route('/autocomplete', methods=['GET'])
+def autocomplete_models():
+    """
+    Model adı, istek model adı ve sağlayıcı üzerinde otomatik tamamlama.
+    Parametreler: q (zorunlu), limit (varsayılan 10)
+    """
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({"success": True, "data": [], "count": 0}), 200
+    result = model_service.autocomplete(query, request.args.get('limit', 10, type=int))
+    return jsonify(result), 200 if result['success'] else 500
 
 
 @models_bp.route('/<int:model_id>/icon', methods=['POST'])
@@ -65,6 +90,7 @@ def upload_model_icon(model_id: int):
 
         # DB güncelle
         ok = ModelRepository.update_model(model_id, { 'logo_path': web_path })
+        catalog_cache.invalidate()
         if not ok:
             return jsonify({"success": False, "error": "Veritabanı güncellenemedi"}), 500
 
@@ -116,7 +142,8 @@ def create_new_model():
     """
     data = request.get_json()
     result = model_service.create_model(data)
-    status_code = 201 if result['success'] else (400 if 'gereklidir' in result.get('error', '') else 500)
+    client_errors = ('gereklidir', 'Geçersiz', 'bulunamadı')
+    status_code = 201 if result['success'] else (400 if any(m in result.get('error', '') for m in client_errors) else 500)
     return jsonify(result), status_code
 
 @models_bp.route('/<int:model_id>', methods=['PUT'])
@@ -0,0 +1,91 @@
+# =============================================================================
+# RESPONSE COMPRESSION
+# =============================================================================
+# Dinamik yanıtlar (JSON, HTML) için gzip / brotli sıkıştırma.
+# - İstemcinin Accept-Encoding başlığına göre br (brotli kuruluysa) veya gzip
+# - COMPRESS_MIN_SIZE altındaki gövdeler sıkıştırılmaz (kazanç başlık maliyetinden az)
+# - Yalnızca metin tabanlı içerik türleri; SSE gibi akış yanıtlarına dokunulmaz
+# - ETag zayıf (W/) hale getirilir: sıkıştırılmış gövde bayt düzeyinde farklıdır
+# =============================================================================
+
+import os
+import gzip
+from typing import Optional
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # opsiyonel bağımlılık
+    brotli = None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+COMPRESS_MIN_SIZE = _env_int('COMPRESS_MIN_SIZE', 1024)
+COMPRESS_GZIP_LEVEL = _env_int('COMPRESS_GZIP_LEVEL', 6)
+# Dinamik yanıtlarda brotli kalitesi düşük tutulur (yüksek kaliteler CPU'ya pahalı)
+COMPRESS_BROTLI_QUALITY = _env_int('COMPRESS_BROTLI_QUALITY', 5)
+
+COMPRESSIBLE_TYPES = {
+    'application/json',
+    'application/javascript',
+    'application/vnd.zekai.compact+json',
+    'application/xml',
+    'image/svg+xml',
+}
+
+
+def is_compressible(mimetype: Optional[str]) -> bool:
+    if not mimetype:
+        return False
+    return (mimetype.startswith('text/') and mimetype != 'text/event-stream') or mimetype in COMPRESSIBLE_TYPES
+
+
+def choose_encoding() -> Optional[str]:
+    """İstemcinin kabul ettiği en iyi kodlama: 'br', 'gzip' veya None."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY if level is None else level)
+    # mtime=0: aynı gövde her seferinde aynı baytları üretir
+    return gzip.compress(data, compresslevel=COMPRESS_GZIP_LEVEL if level is None else level, mtime=0)
+
+
+def _compress_response(response):
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or not is_compressible(response.mimetype)):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def install_compression(app) -> None:
+    """Dinamik yanıt sıkıştırmayı etkinleştirir (COMPRESS_RESPONSES=0 ile kapatılır)."""
+    if str(os.getenv('COMPRESS_RESPONSES', '1')).lower() in ('1', 'true', 'yes', 'on'):
+        app.after_request(_compress_response)
@@ -10,6 +10,7 @@ from app.services.user_service import UserService
 from app.services.model_service import ModelService
 from app.services.category_service import CategoryService
 from app.services.branding_service import BrandingService
+from app.services.telemetry_service import TelemetryService
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -54,6 +55,9 @@ def dashboard():
                     provider_by_name[pn] = provider_by_name.get(pn, 0) + 1
         except Exception:
             active_model_count = 0
+        # Son 24 saatin model performansı (provider_calls telemetrisi)
+        telemetry = TelemetryService.model_stats(hours=24)
+        model_performance = (telemetry.get('data') or [])[:10] if telemetry.get('success') else []
 
         return render_template(
             'admin/dashboard.html',
@@ -64,6 +68,7 @@ def dashboard():
             recent_users=recent_users,
             provider_by_type=provider_by_type,
             provider_by_name=provider_by_name,
+            model_performance=model_performance,
         )
     except Exception as e:
         return "Admin paneli yüklenirken hata oluştu", 500
@@ -7,6 +7,7 @@
 from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
 from app.services.auth_service import AuthService
 from app.services.branding_service import BrandingService
+from app.services.bootstrap_service import BootstrapService
 
 # Main Blueprint (name 'main' kalıyor, URL'ler değişmiyor)
 main_bp = Blueprint('main', __name__)
@@ -37,7 +38,10 @@ def chat():
         user_email = user.get('email')
 
         branding = BrandingService.get_settings()
-        return render_template('chat.html', user_name=user_name, user_email=user_email, branding=branding)
+        # Katalog ve sohbet listeleri sayfaya gömülür; açılışta ayrı API istekleri gerekmez
+        bootstrap = BootstrapService.build(user, branding)
+        return render_template('chat.html', user_name=user_name, user_email=user_email, branding=branding,
+                               bootstrap=bootstrap)
     except Exception as e:
         return "Chat sayfası yüklenirken hata oluştu", 500
 
@@ -0,0 +1,173 @@
+# =============================================================================
+# STATIC ASSETS
+# =============================================================================
+# app/static dosyalarını parmak izli (fingerprint) URL'lerle ve önceden
+# sıkıştırılmış olarak sunar.
+#
+# - Şablonlardaki url_for('static', filename=...) çağrıları
+#   /static/v/<digest>/<filename> adresine çevrilir. digest, static ağacının
+#   içerik özetidir; herhangi bir dosya değişince tüm adresler değişir.
+#   Ağaç düzeyinde özet kullanılır çünkü JS modülleri birbirini göreli yolla
+#   import eder ('../utils/x.js'); dizin öneki böylece tüm modül grafiğine geçer.
+# - Parmak izli adresler "immutable" ve bir yıl önbelleğe alınır: tekrar
+#   ziyarette tarayıcı hiçbir şey indirmez.
+# - Metin tabanlı dosyaların gzip/brotli halleri açılışta bir kez üretilip
+#   bellekte tutulur (dosya değişirse ilk istekte mtime ile yenilenir).
+# - Düz /static/<filename> adresi (ör. veritabanındaki logo yolları) aynı
+#   işleyiciden geçer; ETag ile doğrulanır ama uzun süre önbelleğe alınmaz.
+# Debug modunda dosyalar yeniden başlatmadan değişebildiği için parmak izi kullanılmaz.
+# =============================================================================
+
+import os
+import hashlib
+import mimetypes
+import threading
+from typing import Dict, Optional, Tuple
+
+from flask import Response, abort, request, send_from_directory, url_for
+from werkzeug.security import safe_join
+
+from app.routes.compression import compress, choose_encoding, is_compressible, brotli
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+# Bellekte tutulacak azami dosya boyutu; daha büyükleri doğrudan diskten gönderilir
+MAX_CACHED_FILE_SIZE = 1024 * 1024
+
+
+class _Asset:
+    def __init__(self, mtime: float, data: bytes, mimetype: str):
+        self.mtime = mtime
+        self.data = data
+        self.mimetype = mimetype
+        self.etag = hashlib.sha1(data).hexdigest()[:20]
+        self.encoded: Dict[str, bytes] = {}
+
+
+class StaticAssets:
+    """
+    Kullanım:
+        static_assets.init_app(app)
+    """
+
+    def __init__(self):
+        self.folder: Optional[str] = None
+        self.digest: Optional[str] = None
+        self._assets: Dict[str, _Asset] = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.folder = app.static_folder
+        app.add_url_rule('/static/v/<digest>/<path:filename>', endpoint='static_versioned', view_func=self.serve_versioned)
+        app.view_functions['static'] = self.serve
+        if not app.debug:
+            self.digest = self.tree_digest()
+            app.jinja_env.globals['url_for'] = self.url_for
+            self.precompress()
+
+    def tree_digest(self) -> str:
+        """static ağacındaki dosya yolları ve içeriklerinin özeti."""
+        sha = hashlib.sha1()
+        for root, dirs, files in os.walk(self.folder):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                sha.update(os.path.relpath(path, self.folder).replace(os.sep, '/').encode('utf-8'))
+                with open(path, 'rb') as fh:
+                    sha.update(hashlib.sha1(fh.read()).digest())
+        return sha.hexdigest()[:12]
+
+    def precompress(self) -> None:
+        """Metin tabanlı dosyaların sıkıştırılmış hallerini açılışta üretir."""
+        encodings = ['gzip'] + (['br'] if brotli is not None else [])
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                filename = os.path.relpath(os.path.join(root, name), self.folder).replace(os.sep, '/')
+                asset = self._load(filename)
+                if asset is not None and self._compressible(asset):
+                    for encoding in encodings:
+                        self._encode(asset, encoding)
+
+    def url_for(self, endpoint: str, **values) -> str:
+        """Şablonlar için url_for: static adresleri parmak izli adrese çevirir."""
+        if endpoint == 'static' and self.digest:
+            return url_for('static_versioned', digest=self.digest, **values)
+        return url_for(endpoint, **values)
+
+    def _load(self, filename: str) -> Optional[_Asset]:
+        path = safe_join(self.folder, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        stat = os.stat(path)
+        if stat.st_size > MAX_CACHED_FILE_SIZE:
+            return None
+        with self._lock:
+            asset = self._assets.get(filename)
+            if asset is not None and asset.mtime == stat.st_mtime:
+                return asset
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        asset = _Asset(stat.st_mtime, data, mimetype)
+        with self._lock:
+            self._assets[filename] = asset
+        return asset
+
+    @staticmethod
+    def _compressible(asset: _Asset) -> bool:
+        return is_compressible(asset.mimetype) and len(asset.data) >= 256
+
+    @staticmethod
+    def _encode(asset: _Asset, encoding: str) -> bytes:
+        body = asset.encoded.get(encoding)
+        if body is None:
+            # Statik dosyalar bir kez sıkıştırıldığı için en yüksek seviye kullanılır
+            body = compress(asset.data, encoding, level=11 if encoding == 'br' else 9)
+            asset.encoded[encoding] = body
+        return body
+
+    def _encoded(self, asset: _Asset) -> Tuple[bytes, Optional[str]]:
+        encoding = choose_encoding() if self._compressible(asset) else None
+        if encoding is None:
+            return asset.data, None
+        return self._encode(asset, encoding), encoding
+
+    def _respond(self, filename: str, cache_control: str) -> Response:
+        asset = self._load(filename)
+        if asset is None:
+            response = send_from_directory(self.folder, filename)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        body, encoding = self._encoded(asset)
+        etag = asset.etag + (f'-{encoding}' if encoding else '')
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype=asset.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        if is_compressible(asset.mimetype):
+            response.vary.add('Accept-Encoding')
+        return response
+
+    def serve(self, filename: str) -> Response:
+        return self._respond(filename, REVALIDATE_CACHE_CONTROL)
+
+    def serve_versioned(self, digest: str, filename: str) -> Response:
+        # Eski bir parmak iziyle gelen istek (yeniden başlatma sonrası) güncel dosyayı alır ama uzun süre saklanmaz
+        cache_control = IMMUTABLE_CACHE_CONTROL if digest == self.digest else REVALIDATE_CACHE_CONTROL
+        return self._respond(filename, cache_control)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'digest': self.digest,
+                'cached_files': len(self._assets),
+                'brotli': brotli is not None,
+            }
+
+
+# Uygulama genelinde paylaşılan örnek
+static_assets = StaticAssets()
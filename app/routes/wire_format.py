@@ -0,0 +1,143 @@
+# =============================================================================
+# WIRE FORMAT
+# =============================================================================
+# JSON API yanıtları için içerik anlaşması (content negotiation) ve hızlı
+# JSON sağlayıcısı.
+#
+# Varsayılan yanıt biçimi değişmez (application/json, satır başına nesne).
+# İstemci isterse:
+# - Accept: application/vnd.zekai.compact+json (veya ?format=compact)
+#   Satır listeleri sütun dizilerine çevrilir: anahtarlar satır başına değil
+#   liste başına bir kez yazılır -> {"columns": [...], "values": [[...], ...]}
+#   values[i], columns[i] sütununun tüm satırlardaki değerleridir.
+# - Accept: application/msgpack (msgpack paketi kuruluysa)
+#   Compact yapı MessagePack ile ikili olarak kodlanır.
+#
+# orjson kuruluysa Flask'ın JSON sağlayıcısı OrjsonProvider ile değiştirilir
+# (FAST_JSON=0 ile kapatılabilir). Çıktı varsayılan sağlayıcı ile uyumludur:
+# anahtarlar sıralı, tarih alanları aynı biçimde.
+# =============================================================================
+
+import os
+from typing import Any, Dict, Iterable, List, Sequence
+
+from flask import Response, current_app, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # opsiyonel bağımlılık
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # opsiyonel bağımlılık
+    msgpack = None
+
+COMPACT_MIMETYPE = 'application/vnd.zekai.compact+json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson tabanlı JSON sağlayıcısı; desteklemediği seçeneklerde varsayılana döner."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        indent = kwargs.pop('indent', None)
+        kwargs.pop('separators', None)
+        if kwargs or indent not in (None, 2):
+            kwargs['indent'] = indent
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        # datetime/Decimal/UUID varsayılan sağlayıcı ile aynı biçimde yazılır
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def install_json_provider(app) -> None:
+    """orjson kuruluysa (ve FAST_JSON kapatılmadıysa) uygulamanın JSON sağlayıcısını değiştirir."""
+    enabled = str(os.getenv('FAST_JSON', '1')).lower() in ('1', 'true', 'yes', 'on')
+    if orjson is not None and enabled:
+        app.json = OrjsonProvider(app)
+
+
+def columnar(rows: Sequence[Dict[str, Any]], drop: Iterable[str] = ()) -> Dict[str, Any]:
+    """Satır listesini sütun dizilerine çevirir; drop'taki sütunlar yazılmaz."""
+    dropped = set(drop)
+    columns: List[str] = []
+    for row in rows:
+        for key in row:
+            if key not in dropped and key not in columns:
+                columns.append(key)
+    return {
+        'columns': columns,
+        'values': [[row.get(key) for row in rows] for key in columns],
+    }
+
+
+def _compact_at(node: Any, path: Sequence[str], drop: Iterable[str]) -> Any:
+    # path: iç içe anahtarlar; '*' bir sözlüğün tüm değerlerine uygulanır
+    if not path:
+        if isinstance(node, list) and all(isinstance(row, dict) for row in node):
+            return columnar(node, drop)
+        return node
+    if not isinstance(node, dict):
+        return node
+    head, rest = path[0], path[1:]
+    if head == '*':
+        return {key: _compact_at(value, rest, drop) for key, value in node.items()}
+    if head not in node:
+        return node
+    return dict(node, **{head: _compact_at(node[head], rest, drop)})
+
+
+def _accepts(mimetype: str) -> bool:
+    # Yalnızca açıkça istenen tür sayılır; */* varsayılan JSON'u seçer
+    return any(value == mimetype and quality > 0 for value, quality in request.accept_mimetypes)
+
+
+def requested_format() -> str:
+    """İstemcinin istediği biçim: 'msgpack', 'compact' veya 'json'."""
+    fmt = (request.args.get('format') or '').lower()
+    if fmt in ('compact', 'msgpack', 'json'):
+        return fmt if fmt != 'msgpack' or msgpack is not None else 'compact'
+    if msgpack is not None and any(_accepts(m) for m in MSGPACK_MIMETYPES):
+        return 'msgpack'
+    if _accepts(COMPACT_MIMETYPE):
+        return 'compact'
+    return 'json'
+
+
+def negotiated(payload: Dict[str, Any], *paths: str, drop: Iterable[str] = (),
+               status: int = 200) -> Response:
+    """
+    payload'ı istenen biçimde döndürür.
+
+    Args:
+        payload: Servis sonucu (dict)
+        paths: Sütunlara çevrilecek satır listelerinin yolları ("messages", "active.chats", "chats.*.messages")
+        drop: Compact biçimde yazılmayacak tekrarlı sütunlar
+        status: HTTP durum kodu
+    """
+    fmt = requested_format()
+    if fmt == 'json':
+        response = jsonify(payload)
+    else:
+        body = payload
+        for path in paths:
+            body = _compact_at(body, path.split('.'), drop)
+        body = dict(body, format='columnar')
+        if fmt == 'msgpack':
+            response = Response(msgpack.packb(body, default=str, use_bin_type=True), mimetype=MSGPACK_MIMETYPES[0])
+        else:
+            response = Response(current_app.json.dumps(body, separators=(',', ':')), mimetype=COMPACT_MIMETYPE)
+    response.status_code = status
+    response.vary.add('Accept')
+    return response
@@ -0,0 +1,301 @@
+# =============================================================================
+# AUTOCOMPLETE INDEX
+# =============================================================================
+# Model ve sohbet araması için bellek içi otomatik tamamlama dizini.
+#
+# - Metinler fold() ile katlanır (büyük/küçük harf ve Türkçe karakter farkı yok)
+#   ve kelimelere bölünür. Kelimeler sıralı bir dizide tutulur; önek araması
+#   ikili arama + ardışık tarama ile yapılır (sıralı dizi = sıkıştırılmış trie).
+# - Sorgunun her kelimesi belgedeki bir kelimenin öneki olmalıdır. Puan:
+#   tam kelime > önek, alan ağırlığı (ör. model_name > provider_name), alanın
+#   sorguyla başlaması ve kelimenin alandaki sırası.
+# - Önek eşleşmesi yetmezse sözlükteki kelimeler arasında karakter bigram
+#   (2-gram) benzerliği ile bulanık eşleme yapılır (yazım hataları:
+#   "cluade" -> "claude", "sonet" -> "sonnet"). Sözlük belge sayısından çok
+#   küçük olduğu için bu geçiş de ucuzdur.
+#
+# Modeller: katalog version'ı değişince yeniden kurulur.
+# Sohbetler: kullanıcı başına ilk aramada yüklenir; chat_list_cache sürümü
+# (sohbet oluşturma / mesaj / arşiv) değişince bir sonraki aramada yenilenir.
+# =============================================================================
+
+import os
+import re
+import time
+import bisect
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.services.catalog_cache import catalog_cache
+from app.services.catalog_index import fold
+from app.services.chat_list_cache import chat_list_cache
+from app.database.repositories.chat_repository import ChatRepository
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+AUTOCOMPLETE_LIMIT_MAX = int(_env_float('AUTOCOMPLETE_LIMIT_MAX', 50))
+# Bulanık eşleme için asgari bigram benzerliği (Jaccard)
+FUZZY_THRESHOLD = _env_float('AUTOCOMPLETE_FUZZY_THRESHOLD', 0.35)
+
+_WORD = re.compile(r'\w+')
+
+# Field: (alan adı, metin, ağırlık)
+Field = Tuple[str, Optional[str], float]
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _WORD.findall(fold(text))
+
+
+def bigrams(text: str) -> Set[str]:
+    padded = f" {text} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class PrefixIndex:
+    """
+    Değişmeyen önek + bigram dizini.
+
+    Args:
+        docs: (payload, [(alan, metin, ağırlık), ...]) listesi
+    """
+
+    def __init__(self, docs: Sequence[Tuple[Dict[str, Any], Sequence[Field]]]):
+        self.payloads: List[Dict[str, Any]] = []
+        # doc -> [(alan, katlanmış metin, ağırlık)]
+        self.fields: List[List[Tuple[str, str, float]]] = []
+        # kelime -> {doc: (ağırlık / konum cezası, alan, alanın ilk kelimesi mi)}
+        token_docs: Dict[str, Dict[int, Tuple[float, str, bool]]] = {}
+        for doc, (payload, fields) in enumerate(docs):
+            self.payloads.append(payload)
+            folded_fields = []
+            for name, text, weight in fields:
+                words = tokenize(text)
+                folded_fields.append((name, ' '.join(words), weight))
+                for position, token in enumerate(words):
+                    base = weight / (1.0 + 0.1 * position)
+                    postings = token_docs.setdefault(token, {})
+                    if base > postings.get(doc, (0.0, '', False))[0]:
+                        postings[doc] = (base, name, position == 0)
+            self.fields.append(folded_fields)
+        # Sözlük: benzersiz kelimeler sıralı; bulanık eşleme kelime düzeyinde yapılır
+        self.tokens = sorted(token_docs)
+        self.postings = [list(token_docs[token].items()) for token in self.tokens]
+        self.token_grams = [bigrams(token) for token in self.tokens]
+        self.gram_tokens: Dict[str, List[int]] = {}
+        for i, grams in enumerate(self.token_grams):
+            for gram in grams:
+                self.gram_tokens.setdefault(gram, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def _similar_tokens(self, qt: str) -> Dict[int, float]:
+        """Sözlükte qt'ye bigram benzerliği eşiği geçen kelimeler -> benzerlik."""
+        grams = bigrams(qt)
+        # Jaccard >= eşik için en az bu kadar ortak bigram gerekir (birleşim >= sorgu)
+        required = FUZZY_THRESHOLD * len(grams)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for i in self.gram_tokens.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+        similar = {}
+        for i, count in shared.items():
+            if count >= required:
+                similarity = count / (len(grams) + len(self.token_grams[i]) - count)
+                if similarity >= FUZZY_THRESHOLD:
+                    similar[i] = similarity
+        return similar
+
+    def _match(self, query_tokens: List[str], fuzzy: bool) -> Dict[int, List[Any]]:
+        # doc -> [toplam puan, en iyi eşleşen alan, ilk sorgu kelimesi alanın başında mı]
+        scores: Optional[Dict[int, List[Any]]] = None
+        for qt in query_tokens:
+            # Eşleşen sözlük kelimeleri -> çarpan (tam 2, önek 1-2, bulanık < 0.5)
+            factors: Dict[int, float] = {}
+            if fuzzy and len(qt) >= 3:
+                factors = {i: similarity * 0.5 for i, similarity in self._similar_tokens(qt).items()}
+            i = bisect.bisect_left(self.tokens, qt)
+            while i < len(self.tokens) and self.tokens[i].startswith(qt):
+                factors[i] = 2.0 if self.tokens[i] == qt else 1.0 + len(qt) / len(self.tokens[i])
+                i += 1
+            best: Dict[int, List[Any]] = {}
+            for i, factor in factors.items():
+                exact_or_prefix = factor >= 1.0
+                for doc, (base, name, lead) in self.postings[i]:
+                    score = base * factor
+                    current = best.get(doc)
+                    if current is None:
+                        best[doc] = [score, name, lead and exact_or_prefix]
+                    else:
+                        if score > current[0]:
+                            current[0], current[1] = score, name
+                        current[2] = current[2] or (lead and exact_or_prefix)
+            if scores is None:
+                scores = best
+            else:
+                merged = {}
+                for doc, (score, name, _) in best.items():
+                    current = scores.get(doc)
+                    if current is not None:
+                        merged[doc] = [current[0] + score, current[1] if current[0] >= score else name, current[2]]
+                scores = merged
+            if not scores:
+                return {}
+        return scores or {}
+
+    def search(self, query: str, limit: int = 10,
+               tiebreak: Optional[Callable[[Dict[str, Any]], Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Sıralı sonuçlar: payload + match (eşleşen alan) + score.
+        tiebreak: eşit puanlı sonuçlar için ek sıralama anahtarı (küçük olan önce)
+        Sonuçlara eklenen match ve score payload'a yazılmaz, kopyaya eklenir.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        phrase = ' '.join(query_tokens)
+        scores = self._match(query_tokens, fuzzy=False)
+        for doc, entry in scores.items():
+            # Alan sorguyla başlıyorsa ("gpt 4" -> "gpt 4o mini") öne çıkar
+            if entry[2] and (len(query_tokens) == 1
+                             or any(text.startswith(phrase) for _, text, _ in self.fields[doc])):
+                entry[0] *= 1.5
+        # Önek sonuçları yetmezse yazım hatası toleranslı ikinci geçiş
+        if len(scores) < limit and any(len(qt) >= 3 for qt in query_tokens):
+            for doc, entry in self._match(query_tokens, fuzzy=True).items():
+                scores.setdefault(doc, entry)
+
+        def order(doc: int):
+            key = (-scores[doc][0], len(self.fields[doc][0][1]))
+            # Son olarak ekleme sırası: belgeler tercih sırasıyla verilmişse (ör. en yeni sohbet) o korunur
+            return key + ((tiebreak(self.payloads[doc]),) if tiebreak else ()) + (doc,)
+
+        ranked = heapq.nsmallest(limit, scores, key=order)
+        return [dict(self.payloads[doc], match=scores[doc][1], score=round(scores[doc][0], 3)) for doc in ranked]
+
+
+class ModelAutocomplete:
+    """
+    Kullanım:
+        model_autocomplete.search('gpt 4', limit=8)
+    """
+
+    # Sonuçta döndürülen katalog alanları
+    FIELDS = ('model_id', 'model_name', 'request_model_name', 'provider_name', 'logo_path', 'is_active')
+
+    def __init__(self):
+        self._version: Optional[str] = None
+        self._index: Optional[PrefixIndex] = None
+        self._lock = threading.Lock()
+        self._builds = 0
+
+    def _current(self) -> PrefixIndex:
+        snapshot = catalog_cache.snapshot()
+        if self._index is not None and self._version == snapshot['version']:
+            return self._index
+        with self._lock:
+            if self._index is None or self._version != snapshot['version']:
+                docs = []
+                for model in snapshot['models']:
+                    payload = {key: model.get(key) for key in self.FIELDS}
+                    docs.append((payload, [
+                        ('model_name', model.get('model_name'), 3.0),
+                        ('request_model_name', model.get('request_model_name'), 2.0),
+                        ('provider_name', model.get('provider_name'), 1.0),
+                    ]))
+                self._index = PrefixIndex(docs)
+                self._version = snapshot['version']
+                self._builds += 1
+            return self._index
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        limit = max(1, min(limit, AUTOCOMPLETE_LIMIT_MAX))
+        # Aktif modeller pasiflerden önce
+        return self._current().search(query, limit, tiebreak=lambda m: not m.get('is_active'))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'version': self._version,
+            'models': len(self._index) if self._index else 0,
+            'builds': self._builds,
+        }
+
+
+class ChatAutocomplete:
+    """
+    Kullanım:
+        chat_autocomplete.search(user_id, 'proje', limit=8)
+    """
+
+    def __init__(self):
+        self.ttl = _env_float('CHAT_AUTOCOMPLETE_TTL', 300)
+        self.max_users = int(_env_float('CHAT_AUTOCOMPLETE_MAX_USERS', 2000))
+        self.max_chats = int(_env_float('CHAT_AUTOCOMPLETE_MAX_CHATS', 5000))
+        # user_id -> (liste sürümü, expires_at, dizin); en eski kullanılan önce atılır
+        self._entries: 'OrderedDict[int, Tuple[int, float, PrefixIndex]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._loads = 0
+
+    def _load(self, user_id: int) -> PrefixIndex:
+        rows = ChatRepository.list_search_entries(user_id, self.max_chats)
+        docs = []
+        for row in rows:
+            payload = {
+                'chat_id': row.get('chat_id'),
+                'title': row.get('title'),
+                'model_name': row.get('model_name'),
+                'is_active': bool(row.get('is_active')),
+                'last_message_at': row['last_message_at'].isoformat() if row.get('last_message_at') else None,
+            }
+            docs.append((payload, [
+                ('title', row.get('title'), 3.0),
+                ('model_name', row.get('model_name'), 1.0),
+            ]))
+        self._loads += 1
+        return PrefixIndex(docs)
+
+    def _current(self, user_id: int) -> PrefixIndex:
+        version = chat_list_cache.version(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] == version and entry[1] > now:
+                self._entries.move_to_end(user_id)
+                return entry[2]
+        index = self._load(user_id)
+        with self._lock:
+            # Yükleme sürerken liste değiştiyse dizin saklanmaz (sonraki arama yeniden yükler)
+            if chat_list_cache.version(user_id) == version:
+                self._entries[user_id] = (version, now + self.ttl, index)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+        return index
+
+    def search(self, user_id: int, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        limit = max(1, min(limit, AUTOCOMPLETE_LIMIT_MAX))
+        # Satırlar son mesaj sırasıyla yüklendiği için eşit puanda yeni sohbet önce gelir
+        return self._current(user_id).search(query, limit)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'users': len(self._entries),
+                'chats': sum(len(entry[2]) for entry in self._entries.values()),
+                'loads': self._loads,
+                'ttl': self.ttl,
+            }
+
+
+# Uygulama genelinde paylaşılan örnekler
+model_autocomplete = ModelAutocomplete()
+chat_autocomplete = ChatAutocomplete()
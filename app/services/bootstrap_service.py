@@ -0,0 +1,49 @@
+# =============================================================================
+# BOOTSTRAP SERVICE
+# =============================================================================
+# /chat sayfasına gömülen başlangıç verisi. Uygulama açılışta kullanıcı,
+# marka, katalog (modeller + kategoriler) ve sohbet listelerini ayrı ayrı
+# istiyordu; bu veri önbellekli servislerden tek seferde üretilip sayfaya
+# JSON olarak yazılır, böylece ilk çizim için ek istek gerekmez.
+# =============================================================================
+
+import logging
+from typing import Any, Dict
+
+from app.services.branding_service import BrandingService
+from app.services.catalog_cache import catalog_cache
+from app.services.chat_service import ChatService
+
+_chat_service = ChatService()
+
+
+class BootstrapService:
+    @staticmethod
+    def build(user: Dict[str, Any], branding: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Sayfaya gömülecek başlangıç verisi. Bir bölüm üretilemezse None yazılır;
+        istemci o bölüm için ilgili API'ye geri döner.
+        """
+        payload: Dict[str, Any] = {
+            'user': {
+                'user_id': user.get('user_id'),
+                'email': user.get('email'),
+                'first_name': user.get('first_name'),
+                'last_name': user.get('last_name'),
+                'is_admin': bool(user.get('is_admin')),
+            },
+            'branding': branding if branding is not None else BrandingService.get_settings(),
+            'catalog': None,
+            'chats': None,
+        }
+        try:
+            payload['catalog'] = catalog_cache.snapshot()
+        except Exception as e:
+            logging.warning("[Bootstrap] katalog üretilemedi: %s", e)
+        try:
+            overview = _chat_service.get_chat_overview(user_id=user['user_id'])
+            if overview.get('success'):
+                payload['chats'] = {'active': overview['active'], 'archived': overview['archived']}
+        except Exception as e:
+            logging.warning("[Bootstrap] sohbet listesi üretilemedi: %s", e)
+        return payload
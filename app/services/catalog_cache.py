@@ -0,0 +1,95 @@
+# =============================================================================
+# CATALOG CACHE
+# =============================================================================
+# Model ve kategori kataloğunun bellek içi kopyası. Katalog seyrek değişir
+# (admin işlemleri, katalog senkronizasyonu) ama her sayfa açılışında okunur.
+# Yazma yapan servisler invalidate() çağırır; CATALOG_CACHE_TTL çoklu
+# process kurulumlarında güncellemenin en geç ne zaman görüleceğini belirler.
+#
+# version: katalog içeriğinin özeti. İçerik aynıysa her process'te aynıdır;
+# istemci kendi kopyasının güncel olup olmadığını buna göre anlar.
+# =============================================================================
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.database.repositories.model_repository import ModelRepository
+from app.database.repositories.category_repository import CategoryRepository
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class CatalogCache:
+    """
+    Kullanım:
+        catalog_cache.models()        # get_all_models_with_categories satırları (liste görünümü)
+        catalog_cache.categories()
+        catalog_cache.snapshot()      # {"version", "models", "categories"}
+        catalog_cache.invalidate()    # model / kategori / atama değişti
+    """
+
+    def __init__(self):
+        self.ttl = _env_float('CATALOG_CACHE_TTL', 60)
+        self._data: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._data is not None and self._expires_at > time.monotonic():
+                return self._data
+            generation = self._generation
+        models = ModelRepository.get_all_models_with_categories() or []
+        categories = CategoryRepository.get_all_categories() or []
+        # Modeller liste projeksiyonuyla okunur (ModelRepository.LIST_COLUMNS); gizli alan içermez
+        material = json.dumps([models, categories], sort_keys=True, default=str)
+        data = {
+            'version': hashlib.sha1(material.encode('utf-8')).hexdigest()[:16],
+            'models': models,
+            'categories': categories,
+        }
+        with self._lock:
+            # Yükleme sürerken invalidate edildiyse sonuç yalnızca bu çağrıda kullanılır
+            if generation == self._generation and (models or categories):
+                self._data = data
+                self._expires_at = time.monotonic() + self.ttl
+        return data
+
+    def models(self) -> List[Dict[str, Any]]:
+        return self._load()['models']
+
+    def categories(self) -> List[Dict[str, Any]]:
+        return self._load()['categories']
+
+    def version(self) -> str:
+        return self._load()['version']
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = self._load()
+        return {'version': data['version'], 'models': data['models'], 'categories': data['categories']}
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'cached': self._data is not None,
+                'version': self._data['version'] if self._data else None,
+                'ttl': self.ttl,
+            }
+
+
+# Uygulama genelinde paylaşılan örnek
+catalog_cache = CatalogCache()
@@ -0,0 +1,265 @@
+# =============================================================================
+# CATALOG INDEX
+# =============================================================================
+# Model kataloğu üzerinde filtreleme, arama ve cursor sayfalama.
+# catalog_cache'teki satırlardan bellek içi bir dizin kurulur ve katalog
+# version'ı değişince yeniden kurulur; sorgular veritabanına gitmez.
+#
+# - Modeller (model_name, model_id) sırasıyla numaralanır (ordinal).
+# - provider / kategori / aktiflik için ordinal bitmap'leri tutulur (Python
+#   int; bit i = ordinal i). Filtreler AND, kategori "herhangi biri" OR ile
+#   uygulanır; sayımlar bit_count() ile yapılır. Birkaç yüz modelde bir
+#   bitmap birkaç düzine makine kelimesidir, işlemler mikro saniye sürer.
+# - q: model_name ve provider_name üzerinde büyük/küçük harf duyarsız arama
+#   (Türkçe karakterler katlanır: I/ı/İ -> i, ş -> s, ...).
+# - cursor: son döndürülen satırın sıralama anahtarı (opak, base64). Anahtar
+#   ordinal değil değerin kendisi olduğu için katalog araya değişse de
+#   sayfalama kaldığı yerden devam eder.
+# =============================================================================
+
+import os
+import json
+import base64
+import bisect
+import threading
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.services.catalog_cache import catalog_cache
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+CATALOG_PAGE_DEFAULT = _env_int('CATALOG_PAGE_DEFAULT', 50)
+CATALOG_PAGE_MAX = _env_int('CATALOG_PAGE_MAX', 200)
+
+# Türkçe klavye olmadan yazılan aramalar da eşleşsin: 'isik' -> 'Işık', 'cay' -> 'Çay'
+_TURKISH_FOLD = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i',
+    'Ş': 's', 'ş': 's', 'Ç': 'c', 'ç': 'c', 'Ğ': 'g', 'ğ': 'g',
+    'Ö': 'o', 'ö': 'o', 'Ü': 'u', 'ü': 'u',
+})
+
+
+def fold(text: Optional[str]) -> str:
+    """Arama için metni katlar: büyük/küçük harf ve Türkçe karakter farkı (I/ı/İ, ş, ç, ğ, ö, ü) yok sayılır."""
+    return (text or '').translate(_TURKISH_FOLD).casefold()
+
+
+def _sort_key(model: Dict[str, Any]) -> Tuple[str, int]:
+    return fold(model.get('model_name')), int(model.get('model_id') or 0)
+
+
+def encode_cursor(key: Tuple[str, int]) -> str:
+    raw = json.dumps(list(key), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Geçersiz cursor için ValueError fırlatır."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        name, model_id = json.loads(raw.decode('utf-8'))
+        return str(name), int(model_id)
+    except Exception:
+        raise ValueError('Geçersiz cursor')
+
+
+QUERY_PARAMS = ('provider', 'category_id', 'categories', 'match', 'active', 'q', 'cursor', 'limit')
+
+
+def parse_query(params) -> Dict[str, Any]:
+    """
+    İstek parametrelerini query() argümanlarına çevirir.
+    Geçersiz değerde ValueError fırlatır.
+    """
+    query: Dict[str, Any] = {}
+    for name in ('provider', 'q', 'cursor'):
+        value = (params.get(name) or '').strip()
+        if value:
+            query[name] = value
+    for name in ('category_id', 'limit'):
+        value = params.get(name)
+        if value not in (None, ''):
+            try:
+                query[name] = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f'Geçersiz {name}')
+    categories = (params.get('categories') or '').strip()
+    if categories:
+        try:
+            query['category_ids'] = [int(c) for c in categories.split(',') if c.strip()]
+        except ValueError:
+            raise ValueError('Geçersiz categories')
+    match = (params.get('match') or '').strip().lower()
+    if match:
+        if match not in ('any', 'all'):
+            raise ValueError('Geçersiz match')
+        query['match'] = match
+    active = (params.get('active') or '').strip().lower()
+    if active:
+        if active not in ('1', '0', 'true', 'false'):
+            raise ValueError('Geçersiz active')
+        query['active'] = active in ('1', 'true')
+    if 'cursor' in query:
+        decode_cursor(query['cursor'])
+    return query
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Bitmap'teki ordinal'leri artan sırayla üretir."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class _IndexState:
+    """Belirli bir katalog sürümü için kurulmuş, değişmeyen dizin."""
+
+    def __init__(self, version: str, models: List[Dict[str, Any]]):
+        self.version = version
+        self.rows = sorted(models, key=_sort_key)
+        self.keys = [_sort_key(m) for m in self.rows]
+        self.search_text = [fold(f"{m.get('model_name') or ''} {m.get('provider_name') or ''}") for m in self.rows]
+        self.all = (1 << len(self.rows)) - 1
+        self.active = 0
+        self.by_provider: Dict[str, int] = {}
+        self.by_category: Dict[int, int] = {}
+        for ordinal, model in enumerate(self.rows):
+            bit = 1 << ordinal
+            if model.get('is_active'):
+                self.active |= bit
+            provider = fold(model.get('provider_name'))
+            if provider:
+                self.by_provider[provider] = self.by_provider.get(provider, 0) | bit
+            for category in model.get('categories') or []:
+                category_id = int(category['category_id'])
+                self.by_category[category_id] = self.by_category.get(category_id, 0) | bit
+
+    def categories_bits(self, category_ids: Sequence[int], match: str = 'any') -> int:
+        """Kategorilerin birleşimi ('any') veya kesişimi ('all')."""
+        maps = [self.by_category.get(int(c), 0) for c in category_ids]
+        if not maps:
+            return self.all
+        bits = maps[0]
+        for other in maps[1:]:
+            bits = bits & other if match == 'all' else bits | other
+        return bits
+
+
+class CatalogIndex:
+    """
+    Kullanım:
+        page = catalog_index.query(provider='openrouter', category_ids=[3, 5], match='all', q='gpt', limit=20)
+        page = catalog_index.query(cursor=page['next_cursor'], ...)
+        catalog_index.category_models([3])         # kategorideki tüm modeller
+        catalog_index.category_counts()            # {category_id: model sayısı}
+    """
+
+    def __init__(self):
+        self._state: Optional[_IndexState] = None
+        self._lock = threading.Lock()
+        self._builds = 0
+        self._queries = 0
+
+    def _current(self) -> _IndexState:
+        snapshot = catalog_cache.snapshot()
+        state = self._state
+        if state is not None and state.version == snapshot['version']:
+            return state
+        with self._lock:
+            if self._state is None or self._state.version != snapshot['version']:
+                self._state = _IndexState(snapshot['version'], snapshot['models'])
+                self._builds += 1
+            return self._state
+
+    def query(self, provider: Optional[str] = None, category_id: Optional[int] = None,
+              category_ids: Optional[Sequence[int]] = None, match: str = 'any',
+              active: Optional[bool] = None, q: Optional[str] = None,
+              cursor: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Filtrelenmiş model sayfası.
+
+        Args:
+            provider: provider_name (büyük/küçük harf duyarsız)
+            category_id: Kategori ID'si
+            category_ids: Birden çok kategori; match='all' hepsinde, 'any' herhangi birinde olanlar
+            active: True/False ise is_active'e göre filtreler
+            q: model_name / provider_name içinde aranacak metin
+            cursor: Önceki sayfanın next_cursor değeri
+            limit: Sayfa boyutu (CATALOG_PAGE_MAX ile sınırlı)
+
+        Returns:
+            Dict[str, Any]: data, count, total, next_cursor, version
+        """
+        state = self._current()
+        self._queries += 1
+        limit = max(1, min(limit or CATALOG_PAGE_DEFAULT, CATALOG_PAGE_MAX))
+
+        bits = state.all
+        if provider:
+            bits &= state.by_provider.get(fold(provider), 0)
+        if category_id is not None:
+            bits &= state.by_category.get(int(category_id), 0)
+        if category_ids:
+            bits &= state.categories_bits(category_ids, match)
+        if active is not None:
+            bits &= state.active if active else state.all & ~state.active
+
+        needle = fold(q).strip()
+        if needle:
+            bits = sum(1 << o for o in iter_bits(bits) if needle in state.search_text[o])
+        # total tüm eşleşmelerin sayısıdır; cursor yalnızca sayfanın başlangıcını belirler
+        total = bits.bit_count()
+
+        if cursor:
+            # Anahtarı cursor'dan büyük satırlar: alttaki bitler temizlenir
+            after = bisect.bisect_right(state.keys, decode_cursor(cursor))
+            bits = bits >> after << after
+
+        page = list(islice(iter_bits(bits), limit + 1))
+        has_more = len(page) > limit
+        page = page[:limit]
+        return {
+            'data': [state.rows[o] for o in page],
+            'count': len(page),
+            'total': total,
+            'next_cursor': encode_cursor(state.keys[page[-1]]) if page and has_more else None,
+            'version': state.version,
+        }
+
+    def category_models(self, category_ids: Sequence[int], match: str = 'any') -> List[Dict[str, Any]]:
+        """Kategori(ler)deki tüm modeller, model_name sırasıyla."""
+        state = self._current()
+        self._queries += 1
+        return [state.rows[o] for o in iter_bits(state.categories_bits(category_ids, match))]
+
+    def category_counts(self, within: Optional[Sequence[int]] = None, match: str = 'all') -> Dict[int, int]:
+        """
+        Kategori başına model sayısı. within verilirse yalnızca o kategori
+        seçimindeki modeller sayılır (ör. seçili kategorilerle birlikte daraltma).
+        """
+        state = self._current()
+        base = state.categories_bits(within, match) if within else state.all
+        return {category_id: (bits & base).bit_count() for category_id, bits in state.by_category.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        state = self._state
+        return {
+            'version': state.version if state else None,
+            'models': len(state.rows) if state else 0,
+            'providers': len(state.by_provider) if state else 0,
+            'categories': len(state.by_category) if state else 0,
+            'builds': self._builds,
+            'queries': self._queries,
+        }
+
+
+# Uygulama genelinde paylaşılan örnek
+catalog_index = CatalogIndex()
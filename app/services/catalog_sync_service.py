@@ -0,0 +1,149 @@
+# =============================================================================
+# CATALOG SYNC SERVICE
+# =============================================================================
+# Provider model kataloğunu (önbellekli liste üzerinden) models tablosu ile
+# karşılaştırır ve farkları toplu upsert ile tek transaction'da uygular.
+# request_model_name anahtar olarak kullanılır; tekrar çalıştırmak güvenlidir.
+# =============================================================================
+
+import threading
+from typing import Dict, Any, List, Optional
+from app.database.repositories.model_repository import ModelRepository
+from app.services.providers.factory import ProviderFactory
+from app.services.catalog_cache import catalog_cache
+from app.services.chat_list_cache import chat_list_cache
+
+
+class CatalogSyncService:
+    """
+    Provider kataloğu -> models tablosu senkronizasyonu.
+    """
+
+    # Senkronizasyonun sahip olduğu alanlar; logo, api_key, is_active ve
+    # kategori atamaları admin tarafından yönetilir ve ezilmez.
+    SYNC_FIELDS = ('model_name', 'description')
+
+    # Aynı anda tek senkronizasyon (zamanlanmış iş + manuel tetikleme çakışmasın)
+    _lock = threading.Lock()
+
+    def sync_provider(self, provider_type: str = 'openrouter', api_key: Optional[str] = None,
+                      dry_run: bool = False, activate_new: bool = False) -> Dict[str, Any]:
+        """
+        Provider kataloğunu models tablosuna senkronize eder.
+
+        Args:
+            provider_type: Senkronize edilecek provider ('openrouter', 'gemini')
+            api_key: Katalog için kullanılacak anahtar; verilmezse DB'deki ilk anahtar
+            dry_run: True ise yalnızca fark raporu döner, yazma yapılmaz
+            activate_new: Yeni eklenen modeller aktif olarak mı eklensin
+
+        Returns:
+            Dict[str, Any]: {success, data: {added, changed, unchanged, ...}}
+        """
+        provider_type = (provider_type or '').lower()
+        if provider_type not in ('openrouter', 'gemini'):
+            return {'success': False, 'error': f'Desteklenmeyen provider türü: {provider_type}'}
+
+        if not self._lock.acquire(blocking=False):
+            return {'success': False, 'error': 'Senkronizasyon zaten çalışıyor'}
+        try:
+            api_key = api_key or ModelRepository.get_provider_api_key(provider_type)
+            if not api_key:
+                return {'success': False, 'error': 'Provider için API anahtarı bulunamadı'}
+
+            listing = ProviderFactory.get_available_models(provider_type, api_key)
+            if not listing.get('success'):
+                return {'success': False, 'error': listing.get('error', 'Model listesi alınamadı')}
+            catalog = [self._to_row(provider_type, m) for m in (listing.get('models') or [])]
+            catalog = [row for row in catalog if row]
+            if not catalog:
+                return {'success': False, 'error': 'Provider kataloğu boş'}
+
+            existing = {
+                row['request_model_name']: row
+                for row in ModelRepository.get_models_by_provider_type(provider_type)
+                if row.get('request_model_name')
+            }
+
+            new_rows: List[Dict[str, Any]] = []
+            changed_rows: List[Dict[str, Any]] = []
+            unchanged = 0
+            seen = set()
+            for row in catalog:
+                key = row['request_model_name']
+                if key in seen:
+                    continue
+                seen.add(key)
+                current = existing.get(key)
+                if current is None:
+                    row.update({'provider_type': provider_type, 'api_key': api_key, 'is_active': bool(activate_new)})
+                    new_rows.append(row)
+                    continue
+                diff = {f: row.get(f) for f in self.SYNC_FIELDS if (current.get(f) or '') != (row.get(f) or '')}
+                if not diff:
+                    unchanged += 1
+                    continue
+                merged = {
+                    'model_id': current['model_id'],
+                    'model_name': current.get('model_name'),
+                    'provider_name': current.get('provider_name'),
+                    'provider_type': provider_type,
+                }
+                merged.update(diff)
+                changed_rows.append(merged)
+
+            report = {
+                'provider_type': provider_type,
+                'added': len(new_rows),
+                'changed': len(changed_rows),
+                'unchanged': unchanged,
+                'catalog_size': len(seen),
+                'dry_run': bool(dry_run),
+            }
+            if dry_run or (not new_rows and not changed_rows):
+                return {'success': True, 'data': report}
+
+            ok = ModelRepository.upsert_models(new_rows, changed_rows, list(self.SYNC_FIELDS))
+            catalog_cache.invalidate()
+            if changed_rows:
+                # model_name değişmiş olabilir; sohbet listeleri adı içerir
+                chat_list_cache.clear()
+            if not ok:
+                return {'success': False, 'error': 'Senkronizasyon yazılamadı', 'data': report}
+            return {'success': True, 'data': report, 'message': 'Katalog senkronize edildi'}
+        except Exception as e:
+            return {'success': False, 'error': 'Katalog senkronizasyonu başarısız'}
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _to_row(provider_type: str, model: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Provider katalog kaydını models satırına dönüştürür."""
+        if provider_type == 'openrouter':
+            request_name = model.get('id')
+            display = model.get('name') or request_name
+            # OpenRouter adları "Vendor: Model" biçimindedir
+            vendor = display.split(':', 1)[0].strip() if ':' in (display or '') else (request_name or '').split('/', 1)[0]
+            return {
+                'model_name': display,
+                'request_model_name': request_name,
+                'provider_name': vendor or 'OpenRouter',
+                'description': model.get('description') or None,
+            } if request_name else None
+        request_name = model.get('name')
+        return {
+            'model_name': model.get('display_name') or request_name,
+            'request_model_name': request_name,
+            'provider_name': 'Google',
+            'description': model.get('description') or None,
+        } if request_name else None
+
+
+if __name__ == "__main__":
+    # Zamanlanmış çalıştırma (cron): python -m app.services.catalog_sync_service
+    # Özet stdout'a yazılır; başarısız senkronizasyon sıfırdan farklı çıkış kodu döndürür
+    import sys
+    import json
+    summary = CatalogSyncService().sync_provider('openrouter')
+    print(json.dumps(summary, ensure_ascii=False, default=str))
+    sys.exit(0 if summary.get('success') else 1)
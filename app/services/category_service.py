@@ -4,14 +4,18 @@
 # Kategoriler ve kategoriye göre modeller için servis katmanı
 # =============================================================================
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.database.repositories.category_repository import CategoryRepository
+from app.services.catalog_cache import catalog_cache
+from app.services.catalog_index import catalog_index, parse_query
 
 
 class CategoryService:
     def get_all_categories(self) -> Dict[str, Any]:
         try:
-            categories = CategoryRepository.get_all_categories()
+            counts = catalog_index.category_counts()
+            # Önbellekteki satırlar paylaşıldığı için kopyalanır
+            categories = [dict(c, model_count=counts.get(c['category_id'], 0)) for c in catalog_cache.categories()]
             return {
                 'success': True,
                 'data': categories,
@@ -20,9 +24,22 @@ class CategoryService:
         except Exception as e:
             return { 'success': False, 'error': 'Kategoriler getirilemedi' }
 
-    def get_models_by_category(self, category_id: int) -> Dict[str, Any]:
+    def get_models_by_category(self, category_id: int, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Kategorideki modeller; veritabanına gitmeden katalog dizininin bitmap'inden okunur.
+        params verilirse (provider, active, q, cursor, limit) sonuç sayfalı döner.
+        """
+        if params:
+            try:
+                query = dict(parse_query(params), category_id=category_id)
+            except ValueError as e:
+                return { 'success': False, 'error': str(e), 'invalid': True }
+            try:
+                return { 'success': True, **catalog_index.query(**query) }
+            except Exception as e:
+                return { 'success': False, 'error': 'Kategori modelleri getirilemedi' }
         try:
-            models = CategoryRepository.get_models_by_category(category_id)
+            models = catalog_index.category_models([category_id])
             return {
                 'success': True,
                 'data': models,
@@ -59,6 +76,7 @@ class CategoryService:
                 slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
             
             category_id = CategoryRepository.create_category(name, slug, description)
+            catalog_cache.invalidate()
             return {
                 'success': True,
                 'data': { 'category_id': category_id },
@@ -82,6 +100,7 @@ class CategoryService:
                 slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
             
             success = CategoryRepository.update_category(category_id, name, slug, description)
+            catalog_cache.invalidate()
             if success:
                 return {
                     'success': True,
@@ -95,6 +114,7 @@ class CategoryService:
     def delete_category(self, category_id: int) -> Dict[str, Any]:
         try:
             success = CategoryRepository.delete_category(category_id)
+            catalog_cache.invalidate()
             if success:
                 return {
                     'success': True,
@@ -0,0 +1,99 @@
+# =============================================================================
+# CHAT LIST CACHE
+# =============================================================================
+# Kullanıcı başına sohbet listesi (aktif + arşiv) önbelleği. Sidebar ve modal
+# aynı listeyi tekrar tekrar ister; liste yalnızca kullanıcı sohbet açtığında,
+# mesaj gönderdiğinde veya sohbet arşivlendiğinde değişir. Bu yazımlar
+# invalidate(user_id) çağırır; CHAT_LIST_CACHE_TTL güvenlik sınırıdır.
+#
+# Okuma sırasında gelen bir invalidate, okunan (eskimiş olabilecek) sonucun
+# önbelleğe yazılmasını engeller (kullanıcı başına sürüm sayacı).
+# Listeler model adlarını da içerir; model güncelleme/silme clear() ile tüm
+# kullanıcıların listelerini düşürür (genel sürüm sayacı).
+# =============================================================================
+
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.services.providers.metrics import provider_metrics
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class ChatListCache:
+    """
+    Kullanım:
+        result = chat_list_cache.get_or_load(user_id, limit, lambda: ...)
+        chat_list_cache.invalidate(user_id)   # sohbet oluşturuldu / mesaj / arşiv
+        chat_list_cache.clear()               # model adı / provider değişti veya model silindi
+    """
+
+    def __init__(self):
+        self.ttl = _env_float('CHAT_LIST_CACHE_TTL', 60)
+        self.max_users = int(_env_float('CHAT_LIST_CACHE_MAX_USERS', 5000))
+        # user_id -> {variant: (expires_at, result)}
+        self._entries: Dict[int, Dict[Any, Tuple[float, Dict[str, Any]]]] = {}
+        self._versions: Dict[int, int] = {}
+        # clear() her çağrıldığında artar; tüm kullanıcıların sürümüne eklenir
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, user_id: int, variant: Any,
+                    load: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Önbellekteki sonucu veya load() sonucunu döndürür; yalnızca başarılı sonuçlar saklanır."""
+        now = time.monotonic()
+        with self._lock:
+            cached = (self._entries.get(user_id) or {}).get(variant)
+            if cached and cached[0] > now:
+                provider_metrics.incr('chat_list_cache', None, 'hit')
+                return cached[1]
+            version = self._version_locked(user_id)
+        provider_metrics.incr('chat_list_cache', None, 'miss')
+
+        result = load()
+        if self.ttl <= 0 or not result.get('success'):
+            return result
+        with self._lock:
+            # Okuma sürerken liste değiştiyse sonuç saklanmaz
+            if self._version_locked(user_id) == version:
+                if user_id not in self._entries and len(self._entries) >= self.max_users:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries.setdefault(user_id, {})[variant] = (time.monotonic() + self.ttl, result)
+        return result
+
+    def _version_locked(self, user_id: int) -> int:
+        # _lock tutulurken çağrılır; iki sayaç da yalnızca artar, toplam her değişimde değişir
+        return self._versions.get(user_id, 0) + self._generation
+
+    def version(self, user_id: int) -> int:
+        """Kullanıcının liste sürümü; her invalidate / clear'da artar (türetilmiş önbellekler için)."""
+        with self._lock:
+            return self._version_locked(user_id)
+
+    def invalidate(self, user_id: Optional[int]) -> None:
+        if user_id is None:
+            return
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Tüm kullanıcıların listelerini düşürür; sürmekte olan okumalar da saklanmaz."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'users': len(self._entries), 'ttl': self.ttl}
+
+
+# Uygulama genelinde paylaşılan örnek
+chat_list_cache = ChatListCache()
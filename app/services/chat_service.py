@@ -8,36 +8,63 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 import os
 import logging
+import time
+import hashlib
 from app.services.providers.factory import ProviderFactory
 from app.database.repositories import ChatRepository, MessageRepository, ModelRepository
+from app.services.failover_service import FailoverService
+from app.services.providers.scheduler import provider_scheduler, SchedulerRejected
+from app.services.providers.key_pool import api_key_pool, EJECT_STATUS
+from app.services.key_pool_service import KeyPoolService
+from app.services.telemetry_service import TelemetryService
+from app.services.routing_service import model_router
+from app.services.generation_registry import generation_registry, Generation
+from app.services.chat_list_cache import chat_list_cache
+from app.services.autocomplete_index import chat_autocomplete
 
 class ChatService:
     """
     Chat işlemleri servisi
     """
     
+    # 429/kota hatasında aynı istek için denenecek azami anahtar sayısı
+    MAX_KEY_ATTEMPTS = 3
+    # Upstream çağrıları streaming yapılır; panel kapanınca istek yarıda kesilebilir
+    STREAM_UPSTREAM = str(os.getenv('CHAT_STREAM_UPSTREAM', '1')).lower() in ('1', 'true', 'yes', 'on')
+    
     def __init__(self):
         self.provider_factory = ProviderFactory()
         
-    def create_chat(self, model_id: int, title: str = None, user_id: Optional[int] = None) -> Dict[str, Any]:
+    def create_chat(self, model_id: Optional[int], title: str = None, user_id: Optional[int] = None,
+                    route_category_id: Optional[int] = None) -> Dict[str, Any]:
         """
         Yeni chat oluştur
         
         Args:
-            model_id (int): Model ID'si
+            model_id (int): Model ID'si (auto modda boş olabilir)
             title (str): Chat başlığı (opsiyonel)
+            route_category_id (int): "auto" yönlendirme kategorisi (opsiyonel)
             
         Returns:
             Dict[str, Any]: Oluşturulan chat bilgileri
         """
         try:
-            chat_id = ChatRepository.create_chat(model_id=model_id, title=title, user_id=user_id)
+            if route_category_id and not model_id:
+                # Sohbet listesinde gösterilecek başlangıç modeli; mesajlarda yeniden seçilir
+                initial, _ = model_router.choose(route_category_id)
+                if not initial:
+                    return {"success": False, "error": "Kategoride kullanılabilir model yok"}
+                model_id = initial.get("model_id")
+            chat_id = ChatRepository.create_chat(model_id=model_id, title=title, user_id=user_id,
+                                                 route_category_id=route_category_id)
             if not chat_id:
                 return {"success": False, "error": "Chat oluşturulamadı"}
+            chat_list_cache.invalidate(user_id)
             return {
                 "success": True,
                 "chat_id": chat_id,
                 "model_id": model_id,
+                "route_category_id": route_category_id,
                 "user_id": user_id,
                 "title": title,
                 "created_at": datetime.now().isoformat()
@@ -65,18 +92,7 @@ class ChatService:
                 return {"success": False, "error": "Chat bulunamadı"}
             return {
                 "success": True,
-                "chat": {
-                    "chat_id": chat["chat_id"],
-                    "model_id": chat["model_id"],
-                    "model_name": chat.get("model_name"),
-                    "provider_name": chat.get("provider_name"),
-                    "provider_type": chat.get("provider_type"),
-                    "title": chat["title"],
-                    "is_active": chat["is_active"],
-                    "created_at": chat["created_at"].isoformat() if chat.get("created_at") else None,
-                    "updated_at": chat["updated_at"].isoformat() if chat.get("updated_at") else None,
-                    "last_message_at": chat["last_message_at"].isoformat() if chat.get("last_message_at") else None
-                }
+                "chat": self._format_chat(chat)
             }
                 
         except Exception as e:
@@ -85,7 +101,8 @@ class ChatService:
                 "error": f"Chat alma hatası: {str(e)}"
             }
     
-    def get_chat_messages(self, chat_id: str, limit: int = 50, offset: int = 0, user_id: Optional[int] = None) -> Dict[str, Any]:
+    def get_chat_messages(self, chat_id: str, limit: int = 50, offset: int = 0, user_id: Optional[int] = None,
+                          since: Optional[int] = None) -> Dict[str, Any]:
         """
         Chat mesajlarını al
         
@@ -93,26 +110,28 @@ class ChatService:
             chat_id (str): Chat ID'si
             limit (int): Maksimum mesaj sayısı
             offset (int): Başlangıç offset'i
+            since (int): Verilirse yalnızca bu message_id'den sonraki mesajlar döner
             
         Returns:
-            Dict[str, Any]: Mesaj listesi
+            Dict[str, Any]: Mesaj listesi ve sonraki istekte kullanılacak cursor
         """
         try:
             # Eğer user_id verildiyse, chat sahibini doğrula
-            if user_id is not None and not ChatRepository.get_chat(chat_id, user_id=user_id):
+            if user_id is not None and not ChatRepository.is_owner(chat_id, user_id):
                 return {"success": False, "error": "Yetkisiz veya chat bulunamadı"}
 
-            rows = MessageRepository.list_by_chat(chat_id, limit=limit, offset=offset)
-            messages = []
-            for row in (rows or []):
-                messages.append({
-                    "message_id": row["message_id"],
-                    "content": row["content"],
-                    "is_user": bool(row["is_user"]),
-                    "timestamp": row["timestamp"].isoformat() if row.get("timestamp") else None,
-                    "created_at": row["created_at"].isoformat() if row.get("created_at") else None
-                })
-            return {"success": True, "messages": messages, "count": len(messages)}
+            if since is not None:
+                rows = MessageRepository.list_since(chat_id, since, limit=limit)
+            else:
+                rows = MessageRepository.list_by_chat(chat_id, limit=limit, offset=offset)
+            messages = [self._format_message(row) for row in (rows or [])]
+            return {
+                "success": True,
+                "messages": messages,
+                "count": len(messages),
+                "cursor": self._sync_cursor(messages, since),
+                "complete": all(m["is_complete"] for m in messages)
+            }
             
         except Exception as e:
             return {
@@ -120,7 +139,111 @@ class ChatService:
                 "error": f"Mesaj alma hatası: {str(e)}"
             }
     
-    def save_message(self, chat_id: str, content: str, is_user: bool, model_id: int = None) -> Dict[str, Any]:
+    def hydrate_chats(self, chat_ids: List[str], user_id: int, limit: int = 100) -> Dict[str, Any]:
+        """
+        Birden fazla pane'i tek istekte yükle: chat bilgileri ve her chat'in son
+        `limit` mesajı. Sahiplik tek sorguda doğrulanır, mesajlar tek toplu
+        sorguda okunur.
+        
+        Args:
+            chat_ids (List[str]): Chat ID'leri
+            user_id (int): Oturumdaki kullanıcı
+            limit (int): Chat başına en fazla mesaj sayısı
+            
+        Returns:
+            Dict[str, Any]: chats (chat_id -> {chat, messages, has_more}) ve bulunamayanlar (missing)
+        """
+        try:
+            # Sıra korunarak tekrarlar ayıklanır
+            chat_ids = list(dict.fromkeys(str(c) for c in chat_ids if c))
+            rows = ChatRepository.get_chats(chat_ids, user_id)
+            owned = {row["chat_id"]: row for row in rows}
+            ordered = [c for c in chat_ids if c in owned]
+            
+            # Fazladan bir mesaj okunarak daha eski mesaj olup olmadığı anlaşılır
+            window: Dict[str, List[Dict[str, Any]]] = {c: [] for c in ordered}
+            for row in MessageRepository.list_latest_by_chats(ordered, limit + 1):
+                window[row["chat_id"]].append(row)
+            
+            chats = {}
+            for chat_id in ordered:
+                messages = window[chat_id]
+                has_more = len(messages) > limit
+                chats[chat_id] = {
+                    "chat": self._format_chat(owned[chat_id]),
+                    "messages": [self._format_message(m) for m in messages[-limit:]],
+                    "has_more": has_more
+                }
+            return {
+                "success": True,
+                "chats": chats,
+                "missing": [c for c in chat_ids if c not in owned]
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Chat yükleme hatası: {str(e)}"
+            }
+    
+    @staticmethod
+    def _sync_cursor(messages: List[Dict[str, Any]], since: Optional[int]) -> Optional[int]:
+        """
+        Sonraki delta isteği için cursor: son mesajın ID'si. Üretimi süren (kısmi)
+        bir mesaj varsa cursor ondan öncesinde kalır, böylece tamamlandığında yeniden gelir.
+        """
+        cursor = since
+        for message in messages:
+            if not message["is_complete"]:
+                break
+            cursor = message["message_id"]
+        return cursor
+    
+    def messages_etag(self, chat_id: str, user_id: Optional[int], *variant: Any) -> Optional[str]:
+        """
+        Mesaj listesi için ETag: chat'in last_message_at / updated_at değerleri ve mesaj
+        sayısından türetilir; sorgu parametreleri (variant) anahtara eklenir.
+        Chat bulunamazsa veya kullanıcıya ait değilse None döner.
+        """
+        state = ChatRepository.get_sync_state(chat_id, user_id=user_id)
+        if not state:
+            return None
+        material = "|".join(str(v) for v in (
+            chat_id, state.get("last_message_at"), state.get("updated_at"), state.get("message_count"), *variant
+        ))
+        return hashlib.sha1(material.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _format_chat(chat: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "chat_id": chat["chat_id"],
+            "model_id": chat["model_id"],
+            "model_name": chat.get("model_name"),
+            "provider_name": chat.get("provider_name"),
+            "provider_type": chat.get("provider_type"),
+            "route_category_id": chat.get("route_category_id"),
+            "title": chat["title"],
+            "is_active": chat["is_active"],
+            "created_at": chat["created_at"].isoformat() if chat.get("created_at") else None,
+            "updated_at": chat["updated_at"].isoformat() if chat.get("updated_at") else None,
+            "last_message_at": chat["last_message_at"].isoformat() if chat.get("last_message_at") else None
+        }
+    
+    @staticmethod
+    def _format_message(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "message_id": row["message_id"],
+            "content": row["content"],
+            "is_user": bool(row["is_user"]),
+            "is_complete": bool(row.get("is_complete", True)),
+            "model_id": row.get("model_id"),
+            "route_reason": row.get("route_reason"),
+            "timestamp": row["timestamp"].isoformat() if row.get("timestamp") else None,
+            "created_at": row["created_at"].isoformat() if row.get("created_at") else None
+        }
+    
+    def save_message(self, chat_id: str, content: str, is_user: bool, model_id: int = None,
+                     route_reason: Optional[str] = None) -> Dict[str, Any]:
         """
         Mesajı veritabanına kaydet
         
@@ -129,17 +252,19 @@ class ChatService:
             content (str): Mesaj içeriği
             is_user (bool): Kullanıcı mesajı mı?
             model_id (int): Model ID'si (opsiyonel)
+            route_reason (str): Modelin seçilme gerekçesi (opsiyonel)
             
         Returns:
             Dict[str, Any]: Kayıt sonucu
         """
         try:
             now = datetime.now()
-            msg_id = MessageRepository.create_message(chat_id=chat_id, content=content, is_user=is_user, model_id=model_id, when=now)
+            msg_id = MessageRepository.create_message(chat_id=chat_id, content=content, is_user=is_user, model_id=model_id, when=now,
+                                                      route_reason=route_reason)
             if not msg_id:
                 return {"success": False, "error": "Mesaj kaydedilemedi"}
             ChatRepository.update_last_message_time(chat_id, when=now)
-            return {"success": True, "message": "Mesaj başarıyla kaydedildi"}
+            return {"success": True, "message": "Mesaj başarıyla kaydedildi", "message_id": msg_id}
             
         except Exception as e:
             return {
@@ -147,7 +272,10 @@ class ChatService:
                 "error": f"Mesaj kaydetme hatası: {str(e)}"
             }
     
-    def send_message(self, chat_id: str, user_message: str, model_id: int, api_key: str, user_id: Optional[int] = None) -> Dict[str, Any]:
+    def send_message(self, chat_id: str, user_message: str, model_id: int, api_key: str, user_id: Optional[int] = None,
+                     route_category_id: Optional[int] = None, cache: bool = False,
+                     request_id: Optional[str] = None, generation: Optional[Generation] = None,
+                     idempotency_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Mesaj gönder ve AI yanıtı al
         
@@ -156,17 +284,48 @@ class ChatService:
             user_message (str): Kullanıcı mesajı
             model_id (int): Model ID'si
             api_key (str): API anahtarı
+            route_category_id (int): Verilirse model bu kategoriden otomatik seçilir
+            cache (bool): Aynı model ve bağlam için önbellekteki yanıta izin ver
+            request_id (str): İptal için istek kimliği (verilmezse üretilir)
+            generation (Generation): Önceden kaydedilmiş üretim (streaming uç noktası)
+            idempotency_state (dict): Idempotency-Key durumu; önceki başarısız denemede
+                kaydedilen kullanıcı mesajı yeniden kaydedilmez
             
         Returns:
             Dict[str, Any]: Yanıt sonucu
         """
+        generation = generation or generation_registry.register(chat_id, request_id, user_id)
+        result = None
+        try:
+            result = self._send_message(chat_id, user_message, model_id, api_key, user_id,
+                                        route_category_id, cache, generation, idempotency_state)
+            return result
+        finally:
+            # Son olay (done/error) yayınlanır; akışı izleyen/yeniden bağlanan istemciler sonucu alır
+            generation_registry.finish(generation, result)
+            chat_list_cache.invalidate(user_id)
+    
+    def _send_message(self, chat_id: str, user_message: str, model_id: int, api_key: str, user_id: Optional[int],
+                      route_category_id: Optional[int], cache: bool, generation: Generation,
+                      idempotency_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         try:
             # Eğer user_id verildiyse, chat sahibini doğrula
-            if user_id is not None and not ChatRepository.get_chat(chat_id, user_id=user_id):
+            if user_id is not None and not ChatRepository.is_owner(chat_id, user_id):
                 return {"success": False, "error": "Yetkisiz veya chat bulunamadı"}
 
+            # Otomatik yönlendirme: sohbet bir kategoriye bağlıysa model her mesajda seçilir
+            model = None
+            route_reason = None
+            if route_category_id:
+                model, route_reason = model_router.choose(route_category_id)
+                if model:
+                    api_key = model.get("api_key")
+                else:
+                    route_reason = f"fallback:{route_reason}"
+            
             # Model bilgilerini al (Repository üzerinden)
-            model = ModelRepository.get_model_by_id(model_id)
+            if not model:
+                model = ModelRepository.get_model_by_id(model_id)
             if not model:
                 return {
                     "success": False,
@@ -201,40 +360,89 @@ class ChatService:
                     "error": f"Desteklenmeyen provider türü: {provider_type or 'undefined'}"
                 }
             
-            # Servisi yapılandır
-            provider_service.set_api_key(api_key)
-            provider_service.set_model(request_model_name)
+            # Anahtar havuzundan bu çağrı için anahtar seç (least-loaded / round-robin)
+            pool_id, pool_keys = KeyPoolService.keys_for_model(model)
+            if api_key and api_key not in pool_keys:
+                pool_keys.append(api_key)
+            api_key = api_key_pool.select(pool_id, pool_keys) or api_key
             
-            # Kullanıcı mesajını kaydet
-            save_result = self.save_message(chat_id, user_message, True, model_id)
-            if not save_result["success"]:
-                return save_result
+            # Zamanlayıcıdan provider slotu al; kuyruk eşiği aşılırsa mesaj kaydedilmeden 429 dön
+            try:
+                lease = provider_scheduler.acquire(provider_type, api_key, user_id)
+            except SchedulerRejected as e:
+                return {"success": False, "error": str(e), "retry_after": e.retry_after}
             
-            # Konuşma geçmişini al
-            history_result = self.get_chat_messages(chat_id, limit=20, user_id=user_id)
-            conversation_history = []
+            try:
+                # Kullanıcı mesajını kaydet; aynı Idempotency-Key ile yeniden denemede önceki kayıt kullanılır
+                if idempotency_state is None or not idempotency_state.get("user_message_id"):
+                    save_result = self.save_message(chat_id, user_message, True, model.get("model_id"))
+                    # Sohbet listesinde sıra ve mesaj sayısı değişti
+                    chat_list_cache.invalidate(user_id)
+                    if not save_result["success"]:
+                        return save_result
+                    if idempotency_state is not None:
+                        idempotency_state["user_message_id"] = save_result["message_id"]
+                
+                # Konuşma geçmişini al
+                history_result = self.get_chat_messages(chat_id, limit=20, user_id=user_id)
+                conversation_history = []
+                
+                if history_result["success"]:
+                    # Son mesajı hariç tut (şu anki mesaj); üretimi süren kısmi yanıtlar bağlama girmez
+                    messages = history_result["messages"][:-1]
+                    conversation_history = [m for m in messages if m.get("is_complete", True)]
+                
+                # Provider'dan yanıt al
+                ai_result = self._generate_pooled(
+                    provider_service, model, pool_id, pool_keys, api_key,
+                    user_message, conversation_history, chat_id=chat_id, user_id=user_id, cache=cache,
+                    generation=generation, lease=lease
+                )
+            finally:
+                # _generate_pooled ilk denemeden sonra bırakır; release idempotent
+                lease.release()
+            answered_by = model
             
-            if history_result["success"]:
-                # Son mesajı hariç tut (şu anki mesaj)
-                messages = history_result["messages"][:-1]
-                conversation_history = messages
+            # Failover: birincil model başarısızsa (veya devresi açıksa) yedek modelleri dene
+            if not ai_result["success"] and not generation.cancelled:
+                for candidate in FailoverService.candidates(model):
+                    if generation.cancelled:
+                        break
+                    candidate_type = (candidate.get("provider_type") or "").lower()
+                    candidate_service = self.provider_factory.get_service(candidate_type)
+                    if not candidate_service:
+                        continue
+                    candidate_pool_id, candidate_keys = KeyPoolService.keys_for_model(candidate)
+                    candidate_key = api_key_pool.select(candidate_pool_id, candidate_keys)
+                    # Slot her denenen anahtar için _generate_pooled içinde alınır
+                    candidate_result = self._generate_pooled(
+                        candidate_service, candidate, candidate_pool_id, candidate_keys, candidate_key,
+                        user_message, conversation_history, chat_id=chat_id, user_id=user_id, cache=cache,
+                        generation=generation
+                    )
+                    if candidate_result["success"]:
+                        ai_result, answered_by = candidate_result, candidate
+                        break
             
-            # Provider'dan yanıt al
-            ai_result = provider_service.generate_content(
-                prompt=user_message,
-                conversation_history=conversation_history
-            )
+            if generation.cancelled:
+                return self._cancelled_result(chat_id, generation, ai_result, answered_by, route_reason)
             
             if not ai_result["success"]:
+                if generation.message_id:
+                    MessageRepository.delete_message(generation.message_id)
                 return {
                     "success": False,
                     "error": f"AI yanıtı alınamadı: {ai_result.get('error', 'Bilinmeyen hata')}"
                 }
             
             ai_response = ai_result["content"]
+            answered_model_id = answered_by.get("model_id")
+            failover = answered_model_id != model.get("model_id")
+            if failover:
+                route_reason = f"failover:from={model.get('model_id')}" + (f" {route_reason}" if route_reason else "")
             
-            # AI yanıtını kaydet
-            save_ai_result = self.save_message(chat_id, ai_response, False, model_id)
+            # AI yanıtını yanıtı gerçekten üreten modelle ve seçim gerekçesiyle kaydet
+            save_ai_result = self._save_reply(generation, ai_response, answered_model_id, route_reason)
             if not save_ai_result["success"]:
                 return save_ai_result
             
@@ -243,9 +451,23 @@ class ChatService:
                 "success": True,
                 "user_message": user_message,
                 "ai_response": ai_response,
-                "model": model_name,  # kullanıcıya görünen isim
-                "provider": provider_name,
+                "model": answered_by.get("model_name"),  # kullanıcıya görünen isim
+                "provider": answered_by.get("provider_name"),
+                "answered_by": {
+                    "model_id": answered_model_id,
+                    "model_name": answered_by.get("model_name"),
+                    "provider_name": answered_by.get("provider_name"),
+                    "provider_type": answered_by.get("provider_type")
+                },
+                "failover": failover,
+                "routing": {
+                    "category_id": route_category_id,
+                    "model_id": answered_model_id,
+                    "reason": route_reason
+                } if route_category_id else None,
+                "cached": bool(ai_result.get("cached")),
                 "usage": ai_result.get("usage", {}),
+                "request_id": generation.request_id,
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -255,6 +477,171 @@ class ChatService:
                 "error": f"Mesaj gönderme hatası: {str(e)}"
             }
     
+    def _save_reply(self, generation: Generation, content: str, model_id: Optional[int],
+                    route_reason: Optional[str]) -> Dict[str, Any]:
+        """AI yanıtını kaydeder; üretim sırasında checkpoint satırı açıldıysa onu tamamlar."""
+        if not generation.message_id:
+            return self.save_message(generation.chat_id, content, False, model_id, route_reason=route_reason)
+        if not MessageRepository.checkpoint_message(generation.message_id, content, is_complete=True,
+                                                    model_id=model_id, route_reason=route_reason):
+            return {"success": False, "error": "Mesaj kaydedilemedi"}
+        ChatRepository.update_last_message_time(generation.chat_id, when=datetime.now())
+        return {"success": True, "message": "Mesaj başarıyla kaydedildi"}
+    
+    def _checkpoint(self, generation: Generation) -> None:
+        """Üretimi süren yanıtın o ana kadarki metnini mesaj satırına yazar (is_complete=FALSE)."""
+        text = generation.text
+        if generation.message_id is None:
+            generation.message_id = MessageRepository.create_message(
+                chat_id=generation.chat_id, content=text, is_user=False, is_complete=False
+            )
+        else:
+            MessageRepository.checkpoint_message(generation.message_id, text)
+        generation.checkpointed_chars = len(text)
+        generation.checkpointed_at = time.monotonic()
+    
+    def _cancelled_result(self, chat_id: str, generation: Generation, ai_result: Dict[str, Any],
+                          answered_by: Dict[str, Any], route_reason: Optional[str]) -> Dict[str, Any]:
+        """
+        İptal edilen üretimin sonucu. Kısmi çıktı yalnızca CHAT_CANCEL_SAVE_PARTIAL
+        açıksa kaydedilir; aksi halde atılır.
+        """
+        partial = ai_result.get("content") or ""
+        saved = False
+        if partial and generation_registry.save_partial:
+            reason = "cancelled" + (f" {route_reason}" if route_reason else "")
+            saved = self._save_reply(generation, partial, answered_by.get("model_id"), reason)["success"]
+        elif generation.message_id:
+            # Checkpoint edilmiş kısmi yanıt atılır
+            MessageRepository.delete_message(generation.message_id)
+        return {
+            "success": False,
+            "cancelled": True,
+            "error": "Yanıt üretimi iptal edildi",
+            "request_id": generation.request_id,
+            "partial_saved": saved
+        }
+    
+    def _generate_pooled(self, provider_service, model: Dict[str, Any], pool_id: str, pool_keys: List[str],
+                         api_key: Optional[str], prompt: str, conversation_history: List[Dict[str, Any]],
+                         chat_id: Optional[str] = None, user_id: Optional[int] = None,
+                         cache: bool = False, generation: Optional[Generation] = None,
+                         lease=None) -> Dict[str, Any]:
+        """
+        Seçilen anahtarla içerik üretir; anahtar 429/kota hatası verirse havuzdan
+        çıkarılır ve istek havuzdaki başka bir anahtarla tekrarlanır.
+        Her deneme, kullandığı anahtar için zamanlayıcı slotu alır (eşzamanlılık
+        ve hız sınırı anahtar bazındadır). lease verilirse ilk anahtarın önceden
+        alınmış slotudur ve ilk denemeden sonra bırakılır.
+        Her deneme telemetriye kaydedilir; iptal edilen denemeler kaydedilmez.
+        """
+        request_model_name = model.get("request_model_name") or model.get("model_name")
+        provider_type = (model.get("provider_type") or "").lower()
+        tried: List[str] = []
+        result = {"success": False, "error": "Model için API anahtarı tanımlanmamış"}
+        while api_key and len(tried) < self.MAX_KEY_ATTEMPTS:
+            if generation is not None and generation.cancelled:
+                return {"success": False, "cancelled": True, "error": "Yanıt üretimi iptal edildi"}
+            tried.append(api_key)
+            if lease is None:
+                try:
+                    lease = provider_scheduler.acquire(provider_type, api_key, user_id)
+                except SchedulerRejected as e:
+                    # Bu anahtarın kuyruğu dolu: havuzdaki başka bir anahtar denenir
+                    result = {"success": False, "error": str(e), "retry_after": e.retry_after}
+                    api_key = api_key_pool.select(pool_id, pool_keys, exclude=tried)
+                    continue
+            if generation is not None:
+                # Önceki denemenin yayınlanmış parçaları geçersiz: istemci metni sıfırlar
+                generation.reset()
+            started = time.monotonic()
+            try:
+                with api_key_pool.lease(api_key) as key_lease:
+                    result = self._generate(provider_service, api_key, request_model_name, prompt, conversation_history, cache,
+                                            generation=generation)
+                    key_lease.report(result)
+            finally:
+                lease.release()
+                lease = None
+            if result.get("cancelled"):
+                return result
+            # Önbellekten dönen yanıtlar provider çağrısı değildir; gecikme istatistiklerini bozmasın
+            if not result.get("cached"):
+                elapsed = time.monotonic() - started
+                TelemetryService.record_call(model, result, elapsed, ttft=result.get("ttft"),
+                                             chat_id=chat_id, user_id=user_id)
+                model_router.observe(model.get("model_id"), bool(result.get("success")), elapsed)
+            if result.get("success") or result.get("status_code") not in EJECT_STATUS:
+                return result
+            api_key = api_key_pool.select(pool_id, pool_keys, exclude=tried)
+        return result
+    
+    def _generate(self, provider_service, api_key: str, request_model_name: str, prompt: str,
+                  conversation_history: List[Dict[str, Any]], cache: bool = False,
+                  generation: Optional[Generation] = None) -> Dict[str, Any]:
+        """
+        Paylaşılan provider servisinin bu çağrıya özel kopyasıyla içerik üretir;
+        anahtar ve model paylaşılan örneğe yazılmaz (eşzamanlı istekler birbirini ezmez).
+        Yanıt streaming okunur; böylece üretim iptal edildiğinde upstream bağlantısı
+        kapatılıp beklemeden dönülür. Yanıt önbelleği stream yolunda da geçerlidir
+        (isabet tek delta olarak yayınlanır).
+        """
+        try:
+            provider_service = provider_service.configured(api_key, request_model_name)
+            if generation is not None and self.STREAM_UPSTREAM and hasattr(provider_service, 'stream_content'):
+                events = provider_service.stream_content(
+                    prompt=prompt,
+                    conversation_history=conversation_history,
+                    on_response=generation.attach,
+                    cache=cache
+                )
+                return self._collect_stream(events, generation)
+            result = provider_service.generate_content(
+                prompt=prompt,
+                conversation_history=conversation_history,
+                cache=cache
+            )
+            if generation is not None and result.get("success"):
+                # Akışı izleyen istemciler için yanıt tek parça olarak yayınlanır
+                generation.publish_delta(result.get("content") or "")
+            return result
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def _collect_stream(self, events, generation: Generation) -> Dict[str, Any]:
+        """
+        Stream olaylarını tek bir yanıtta toplar; iptal edilirse kısmi içerikle döner.
+        Parçalar üretim tamponunda yayınlanır ve belirli aralıklarla mesaj satırına yazılır.
+        """
+        started = time.monotonic()
+        ttft = None
+        parts: List[str] = []
+        try:
+            for event in events:
+                if generation.cancelled:
+                    break
+                if event["type"] == "delta":
+                    if ttft is None:
+                        ttft = time.monotonic() - started
+                    parts.append(event["text"])
+                    generation.publish_delta(event["text"])
+                    if generation.checkpoint_due(generation_registry.checkpoint_seconds,
+                                                 generation_registry.checkpoint_chars):
+                        self._checkpoint(generation)
+                elif event["type"] == "done":
+                    return {"success": True, "content": "".join(parts), "model": event.get("model"),
+                            "usage": event.get("usage", {}), "finish_reason": event.get("finish_reason"),
+                            "cached": bool(event.get("cached")), "ttft": ttft,
+                            "timestamp": datetime.now().isoformat()}
+                elif not generation.cancelled:
+                    return dict({k: v for k, v in event.items() if k != "type"}, success=False)
+        finally:
+            events.close()
+        if not generation.cancelled:
+            return {"success": False, "error": "Yanıt akışı beklenmedik şekilde sonlandı"}
+        # Kapatılan bağlantı akışı hata ile bitirmiş olabilir; iptal bilgisi önceliklidir
+        return {"success": False, "cancelled": True, "error": "Yanıt üretimi iptal edildi", "content": "".join(parts)}
+    
     def get_user_chats(self, user_id: int, active: Optional[bool] = True, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
         """
         Kullanıcının chat'lerini al
@@ -268,20 +655,7 @@ class ChatService:
         """
         try:
             rows = ChatRepository.list_user_chats(user_id=user_id, active=active, limit=limit, offset=offset)
-            chats = []
-            for row in (rows or []):
-                chats.append({
-                    "chat_id": row["chat_id"],
-                    "model_id": row["model_id"],
-                    "model_name": row.get("model_name"),
-                    "provider_name": row.get("provider_name"),
-                    "title": row["title"],
-                    "is_active": bool(row["is_active"]),
-                    "message_count": row.get("message_count"),
-                    "created_at": row["created_at"].isoformat() if row.get("created_at") else None,
-                    "updated_at": row["updated_at"].isoformat() if row.get("updated_at") else None,
-                    "last_message_at": row["last_message_at"].isoformat() if row.get("last_message_at") else None
-                })
+            chats = [self._format_list_item(row) for row in (rows or [])]
             return {"success": True, "chats": chats, "count": len(chats)}
             
         except Exception as e:
@@ -290,6 +664,69 @@ class ChatService:
                 "error": f"Chat listesi alma hatası: {str(e)}"
             }
     
+    def get_chat_overview(self, user_id: int, limit: int = 20) -> Dict[str, Any]:
+        """
+        Aktif ve arşiv sohbetlerin ilk sayfaları + toplamları (sidebar ve modal için)
+        
+        Args:
+            user_id (int): Oturumdaki kullanıcı
+            limit (int): Her bölüm için maksimum chat sayısı
+            
+        Returns:
+            Dict[str, Any]: {"active": {"chats", "total"}, "archived": {"chats", "total"}}
+        """
+        return chat_list_cache.get_or_load(user_id, limit, lambda: self._load_chat_overview(user_id, limit))
+    
+    def _load_chat_overview(self, user_id: int, limit: int) -> Dict[str, Any]:
+        try:
+            rows = ChatRepository.list_user_chat_index(user_id, limit=limit)
+            active = [self._format_list_item(row) for row in rows if row.get("is_active")]
+            archived = [self._format_list_item(row) for row in rows if not row.get("is_active")]
+            totals = rows[0] if rows else {}
+            return {
+                "success": True,
+                "active": {"chats": active, "total": int(totals.get("active_total") or 0)},
+                "archived": {"chats": archived, "total": int(totals.get("archived_total") or 0)}
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Chat listesi alma hatası: {str(e)}"
+            }
+    
+    def search_chats(self, user_id: int, query: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        Kullanıcının sohbet başlıklarında otomatik tamamlama araması
+        
+        Args:
+            user_id (int): Oturumdaki kullanıcı
+            query (str): Aranan metin (önek / bulanık)
+            limit (int): Maksimum sonuç sayısı
+            
+        Returns:
+            Dict[str, Any]: Puana göre sıralı sohbetler
+        """
+        try:
+            chats = chat_autocomplete.search(user_id, query, limit)
+            return {"success": True, "data": chats, "count": len(chats)}
+        except Exception as e:
+            return {"success": False, "error": f"Sohbet arama hatası: {str(e)}"}
+    
+    @staticmethod
+    def _format_list_item(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "chat_id": row["chat_id"],
+            "model_id": row["model_id"],
+            "model_name": row.get("model_name"),
+            "provider_name": row.get("provider_name"),
+            "title": row["title"],
+            "is_active": bool(row["is_active"]),
+            "message_count": row.get("message_count"),
+            "created_at": row["created_at"].isoformat() if row.get("created_at") else None,
+            "updated_at": row["updated_at"].isoformat() if row.get("updated_at") else None,
+            "last_message_at": row["last_message_at"].isoformat() if row.get("last_message_at") else None
+        }
+    
     def delete_chat(self, chat_id: str, user_id: Optional[int] = None) -> Dict[str, Any]:
         """
         Chat'i sil: mesaj yoksa kalıcı sil, varsa soft delete (is_active=FALSE)
@@ -308,6 +745,9 @@ class ChatService:
             if user_id is not None and chat.get("user_id") != user_id:
                 return {"success": False, "error": "Yetkisiz"}
 
+            # Devam eden üretimler artık okunmayacak; upstream çağrılarını kes
+            generation_registry.cancel(chat_id)
+
             msg_count = ChatRepository.count_messages(chat_id)
             if msg_count == 0:
                 ok = ChatRepository.hard_delete(chat_id, user_id=user_id)
@@ -317,6 +757,7 @@ class ChatService:
                 ok = ChatRepository.soft_delete(chat_id)
                 if not ok:
                     return {"success": False, "error": "Chat arşivlenemedi"}
+            chat_list_cache.invalidate(chat.get("user_id"))
 
             return {"success": True, "message": "Chat silindi"}
             
@@ -0,0 +1,104 @@
+# =============================================================================
+# FAILOVER SERVICE
+# =============================================================================
+# Provider hata verdiğinde (veya devresi açıkken) mesajın yedek bir modele
+# yönlendirilmesi için politika. Politika settings tablosunda saklanır:
+#   { enabled: bool, fallbacks: { "<model_id>": <fallback_model_id> } }
+# Açık bir eşleme yoksa aynı kategorideki farklı provider modelleri denenir.
+# =============================================================================
+
+import os
+import time
+from typing import Any, Dict, List
+
+from app.database.repositories.model_repository import ModelRepository
+from app.database.repositories.settings_repository import SettingsRepository
+from app.services.providers.circuit_breaker import circuit_breakers
+from app.services.key_pool_service import KeyPoolService
+
+
+class FailoverService:
+    SETTINGS_KEY = 'failover_policy'
+    # Politika her mesajda okunmasın diye kısa süreli süreç içi önbellek
+    CACHE_SECONDS = 30
+
+    _cached_policy = None
+    _cached_at = 0.0
+
+    @staticmethod
+    def _defaults() -> Dict[str, Any]:
+        enabled = str(os.getenv('CHAT_FAILOVER_ENABLED', '0')).lower() in ('1', 'true', 'yes', 'on')
+        return {
+            'enabled': enabled,
+            'max_attempts': 2,
+            'fallbacks': {},
+        }
+
+    @staticmethod
+    def get_policy() -> Dict[str, Any]:
+        now = time.monotonic()
+        if FailoverService._cached_policy is not None and now - FailoverService._cached_at < FailoverService.CACHE_SECONDS:
+            return FailoverService._cached_policy
+        policy = FailoverService._defaults()
+        stored = SettingsRepository.get_json(FailoverService.SETTINGS_KEY, None)
+        if isinstance(stored, dict):
+            policy.update({k: v for k, v in stored.items() if k in policy})
+        FailoverService._cached_policy = policy
+        FailoverService._cached_at = now
+        return policy
+
+    @staticmethod
+    def set_policy(payload: Dict[str, Any]) -> Dict[str, Any]:
+        SettingsRepository.ensure_table()
+        current = FailoverService.get_policy()
+        fallbacks = payload.get('fallbacks', current.get('fallbacks')) or {}
+        try:
+            fallbacks = {str(int(k)): int(v) for k, v in fallbacks.items() if v is not None}
+        except (TypeError, ValueError, AttributeError):
+            return {'success': False, 'error': 'Geçersiz fallbacks verisi'}
+        try:
+            max_attempts = max(1, min(5, int(payload.get('max_attempts', current.get('max_attempts', 2)))))
+        except (TypeError, ValueError):
+            max_attempts = 2
+        data = {
+            'enabled': bool(payload.get('enabled', current.get('enabled'))),
+            'max_attempts': max_attempts,
+            'fallbacks': fallbacks,
+        }
+        ok = SettingsRepository.set_json(FailoverService.SETTINGS_KEY, data)
+        FailoverService._cached_policy = None
+        return {'success': bool(ok), 'data': data}
+
+    @staticmethod
+    def candidates(model: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Verilen model için denenecek yedek modelleri sırayla döndürür.
+        Devresi açık olan modeller atlanır.
+        """
+        policy = FailoverService.get_policy()
+        if not policy.get('enabled'):
+            return []
+        model_id = model.get('model_id')
+        out: List[Dict[str, Any]] = []
+        seen = {model_id}
+
+        explicit_id = (policy.get('fallbacks') or {}).get(str(model_id))
+        if explicit_id:
+            explicit = ModelRepository.get_model_by_id(explicit_id)
+            # Anahtar models.api_key'de veya yalnızca havuzda olabilir
+            if explicit and explicit.get('is_active') and KeyPoolService.keys_for_model(explicit)[1]:
+                out.append(explicit)
+                seen.add(explicit.get('model_id'))
+
+        for row in ModelRepository.get_failover_candidates(model_id):
+            if row.get('model_id') not in seen:
+                out.append(row)
+                seen.add(row.get('model_id'))
+
+        usable = []
+        for row in out:
+            provider_type = (row.get('provider_type') or '').lower()
+            request_model_name = row.get('request_model_name') or row.get('model_name')
+            if not circuit_breakers.is_open(provider_type, request_model_name):
+                usable.append(row)
+        return usable[:int(policy.get('max_attempts') or 2)]
@@ -0,0 +1,263 @@
+# =============================================================================
+# GENERATION REGISTRY
+# =============================================================================
+# Devam eden AI yanıt üretimlerini (chat_id, request_id) ile kaydeder.
+# Kullanıcı paneli kapattığında veya iptal uç noktası çağrıldığında üretim
+# iptal edilir: upstream streaming yanıtı kapatılır, böylece worker thread
+# provider'ı beklemeden serbest kalır ve kimsenin okumayacağı yanıt yazılmaz.
+# İptal edilen akışın kısmi çıktısı CHAT_CANCEL_SAVE_PARTIAL=1 ise kaydedilir.
+#
+# Her üretimin akış olayları (delta/reset/done/error) sunucuda tamponlanır;
+# bağlantısı kopan istemci Last-Event-ID ile kaldığı yerden devam eder.
+# Tamamlanan üretimler GENERATION_RETAIN_SECONDS boyunca tutulur.
+# =============================================================================
+
+import os
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class Generation:
+    """Tek bir devam eden üretim: iptal durumu, akış olayları ve checkpoint bilgisi."""
+
+    def __init__(self, chat_id: str, request_id: str, user_id: Optional[int] = None):
+        self.chat_id = chat_id
+        self.request_id = request_id
+        self.user_id = user_id
+        self.started = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self._cancelled = threading.Event()
+        self._responses: List[Any] = []
+        self._lock = threading.Lock()
+        # Akış olayları; olay kimliği (Last-Event-ID) listedeki sırası + 1
+        self._events: List[Dict[str, Any]] = []
+        self._changed = threading.Condition(self._lock)
+        self._parts: List[str] = []
+        # Checkpoint: kısmi yanıtın yazıldığı mesaj satırı ve son yazım anı
+        self.message_id: Optional[int] = None
+        self.checkpointed_chars = 0
+        self.checkpointed_at = self.started
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def text(self) -> str:
+        with self._lock:
+            return ''.join(self._parts)
+
+    def _publish(self, event: str, data: Dict[str, Any]) -> None:
+        # _lock tutulurken çağrılır
+        self._events.append({'id': len(self._events) + 1, 'event': event, 'data': data})
+        self._changed.notify_all()
+
+    def publish_delta(self, text: str) -> None:
+        with self._lock:
+            self._parts.append(text)
+            self._publish('delta', {'text': text})
+
+    def reset(self) -> None:
+        """Başarısız denemenin gönderilmiş parçalarını geçersiz kılar (yeni deneme baştan yazar)."""
+        with self._lock:
+            if self._parts:
+                self._parts = []
+                self.checkpointed_chars = 0
+                self._publish('reset', {})
+
+    def complete(self, result: Dict[str, Any]) -> None:
+        """Son olayı (done/error) yayınlar; beklenen okuyucular uyanır."""
+        with self._lock:
+            if self.finished_at is not None:
+                return
+            self._publish('done' if result.get('success') else 'error', result)
+            self.finished_at = time.monotonic()
+
+    def events_after(self, last_event_id: int = 0, timeout: float = 15.0) -> List[Dict[str, Any]]:
+        """last_event_id'den sonraki olaylar; yoksa yeni olay veya timeout'a kadar bekler."""
+        with self._lock:
+            if len(self._events) <= last_event_id and self.finished_at is None:
+                self._changed.wait(timeout)
+            return self._events[last_event_id:]
+
+    def checkpoint_due(self, interval: float, min_chars: int) -> bool:
+        with self._lock:
+            chars = sum(len(p) for p in self._parts)
+        return chars - self.checkpointed_chars >= min_chars and time.monotonic() - self.checkpointed_at >= interval
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def attach(self, response) -> None:
+        """Upstream yanıtını iptalde kapatılmak üzere kaydeder (iptal edilmişse hemen kapatır)."""
+        with self._lock:
+            self._responses.append(response)
+            cancelled = self.cancelled
+        if cancelled:
+            self._close(response)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        with self._lock:
+            responses = list(self._responses)
+        # Okuyan thread bloklu olsa bile soket kapanınca akış hata ile sonlanır
+        for response in responses:
+            self._close(response)
+
+    @staticmethod
+    def _close(response) -> None:
+        try:
+            response.close()
+        except Exception:
+            pass
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'chat_id': self.chat_id,
+            'request_id': self.request_id,
+            'user_id': self.user_id,
+            'cancelled': self.cancelled,
+            'done': self.done,
+            'events': len(self._events),
+            'message_id': self.message_id,
+            'elapsed_ms': int(((self.finished_at or time.monotonic()) - self.started) * 1000),
+        }
+
+
+class GenerationRegistry:
+    """
+    Chat bazında devam eden üretimler.
+
+    Kullanım:
+        generation = generation_registry.register(chat_id, request_id, user_id)
+        try:
+            ... provider_service.stream_content(..., on_response=generation.attach)
+        finally:
+            generation_registry.finish(generation)
+
+        generation_registry.cancel(chat_id)   # panel kapatıldı
+
+        generation_registry.submit(fn)  # istemci bağlantısından bağımsız üretim
+        generation_registry.stream(generation, last_event_id)  # SSE satırları
+    """
+
+    def __init__(self):
+        self.save_partial = str(os.getenv('CHAT_CANCEL_SAVE_PARTIAL', '0')).lower() in ('1', 'true', 'yes', 'on')
+        # Idempotency-Key stream'de request_id olarak kullanılır; varsayılan saklama süresi
+        # idempotency TTL'i ile aynıdır, tekrar gönderim süre dolmadan yeni üretim başlatmaz
+        self.retain_seconds = _env_float('GENERATION_RETAIN_SECONDS', _env_float('IDEMPOTENCY_TTL', 600))
+        self.checkpoint_seconds = _env_float('CHAT_CHECKPOINT_SECONDS', 2)
+        self.checkpoint_chars = int(_env_float('CHAT_CHECKPOINT_CHARS', 200))
+        self.heartbeat_seconds = _env_float('CHAT_STREAM_HEARTBEAT', 15)
+        self._generations: Dict[str, Dict[str, Generation]] = {}
+        self._lock = threading.Lock()
+        # Streaming üretimler istek thread'inden bağımsız çalışır; bağlantı kopsa da sürer
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(_env_float('CHAT_STREAM_WORKERS', 16)),
+            thread_name_prefix='chat-generation'
+        )
+
+    def _prune(self, now: float) -> None:
+        # _lock tutulurken çağrılır: saklama süresi dolan tamamlanmış üretimleri atar
+        for chat_id in list(self._generations.keys()):
+            by_request = self._generations[chat_id]
+            for request_id, generation in list(by_request.items()):
+                if generation.finished_at is not None and now - generation.finished_at > self.retain_seconds:
+                    del by_request[request_id]
+            if not by_request:
+                del self._generations[chat_id]
+
+    def _register_locked(self, chat_id: str, request_id: Optional[str], user_id: Optional[int]) -> Generation:
+        # _lock tutulurken çağrılır
+        generation = Generation(chat_id, request_id or uuid.uuid4().hex, user_id)
+        self._prune(time.monotonic())
+        self._generations.setdefault(chat_id, {})[generation.request_id] = generation
+        return generation
+
+    def register(self, chat_id: str, request_id: Optional[str] = None, user_id: Optional[int] = None) -> Generation:
+        with self._lock:
+            return self._register_locked(chat_id, request_id, user_id)
+
+    def finish(self, generation: Generation, result: Optional[Dict[str, Any]] = None) -> None:
+        """Üretimi tamamlar; devam (resume) için saklama süresi boyunca kayıtta kalır."""
+        generation.complete(result or {'success': False, 'error': 'Yanıt üretimi sonlandı'})
+        if self.retain_seconds <= 0:
+            with self._lock:
+                by_request = self._generations.get(generation.chat_id)
+                if by_request and by_request.get(generation.request_id) is generation:
+                    del by_request[generation.request_id]
+                    if not by_request:
+                        del self._generations[generation.chat_id]
+
+    def submit(self, fn: Callable[[], Any]) -> None:
+        self._executor.submit(fn)
+
+    def stream(self, generation: Generation, last_event_id: int = 0) -> Iterator[str]:
+        """
+        Üretimin olaylarını SSE biçiminde döndürür (last_event_id sonrasından).
+        İstemci bağlantısı koparsa yalnızca bu okuyucu biter; üretim sürer.
+        """
+        # Yeniden bağlanan istemci için önerilen bekleme (ms)
+        yield "retry: 2000\n\n"
+        while True:
+            events = generation.events_after(last_event_id, timeout=self.heartbeat_seconds)
+            if not events:
+                if generation.done:
+                    return
+                # Proxy'lerin boşta bağlantıyı kapatmaması için yorum satırı
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                last_event_id = event['id']
+                payload = json.dumps(event['data'], ensure_ascii=False, default=str)
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+                if event['event'] in ('done', 'error'):
+                    return
+
+    def get_or_register(self, chat_id: str, request_id: Optional[str],
+                        user_id: Optional[int] = None) -> Tuple[Generation, bool]:
+        """Aynı request_id ile kayıtlı üretim varsa onu, yoksa yenisini döndürür (created bayrağıyla)."""
+        # Arama ve ekleme tek kilit altında: eşzamanlı iki istekten yalnızca biri üretimi başlatır
+        with self._lock:
+            existing = (self._generations.get(chat_id) or {}).get(request_id) if request_id else None
+            if existing is not None:
+                return existing, False
+            return self._register_locked(chat_id, request_id, user_id), True
+
+    def get(self, chat_id: str, request_id: str) -> Optional[Generation]:
+        with self._lock:
+            return (self._generations.get(chat_id) or {}).get(request_id)
+
+    def cancel(self, chat_id: str, request_id: Optional[str] = None) -> int:
+        """Chat'in (veya yalnızca request_id'nin) üretimlerini iptal eder; iptal edilen sayıyı döndürür."""
+        with self._lock:
+            by_request = self._generations.get(chat_id) or {}
+            if request_id:
+                targets = [by_request[request_id]] if request_id in by_request else []
+            else:
+                targets = list(by_request.values())
+            targets = [g for g in targets if not g.done]
+        for generation in targets:
+            generation.cancel()
+        return len(targets)
+
+    def active(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            generations = [g for by_request in self._generations.values() for g in by_request.values() if not g.done]
+        return [g.to_dict() for g in generations]
+
+
+# Uygulama genelinde paylaşılan örnek
+generation_registry = GenerationRegistry()
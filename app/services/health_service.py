@@ -7,6 +7,7 @@
 from typing import Dict, Any
 from datetime import datetime
 from app.database.db_connection import test_connection
+from app.services.provider_health_service import provider_health
 
 class HealthService:
     """
@@ -27,6 +28,8 @@ class HealthService:
                 'success': True,
                 'status': 'healthy' if db_status else 'unhealthy',
                 'database': 'connected' if db_status else 'disconnected',
+                # Arka plan prober'ının son sonuçları (provider çağrısı yapılmaz)
+                'providers': provider_health.summary(),
                 'timestamp': str(datetime.now())
             }
         except Exception as e:
@@ -0,0 +1,150 @@
+# =============================================================================
+# IDEMPOTENCY SERVICE
+# =============================================================================
+# Idempotency-Key başlığı ile gelen yazma isteklerinin tekrarlarını ayıklar:
+# - Aynı anahtarla eşzamanlı gelen istekler devam eden ilk isteğin sonucunu
+#   bekler (coalescing); provider'a ikinci kez gidilmez, mesaj iki kez yazılmaz
+# - Tamamlanan başarılı sonuç TTL süresince saklanır ve tekrarlarda aynen döner
+# - Aynı anahtar farklı bir gövdeyle kullanılırsa istek reddedilir
+# Başarısız/iptal edilen istekler saklanmaz; istemci aynı anahtarla yeniden deneyebilir.
+# Yeniden denemeler arasında anahtarın durumu (ör. kaydedilmiş kullanıcı mesajının
+# id'si) TTL süresince korunur; tekrar deneme yan etkileri ikinci kez üretmez.
+# =============================================================================
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.services.providers.metrics import provider_metrics
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class IdempotencyConflict(Exception):
+    """Anahtar başka bir istek gövdesiyle kullanılmış veya ilk istek hâlâ sürüyor."""
+
+    def __init__(self, message: str, in_progress: bool = False):
+        super().__init__(message)
+        self.in_progress = in_progress
+
+
+class _Entry:
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.expires_at = float('inf')
+
+
+class IdempotencyStore:
+    """
+    Bellek içi idempotency kayıtları.
+
+    Kullanım:
+        result, replayed = idempotency_store.run(scope, key, body, lambda state: service.send(..., state))
+    """
+
+    def __init__(self):
+        self.ttl = _env_float('IDEMPOTENCY_TTL', 600)
+        # Eşzamanlı tekrarların ilk isteği bekleyeceği azami süre
+        self.wait_timeout = _env_float('IDEMPOTENCY_WAIT_SECONDS', 150)
+        self.max_entries = int(_env_float('IDEMPOTENCY_MAX_ENTRIES', 10000))
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Başarısız denemelerden kalan durum: full_key -> (expires_at, fingerprint, state)
+        self._states: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(body: Any) -> str:
+        material = json.dumps(body, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _evict(self, now: float) -> None:
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            del self._entries[key]
+        # Sınır aşılırsa en eski tamamlanmış kayıtlar atılır; devam edenlere dokunulmaz
+        for key in list(self._entries.keys()):
+            if len(self._entries) <= self.max_entries:
+                break
+            if self._entries[key].done.is_set():
+                del self._entries[key]
+        for key in [k for k, (expires_at, _, _) in self._states.items() if expires_at <= now]:
+            del self._states[key]
+        while len(self._states) > self.max_entries:
+            self._states.popitem(last=False)
+
+    def run(self, scope: str, key: str, body: Any,
+            fn: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """
+        fn'i anahtar başına en fazla bir kez başarıyla çalıştırır.
+
+        fn(state) anahtarın durum sözlüğünü alır; fn'in buraya yazdıkları başarısız
+        bir denemeden sonra aynı anahtarla gelen yeniden denemeye aktarılır.
+
+        Returns:
+            Tuple[sonuç, replayed]: replayed=True ise sonuç önceki/eşzamanlı istekten geldi
+
+        Raises:
+            IdempotencyConflict: Anahtar farklı gövdeyle kullanılmış veya bekleme süresi doldu
+        """
+        full_key = f"{scope}:{key}"
+        fingerprint = self.fingerprint(body)
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            entry = self._entries.get(full_key)
+            owner = entry is None
+            if owner:
+                previous = self._states.get(full_key)
+                if previous is not None and previous[1] != fingerprint:
+                    raise IdempotencyConflict("Idempotency-Key farklı bir istek için kullanılmış")
+                state = previous[2] if previous is not None else {}
+                entry = self._entries[full_key] = _Entry(fingerprint)
+        if entry.fingerprint != fingerprint:
+            raise IdempotencyConflict("Idempotency-Key farklı bir istek için kullanılmış")
+
+        if not owner:
+            provider_metrics.incr('idempotency', None, 'coalesced' if not entry.done.is_set() else 'replayed')
+            if not entry.done.wait(self.wait_timeout):
+                raise IdempotencyConflict("Aynı Idempotency-Key ile istek hâlâ işleniyor", in_progress=True)
+            if entry.result is not None:
+                return entry.result, True
+            # İlk istek başarısız oldu ve kayıt düşürüldü: bu istek yeniden dener
+            return self.run(scope, key, body, fn)
+
+        result = None
+        try:
+            result = fn(state)
+            return result, False
+        finally:
+            with self._lock:
+                if result is not None and result.get('success'):
+                    entry.result = result
+                    entry.expires_at = time.monotonic() + self.ttl
+                    self._states.pop(full_key, None)
+                else:
+                    if self._entries.get(full_key) is entry:
+                        del self._entries[full_key]
+                    if state:
+                        self._states[full_key] = (time.monotonic() + self.ttl, fingerprint, state)
+                        self._states.move_to_end(full_key)
+            entry.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = sum(1 for e in self._entries.values() if not e.done.is_set())
+            return {'entries': len(self._entries), 'in_flight': in_flight,
+                    'retry_states': len(self._states), 'ttl': self.ttl}
+
+
+# Uygulama genelinde paylaşılan örnek
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,121 @@
+# =============================================================================
+# KEY POOL SERVICE
+# =============================================================================
+# Model / provider API anahtar havuzlarını yönetir. Bir modelin havuzu:
+# modele özel anahtarlar + provider geneli anahtarlar + models.api_key.
+# Seçim ve sağlık takibi providers.key_pool.ApiKeyPool üzerinden yapılır.
+# =============================================================================
+
+import time
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.database.repositories.api_key_repository import ApiKeyRepository
+from app.services.providers.key_pool import api_key_pool, key_id
+
+
+class KeyPoolService:
+    # Havuz listesinin her mesajda DB'den okunmaması için kısa süreli önbellek
+    CACHE_SECONDS = 30
+
+    _cache: Dict[int, Tuple[float, List[str]]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _mask(api_key: Optional[str]) -> str:
+        if not api_key:
+            return ''
+        return f"{api_key[:4]}…{api_key[-4:]}" if len(api_key) > 10 else '…'
+
+    @staticmethod
+    def keys_for_model(model: Dict[str, Any]) -> Tuple[str, List[str]]:
+        """
+        Model için havuz kimliğini ve anahtar listesini döndürür.
+
+        Returns:
+            Tuple[str, List[str]]: ('model:<id>', [api_key, ...])
+        """
+        model_id = model.get('model_id')
+        pool_id = f"model:{model_id}"
+        now = time.monotonic()
+        with KeyPoolService._lock:
+            cached = KeyPoolService._cache.get(model_id)
+        if cached and now - cached[0] < KeyPoolService.CACHE_SECONDS:
+            keys = list(cached[1])
+        else:
+            rows = ApiKeyRepository.list_for_model(model_id, (model.get('provider_type') or '').lower() or None)
+            keys = [r['api_key'] for r in rows if r.get('api_key')]
+            with KeyPoolService._lock:
+                KeyPoolService._cache[model_id] = (now, list(keys))
+        if model.get('api_key'):
+            keys.append(model['api_key'])
+        return pool_id, list(dict.fromkeys(keys))
+
+    @staticmethod
+    def invalidate(model_id: Optional[int] = None) -> None:
+        with KeyPoolService._lock:
+            if model_id is None:
+                KeyPoolService._cache.clear()
+            else:
+                KeyPoolService._cache.pop(model_id, None)
+
+    # --------- Admin işlemleri ---------
+    @staticmethod
+    def list_keys(model_id: Optional[int] = None) -> Dict[str, Any]:
+        try:
+            health = {h['key']: h for h in api_key_pool.snapshot()}
+            rows = ApiKeyRepository.list_keys(model_id)
+            data = []
+            for r in rows:
+                kid = key_id(r['api_key']) if r.get('api_key') else None
+                data.append({
+                    'key_id': r['key_id'],
+                    'model_id': r.get('model_id'),
+                    'provider_type': r.get('provider_type'),
+                    'label': r.get('label'),
+                    'is_active': bool(r.get('is_active')),
+                    'api_key_masked': KeyPoolService._mask(r.get('api_key')),
+                    'health': health.get(kid),
+                })
+            return {'success': True, 'data': data, 'count': len(data)}
+        except Exception as e:
+            return {'success': False, 'error': 'Anahtarlar getirilemedi'}
+
+    @staticmethod
+    def add_key(data: Dict[str, Any]) -> Dict[str, Any]:
+        api_key = (data.get('api_key') or '').strip()
+        model_id = data.get('model_id')
+        provider_type = (data.get('provider_type') or '').strip().lower() or None
+        if not api_key:
+            return {'success': False, 'error': 'api_key zorunludur'}
+        if model_id in (None, ''):
+            model_id = None
+        if model_id is None and not provider_type:
+            return {'success': False, 'error': 'model_id veya provider_type zorunludur'}
+        if model_id is not None:
+            try:
+                model_id = int(model_id)
+            except (TypeError, ValueError):
+                return {'success': False, 'error': 'Geçersiz model_id'}
+        new_id = ApiKeyRepository.create_key(
+            api_key,
+            model_id=model_id,
+            provider_type=provider_type,
+            label=(data.get('label') or '').strip() or None,
+        )
+        if not new_id:
+            return {'success': False, 'error': 'Anahtar eklenemedi'}
+        KeyPoolService.invalidate()
+        return {'success': True, 'data': {'key_id': new_id}, 'message': 'Anahtar eklendi'}
+
+    @staticmethod
+    def delete_key(key_id_: int) -> Dict[str, Any]:
+        ok = ApiKeyRepository.delete_key(key_id_)
+        KeyPoolService.invalidate()
+        return {'success': True, 'message': 'Anahtar silindi'} if ok else {'success': False, 'error': 'Anahtar silinemedi'}
+
+    @staticmethod
+    def set_active(key_id_: int, active: bool) -> Dict[str, Any]:
+        ok = ApiKeyRepository.set_active(key_id_, active)
+        KeyPoolService.invalidate()
+        return {'success': True} if ok else {'success': False, 'error': 'Anahtar güncellenemedi'}
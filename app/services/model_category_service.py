@@ -8,8 +8,8 @@ import json
 from typing import Dict, Any, List, Optional
 from app.database.repositories.model_category_repository import ModelCategoryRepository
 from app.database.repositories.model_repository import ModelRepository
-from app.database.repositories.category_repository import CategoryRepository
 from app.services.recommendations_service import RecommendationsService
+from app.services.catalog_cache import catalog_cache
 
 
 class ModelCategoryService:
@@ -20,7 +20,7 @@ class ModelCategoryService:
     def get_for_model(self, model_id: int) -> Dict[str, Any]:
         try:
             cat_ids = ModelCategoryRepository.get_category_ids_by_model(model_id)
-            model = ModelRepository.get_model_by_id(model_id) or {}
+            model = ModelRepository.get_model_detail(model_id) or {}
             primary = model.get('primary_category_id')
             return { 'success': True, 'data': { 'model_id': model_id, 'category_ids': cat_ids, 'primary_category_id': primary } }
         except Exception as e:
@@ -29,6 +29,7 @@ class ModelCategoryService:
     def replace_for_model(self, model_id: int, category_ids: List[int], primary_category_id: Optional[int] = None) -> Dict[str, Any]:
         try:
             ok = ModelCategoryRepository.replace_model_categories(model_id, category_ids or [], primary_category_id)
+            catalog_cache.invalidate()
             return { 'success': True } if ok else { 'success': False, 'error': 'Güncelleme başarısız' }
         except Exception as e:
             return { 'success': False, 'error': 'Güncelleme başarısız' }
@@ -36,6 +37,7 @@ class ModelCategoryService:
     def add_for_model(self, model_id: int, category_ids: List[int]) -> Dict[str, Any]:
         try:
             ok = ModelCategoryRepository.add_model_categories(model_id, category_ids or [])
+            catalog_cache.invalidate()
             return { 'success': True } if ok else { 'success': False, 'error': 'Ekleme başarısız' }
         except Exception as e:
             return { 'success': False, 'error': 'Ekleme başarısız' }
@@ -43,6 +45,7 @@ class ModelCategoryService:
     def remove_for_model(self, model_id: int, category_ids: List[int]) -> Dict[str, Any]:
         try:
             ok = ModelCategoryRepository.remove_model_categories(model_id, category_ids or [])
+            catalog_cache.invalidate()
             return { 'success': True } if ok else { 'success': False, 'error': 'Silme başarısız' }
         except Exception as e:
             return { 'success': False, 'error': 'Silme başarısız' }
@@ -53,6 +56,7 @@ class ModelCategoryService:
             return { 'success': False, 'error': 'model_ids gerekli' }
         try:
             ok = ModelCategoryRepository.bulk_replace(model_ids, category_ids or [], primary_category_id)
+            catalog_cache.invalidate()
             return { 'success': True } if ok else { 'success': False, 'error': 'Toplu güncelleme başarısız' }
         except Exception as e:
             return { 'success': False, 'error': 'Toplu güncelleme başarısız' }
@@ -61,11 +65,9 @@ class ModelCategoryService:
         if not model_ids:
             return { 'success': False, 'error': 'model_ids gerekli' }
         try:
-            ok_all = True
-            for mid in model_ids:
-                ok = ModelCategoryRepository.add_model_categories(mid, category_ids or [])
-                ok_all = ok_all and ok
-            return { 'success': ok_all }
+            ok = ModelCategoryRepository.bulk_add(model_ids, category_ids or [])
+            catalog_cache.invalidate()
+            return { 'success': True } if ok else { 'success': False, 'error': 'Toplu ekleme başarısız' }
         except Exception as e:
             return { 'success': False, 'error': 'Toplu ekleme başarısız' }
 
@@ -73,14 +75,36 @@ class ModelCategoryService:
         if not model_ids:
             return { 'success': False, 'error': 'model_ids gerekli' }
         try:
-            ok_all = True
-            for mid in model_ids:
-                ok = ModelCategoryRepository.remove_model_categories(mid, category_ids or [])
-                ok_all = ok_all and ok
-            return { 'success': ok_all }
+            ok = ModelCategoryRepository.bulk_remove(model_ids, category_ids or [])
+            catalog_cache.invalidate()
+            return { 'success': True } if ok else { 'success': False, 'error': 'Toplu silme başarısız' }
         except Exception as e:
             return { 'success': False, 'error': 'Toplu silme başarısız' }
 
+    def apply_suggestions(self, suggestions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """AI önerilerini tek transaction içinde uygular.
+        suggestions: [{ model_id, category_ids, primary_category_id? }]
+        """
+        assignments = []
+        try:
+            for s in suggestions or []:
+                pcid = s.get('primary_category_id')
+                assignments.append({
+                    'model_id': int(s.get('model_id')),
+                    'category_ids': [int(x) for x in (s.get('category_ids') or [])],
+                    'primary_category_id': int(pcid) if pcid is not None else None
+                })
+        except Exception:
+            return { 'success': False, 'error': 'Geçersiz öneri verisi' }
+        if not assignments:
+            return { 'success': True, 'count': 0 }
+        try:
+            ok = ModelCategoryRepository.apply_assignments(assignments)
+            catalog_cache.invalidate()
+            return { 'success': True, 'count': len(assignments) } if ok else { 'success': False, 'error': 'Öneriler uygulanamadı' }
+        except Exception as e:
+            return { 'success': False, 'error': 'Öneriler uygulanamadı' }
+
     # --------- AI-assisted suggestions ---------
     def ai_suggest(self, model_ids: Optional[List[int]] = None, language: Optional[str] = None) -> Dict[str, Any]:
         """Seçili modeller için kategori önerisi üretir ve öneriyi döner.
@@ -88,8 +112,8 @@ class ModelCategoryService:
         """
         try:
             # Model ve kategori verisini hazırla
-            all_models = ModelRepository.get_all_models_with_categories()
-            categories = CategoryRepository.get_all_categories()
+            all_models = catalog_cache.models()
+            categories = catalog_cache.categories()
             if model_ids:
                 models = [m for m in all_models if int(m.get('model_id')) in set(model_ids)]
             else:
@@ -123,7 +147,7 @@ class ModelCategoryService:
 
             # Ensure Gemini credentials via recommender service
             self.recommender._ensure_gemini_credentials()
-            result = self.recommender.gemini.generate_content(
+            result = self.recommender.generate(
                 prompt=json.dumps(request_payload, ensure_ascii=False),
                 system_prompt=system_prompt
             )
@@ -6,6 +6,10 @@
 
 from typing import List, Dict, Any, Optional
 from app.database.repositories.model_repository import ModelRepository
+from app.services.catalog_cache import catalog_cache
+from app.services.chat_list_cache import chat_list_cache
+from app.services.catalog_index import catalog_index, parse_query
+from app.services.autocomplete_index import model_autocomplete
 
 class ModelService:
     """
@@ -20,11 +24,14 @@ class ModelService:
             Dict[str, Any]: Başarı durumu ve model listesi
         """
         try:
-            models = ModelRepository.get_all_models_with_categories()
+            # Veri ve version aynı yüklemeden gelmeli; arada invalidate olursa ETag veriyle uyuşmaz
+            snapshot = catalog_cache.snapshot()
+            models = snapshot['models']
             return {
                 'success': True,
                 'data': models,
-                'count': len(models)
+                'count': len(models),
+                'version': snapshot['version']
             }
         except Exception as e:
             return {
@@ -32,6 +39,46 @@ class ModelService:
                 'error': 'Modeller getirilemedi'
             }
     
+    def search_models(self, params) -> Dict[str, Any]:
+        """
+        Filtrelenmiş ve sayfalanmış model listesi (bellek içi katalog dizini).
+
+        Args:
+            params: provider, category_id, categories, match, active, q, cursor, limit
+
+        Returns:
+            Dict[str, Any]: Başarı durumu, sayfa verisi ve next_cursor
+        """
+        try:
+            query = parse_query(params)
+        except ValueError as e:
+            return {'success': False, 'error': str(e), 'invalid': True}
+        try:
+            result = {'success': True, **catalog_index.query(**query)}
+            if query.get('category_ids'):
+                # Seçili kategorilerle birlikte her kategoride kaç model kaldığı (facet sayıları)
+                result['category_counts'] = catalog_index.category_counts(query['category_ids'], query.get('match', 'any'))
+            return result
+        except Exception as e:
+            return {'success': False, 'error': 'Modeller getirilemedi'}
+
+    def autocomplete(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        model_name, request_model_name ve provider_name üzerinde otomatik tamamlama.
+
+        Args:
+            query: Aranan metin (önek / bulanık)
+            limit: Maksimum sonuç sayısı
+
+        Returns:
+            Dict[str, Any]: Puana göre sıralı modeller
+        """
+        try:
+            models = model_autocomplete.search(query, limit)
+            return {'success': True, 'data': models, 'count': len(models)}
+        except Exception as e:
+            return {'success': False, 'error': 'Model araması yapılamadı'}
+
     def get_model_by_id(self, model_id: int) -> Dict[str, Any]:
         """
         ID'ye göre model getirir.
@@ -43,7 +90,7 @@ class ModelService:
             Dict[str, Any]: Başarı durumu ve model verisi
         """
         try:
-            model = ModelRepository.get_model_by_id(model_id)
+            model = ModelRepository.get_model_detail(model_id)
             if model:
                 return {
                     'success': True,
@@ -78,8 +125,26 @@ class ModelService:
                     'error': 'model_name alanı gereklidir'
                 }
             
+            # Çoğaltma: API anahtarı yanıtlarda dönmediği için kaynak modelden sunucuda kopyalanır
+            source_id = data.get('copy_api_key_from')
+            if source_id and not data.get('api_key'):
+                try:
+                    source = ModelRepository.get_model_by_id(int(source_id))
+                except (TypeError, ValueError):
+                    return {
+                        'success': False,
+                        'error': 'Geçersiz copy_api_key_from'
+                    }
+                if not source:
+                    return {
+                        'success': False,
+                        'error': 'Kaynak model bulunamadı'
+                    }
+                data = dict(data, api_key=source.get('api_key'))
+            
             # Model oluştur
             model_id = ModelRepository.create_model(data)
+            catalog_cache.invalidate()
             
             if model_id:
                 return {
@@ -119,6 +184,9 @@ class ModelService:
             
             # Model güncelle
             success = ModelRepository.update_model(model_id, data)
+            catalog_cache.invalidate()
+            # Sohbet listeleri model adını / sağlayıcısını içerir
+            chat_list_cache.clear()
             
             if success:
                 return {
@@ -149,6 +217,9 @@ class ModelService:
         """
         try:
             success = ModelRepository.delete_model(model_id)
+            catalog_cache.invalidate()
+            # Sohbet listeleri model adını / sağlayıcısını içerir
+            chat_list_cache.clear()
             
             if success:
                 return {
@@ -0,0 +1,156 @@
+# =============================================================================
+# PROVIDER HEALTH SERVICE
+# =============================================================================
+# Aktif modellerin provider sağlığını hafif probe'larla (içerik üretmeden)
+# periyodik olarak kontrol eder ve sonuçları bellekte tutar. Admin arayüzü ve
+# /api/health, provider durumunu beklemeden bu önbellekten okur.
+# =============================================================================
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.database.db_connection import execute_query
+from app.database.repositories.model_repository import ModelRepository
+from app.services.key_pool_service import KeyPoolService
+from app.services.providers.factory import ProviderFactory
+from app.services.providers.key_pool import api_key_pool
+from app.services.providers.metrics import provider_metrics
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class ProviderHealthMonitor:
+    """
+    Model bazında probe sonuçları + arka plan prober.
+
+    Kullanım:
+        provider_health.start()          # uygulama açılışında
+        provider_health.summary()        # anlık provider durumu
+        provider_health.check_model(row) # tek model için hemen probe
+    """
+
+    def __init__(self):
+        self.enabled = str(os.getenv('PROVIDER_PROBER', '1')).lower() in ('1', 'true', 'yes', 'on')
+        self.interval = _env_float('PROVIDER_PROBE_INTERVAL', 300)
+        self.concurrency = max(1, int(_env_float('PROVIDER_PROBE_CONCURRENCY', 4)))
+        self._results: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self.last_run: Optional[str] = None
+
+    @staticmethod
+    def _active_models() -> List[Dict[str, Any]]:
+        try:
+            return execute_query(
+                """
+                SELECT m.model_id, m.model_name, m.request_model_name, m.provider_type, m.api_key
+                FROM models m
+                WHERE m.is_active = TRUE AND {usable}
+                """.format(usable=ModelRepository.USABLE_KEY_SQL),
+                fetch=True
+            ) or []
+        except Exception:
+            return []
+
+    def check_model(self, model: Dict[str, Any]) -> Dict[str, Any]:
+        """Tek bir model için probe çalıştırır ve sonucu kaydeder."""
+        provider_type = (model.get('provider_type') or '').lower()
+        request_model_name = model.get('request_model_name') or model.get('model_name')
+        service = ProviderFactory.get_service(provider_type)
+        if not service or not hasattr(service, 'probe'):
+            result = {'success': False, 'error': 'Probe desteklenmiyor'}
+        else:
+            try:
+                # models.api_key boşsa anahtar havuzundan (model_api_keys) biri kullanılır
+                api_key = model.get('api_key')
+                if not api_key:
+                    pool_id, pool_keys = KeyPoolService.keys_for_model(model)
+                    api_key = api_key_pool.select(pool_id, pool_keys)
+                # Paylaşılan servisin api_key/model durumuna dokunmadan probe
+                result = service.probe(api_key, request_model_name)
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+        entry = {
+            'model_id': model.get('model_id'),
+            'model_name': model.get('model_name'),
+            'provider_type': provider_type,
+            'status': 'up' if result.get('success') else 'down',
+            'latency_ms': result.get('latency_ms'),
+            'status_code': result.get('status_code'),
+            'error': None if result.get('success') else result.get('error'),
+            'checked_at': datetime.now().isoformat(),
+        }
+        provider_metrics.incr(provider_type or 'unknown', request_model_name, f"probe.{entry['status']}")
+        if model.get('model_id') is not None:
+            with self._lock:
+                self._results[model['model_id']] = entry
+        return entry
+
+    def run_once(self) -> int:
+        """Tüm aktif modelleri probe eder; aynı anda tek tur çalışır."""
+        if not self._run_lock.acquire(blocking=False):
+            return 0
+        try:
+            models = self._active_models()
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='provider-probe') as pool:
+                list(pool.map(self.check_model, models))
+            active_ids = {m.get('model_id') for m in models}
+            with self._lock:
+                for model_id in list(self._results.keys()):
+                    if model_id not in active_ids:
+                        del self._results[model_id]
+            self.last_run = datetime.now().isoformat()
+            return len(models)
+        finally:
+            self._run_lock.release()
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logging.warning("Provider probe turu başarısız: %s", e)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self) -> None:
+        if not self.enabled or (self._worker and self._worker.is_alive()):
+            return
+        self._worker = threading.Thread(target=self._loop, name='provider-prober', daemon=True)
+        self._worker.start()
+
+    def refresh(self) -> None:
+        """Arka plan prober'ını hemen yeni bir tura zorlar (çalışmıyorsa senkron çalıştırır)."""
+        if self._worker and self._worker.is_alive():
+            self._wake.set()
+        else:
+            self.run_once()
+
+    def results(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return sorted((dict(r) for r in self._results.values()), key=lambda r: r.get('model_id') or 0)
+
+    def summary(self) -> Dict[str, Any]:
+        """Provider bazında up/down sayıları; en az bir model up ise provider 'up'."""
+        providers: Dict[str, Dict[str, Any]] = {}
+        for r in self.results():
+            p = providers.setdefault(r['provider_type'], {'up': 0, 'down': 0})
+            p[r['status']] += 1
+        for p in providers.values():
+            p['status'] = 'up' if p['up'] else 'down'
+        return {'providers': providers, 'last_run': self.last_run}
+
+
+# Uygulama genelinde paylaşılan örnek
+provider_health = ProviderHealthMonitor()
@@ -8,9 +8,37 @@
 from .gemini import GeminiService
 from .openrouter import OpenRouterService
 from .factory import ProviderFactory
+from .catalog_cache import CatalogCache, catalog_cache
+from .metrics import ProviderMetrics, provider_metrics
+from .resilience import RetryPolicy, send_with_resilience
+from .circuit_breaker import CircuitOpenError, circuit_breakers
+from .scheduler import SchedulerRejected, provider_scheduler
+from .key_pool import ApiKeyPool, api_key_pool
+from .response_cache import ResponseCache, response_cache
+from .context_cache import ContextCacheManager, LocalContextCacheBackend, context_cache
+from .streaming import STREAM_POLICY, iter_sse_data
 
 __all__ = [
     'GeminiService',
     'OpenRouterService',
     'ProviderFactory',
+    'CatalogCache',
+    'catalog_cache',
+    'ProviderMetrics',
+    'provider_metrics',
+    'RetryPolicy',
+    'send_with_resilience',
+    'CircuitOpenError',
+    'circuit_breakers',
+    'SchedulerRejected',
+    'provider_scheduler',
+    'ApiKeyPool',
+    'api_key_pool',
+    'ResponseCache',
+    'response_cache',
+    'ContextCacheManager',
+    'LocalContextCacheBackend',
+    'context_cache',
+    'STREAM_POLICY',
+    'iter_sse_data',
 ]
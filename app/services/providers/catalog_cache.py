@@ -0,0 +1,143 @@
+# =============================================================================
+# PROVIDER CATALOG CACHE (Providers)
+# =============================================================================
+# Provider model listelerini (örn. OpenRouter /models) süreç içinde önbellekler.
+# - Anahtar: (provider, key_scope) -> key_scope, API anahtarının hash'idir
+# - TTL dolunca eski liste hemen döner, arka planda yenilenir (stale-while-revalidate)
+# - id ve name üzerinden O(1) arama için indeks tutar
+# =============================================================================
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class CatalogEntry:
+    """Tek bir (provider, key_scope) için önbelleğe alınmış katalog."""
+
+    def __init__(self, models: List[Dict[str, Any]]):
+        self.models = models
+        self.fetched_at = time.monotonic()
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_name: Dict[str, Dict[str, Any]] = {}
+        for m in models:
+            mid = m.get('id')
+            name = m.get('name')
+            if mid and mid not in self.by_id:
+                self.by_id[mid] = m
+            if name and name not in self.by_name:
+                self.by_name[name] = m
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def lookup(self, model_name: str) -> Optional[Dict[str, Any]]:
+        return self.by_id.get(model_name) or self.by_name.get(model_name)
+
+
+class CatalogCache:
+    """
+    Provider model katalogları için TTL + stale-while-revalidate önbelleği.
+
+    ttl süresince kayıt tazedir; ttl ile ttl + stale_ttl arasında eski kayıt
+    döndürülür ve arka planda tek bir yenileme başlatılır; daha eski kayıtlar
+    senkron olarak yeniden yüklenir.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, stale_ttl: Optional[float] = None):
+        self.ttl = ttl if ttl is not None else _env_float('PROVIDER_CATALOG_TTL', 600)
+        self.stale_ttl = stale_ttl if stale_ttl is not None else _env_float('PROVIDER_CATALOG_STALE_TTL', 3600)
+        self._entries: Dict[Tuple[str, str], CatalogEntry] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._refreshing: set = set()
+        self._guard = threading.Lock()
+
+    @staticmethod
+    def key_scope(api_key: Optional[str]) -> str:
+        """API anahtarını saklamadan ayırt etmek için kısa bir hash üretir."""
+        if not api_key:
+            return 'anonymous'
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+    def _lock_for(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _load(self, key: Tuple[str, str], loader: Callable[[], List[Dict[str, Any]]]) -> Optional[CatalogEntry]:
+        try:
+            models = loader()
+        except Exception as e:
+            logging.warning("Catalog load failed for %s: %s", key[0], e)
+            return None
+        # Boş liste hata olarak kabul edilir; eski kaydı ezmeyelim
+        if not models:
+            return None
+        entry = CatalogEntry(models)
+        self._entries[key] = entry
+        return entry
+
+    def _refresh_in_background(self, key: Tuple[str, str], loader: Callable[[], List[Dict[str, Any]]]) -> None:
+        with self._guard:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self._load(key, loader)
+            finally:
+                with self._guard:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"catalog-refresh-{key[0]}", daemon=True).start()
+
+    def get_entry(self, provider: str, api_key: Optional[str], loader: Callable[[], List[Dict[str, Any]]]) -> Optional[CatalogEntry]:
+        key = (provider, self.key_scope(api_key))
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = entry.age()
+            if age < self.ttl:
+                return entry
+            if age < self.ttl + self.stale_ttl:
+                self._refresh_in_background(key, loader)
+                return entry
+
+        # Kayıt yok ya da çok eski: aynı anahtar için tek bir senkron yükleme
+        with self._lock_for(key):
+            entry = self._entries.get(key)
+            if entry is not None and entry.age() < self.ttl:
+                return entry
+            return self._load(key, loader) or entry
+
+    def get_models(self, provider: str, api_key: Optional[str], loader: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        entry = self.get_entry(provider, api_key, loader)
+        return list(entry.models) if entry else []
+
+    def lookup(self, provider: str, api_key: Optional[str], loader: Callable[[], List[Dict[str, Any]]], model_name: str) -> Optional[Dict[str, Any]]:
+        entry = self.get_entry(provider, api_key, loader)
+        return entry.lookup(model_name) if entry else None
+
+    def invalidate(self, provider: Optional[str] = None) -> None:
+        with self._guard:
+            if provider is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == provider]:
+                    self._entries.pop(key, None)
+
+
+# Uygulama genelinde paylaşılan örnek
+catalog_cache = CatalogCache()
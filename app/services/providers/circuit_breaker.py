@@ -0,0 +1,190 @@
+# =============================================================================
+# PROVIDER CIRCUIT BREAKER (Providers)
+# =============================================================================
+# Provider ve model bazında devre kesici. Çağrı sonuçları ve gecikme ile
+# beslenir; hata oranı eşiği aşılınca devre açılır ve çağrılar provider'a
+# gitmeden hemen reddedilir. Bekleme süresi sonunda yarı-açık durumda
+# sınırlı sayıda deneme çağrısına izin verilir.
+# =============================================================================
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from app.services.providers.metrics import provider_metrics
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Devre açıkken yapılan çağrı; provider'a istek gönderilmez."""
+
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"Devre açık ({scope}), {int(retry_after) + 1} sn sonra tekrar denenecek")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Kayan pencere üzerinden hata oranına göre açılan tek bir devre.
+    Eşikten yavaş başarılı çağrılar da hata olarak sayılır.
+    """
+
+    def __init__(self, scope: str, window: int = 20, min_calls: int = 5, failure_rate: float = 0.5,
+                 open_seconds: float = 30.0, slow_call_seconds: float = 0.0, half_open_calls: int = 1):
+        self.scope = scope
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes: deque = deque(maxlen=window)
+        self._half_open_inflight = 0
+        self._lock = threading.Lock()
+
+    def _remaining_open(self) -> float:
+        return max(0.0, self.open_seconds - (time.monotonic() - self.opened_at))
+
+    def allow(self) -> Optional[float]:
+        """Çağrıya izin verilirse None, aksi halde kalan bekleme süresini döndürür."""
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._remaining_open()
+                if remaining > 0:
+                    return remaining
+                self.state = HALF_OPEN
+                self._half_open_inflight = 0
+            if self.state == HALF_OPEN:
+                if self._half_open_inflight >= self.half_open_calls:
+                    return 1.0
+                self._half_open_inflight += 1
+            return None
+
+    def release(self) -> None:
+        """allow() ile alınan yarı-açık deneme hakkını sonuç kaydetmeden geri verir."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._half_open_inflight = max(0, self._half_open_inflight - 1)
+
+    def record(self, ok: bool, latency: float) -> None:
+        if ok and self.slow_call_seconds > 0 and latency > self.slow_call_seconds:
+            ok = False
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._half_open_inflight = max(0, self._half_open_inflight - 1)
+                if ok:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._trip()
+                return
+            self._outcomes.append(ok)
+            if len(self._outcomes) >= self.min_calls:
+                failures = sum(1 for o in self._outcomes if not o)
+                if failures / len(self._outcomes) >= self.failure_rate:
+                    self._trip()
+
+    def _trip(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._outcomes.clear()
+        provider_metrics.incr('circuit', self.scope, 'opened')
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            failures = sum(1 for o in self._outcomes if not o)
+            return {
+                'scope': self.scope,
+                'state': self.state,
+                'calls': len(self._outcomes),
+                'failures': failures,
+                'retry_after': round(self._remaining_open(), 1) if self.state == OPEN else 0,
+            }
+
+
+class CircuitBreakerRegistry:
+    """
+    Provider ('provider:<tip>') ve model ('model:<tip>:<model>') devrelerini tutar.
+    Bir çağrı ancak iki devre de izin verirse yapılır.
+    """
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self.enabled = str(os.getenv('PROVIDER_CIRCUIT_BREAKER', '1')).lower() in ('1', 'true', 'yes', 'on')
+
+    def _get(self, scope: str, provider_level: bool) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(scope)
+            if breaker is None:
+                breaker = self._breakers[scope] = CircuitBreaker(
+                    scope,
+                    window=int(_env_float('CIRCUIT_WINDOW', 20)),
+                    # Provider devresi tüm modellerin sonuçlarını gördüğü için daha fazla örnek ister
+                    min_calls=int(_env_float('CIRCUIT_MIN_CALLS', 5)) * (2 if provider_level else 1),
+                    failure_rate=_env_float('CIRCUIT_FAILURE_RATE', 0.5),
+                    open_seconds=_env_float('CIRCUIT_OPEN_SECONDS', 30),
+                    slow_call_seconds=_env_float('CIRCUIT_SLOW_CALL_SECONDS', 0),
+                )
+            return breaker
+
+    def _scopes(self, provider: str, model: Optional[str]) -> List[CircuitBreaker]:
+        breakers = [self._get(f"provider:{provider}", True)]
+        if model:
+            breakers.append(self._get(f"model:{provider}:{model}", False))
+        return breakers
+
+    def check(self, provider: str, model: Optional[str]) -> None:
+        """Devre açıksa CircuitOpenError fırlatır."""
+        if not self.enabled:
+            return
+        allowed = []
+        for breaker in self._scopes(provider, model):
+            wait_for = breaker.allow()
+            if wait_for is not None:
+                for prev in allowed:
+                    prev.release()
+                provider_metrics.incr(provider, model, 'circuit.rejected')
+                raise CircuitOpenError(breaker.scope, wait_for)
+            allowed.append(breaker)
+
+    def is_open(self, provider: str, model: Optional[str]) -> bool:
+        """Çağrı yapmadan devrenin açık olup olmadığını söyler."""
+        if not self.enabled:
+            return False
+        for breaker in self._scopes(provider, model):
+            if breaker.state == OPEN and breaker._remaining_open() > 0:
+                return True
+        return False
+
+    def record(self, provider: str, model: Optional[str], ok: bool, latency: float) -> None:
+        if not self.enabled:
+            return
+        for breaker in self._scopes(provider, model):
+            breaker.record(ok, latency)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [b.status() for b in breakers]
+
+
+# Uygulama genelinde paylaşılan örnek
+circuit_breakers = CircuitBreakerRegistry()
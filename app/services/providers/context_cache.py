@@ -0,0 +1,198 @@
+# =============================================================================
+# PROVIDER CONTEXT CACHE (Providers)
+# =============================================================================
+# Büyük ve çoğunlukla sabit prompt öneklerinin (sistem talimatı + statik
+# bağlam, örn. model kataloğu) provider tarafında bir kez yüklenip sonraki
+# isteklerde referansla kullanılması (Gemini cachedContents).
+# - Handle'lar (model, anahtar, önek) hash'i ile tutulur ve TTL dolmadan yenilenir
+# - Oluşturma başarısızsa (örn. önek minimum token sınırının altında) kısa
+#   süre satır içi gönderime düşülür
+# - LocalContextCacheBackend: ağ çağrısı yapmayan yerel yedek (test / geliştirme)
+# =============================================================================
+
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import requests
+
+from app.services.providers.metrics import provider_metrics
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class ContextHandle:
+    """Provider tarafında önbelleğe alınmış bir önek."""
+
+    def __init__(self, name: str, expires_at: float, remote: bool = True):
+        self.name = name
+        self.expires_at = expires_at
+        # remote=False: yerel yedek; önek yine satır içi gönderilir
+        self.remote = remote
+        self.uses = 0
+
+    def is_valid(self, now: float, margin: float) -> bool:
+        return self.expires_at - margin > now
+
+
+class GeminiContextCacheBackend:
+    """Gemini cachedContents REST uç noktaları."""
+
+    def __init__(self, base_url: str = "https://generativelanguage.googleapis.com/v1beta"):
+        self.base_url = base_url
+
+    def create(self, api_key: str, model: str, system_prompt: Optional[str], static_context: Optional[str],
+               ttl: float) -> ContextHandle:
+        body: Dict[str, Any] = {"model": f"models/{model}", "ttl": f"{int(ttl)}s"}
+        if system_prompt:
+            body["systemInstruction"] = {"parts": [{"text": system_prompt}]}
+        if static_context:
+            body["contents"] = [{"role": "user", "parts": [{"text": static_context}]}]
+        response = requests.post(
+            f"{self.base_url}/cachedContents",
+            headers={"Content-Type": "application/json", "x-goog-api-key": api_key},
+            json=body,
+            timeout=(5, 30)
+        )
+        response.raise_for_status()
+        return ContextHandle(response.json()["name"], time.monotonic() + ttl)
+
+    def delete(self, api_key: str, name: str) -> None:
+        requests.delete(f"{self.base_url}/{name}", headers={"x-goog-api-key": api_key}, timeout=(5, 10))
+
+
+class LocalContextCacheBackend:
+    """
+    Ağ çağrısı yapmayan yerel yedek: handle üretir ve oluşturma/silme
+    çağrılarını kaydeder. Handle'lar remote=False olduğundan servis öneki
+    satır içi göndermeye devam eder.
+    """
+
+    def __init__(self):
+        self.created: Dict[str, Dict[str, Any]] = {}
+        self.deleted: list = []
+
+    def create(self, api_key: str, model: str, system_prompt: Optional[str], static_context: Optional[str],
+               ttl: float) -> ContextHandle:
+        name = f"local/{len(self.created) + 1}"
+        self.created[name] = {'model': model, 'system_prompt': system_prompt, 'static_context': static_context, 'ttl': ttl}
+        return ContextHandle(name, time.monotonic() + ttl, remote=False)
+
+    def delete(self, api_key: str, name: str) -> None:
+        self.deleted.append(name)
+        self.created.pop(name, None)
+
+
+class ContextCacheManager:
+    """
+    Önek handle'larını yönetir.
+
+    Kullanım:
+        handle = context_cache.get_handle(api_key, model, system_prompt, static_context)
+        if handle and handle.remote:
+            payload["cachedContent"] = handle.name
+    """
+
+    def __init__(self, backend=None, ttl: Optional[float] = None):
+        self.enabled = str(os.getenv('GEMINI_CONTEXT_CACHE', '0')).lower() in ('1', 'true', 'yes', 'on')
+        if backend is None:
+            backend_name = os.getenv('GEMINI_CONTEXT_CACHE_BACKEND', 'gemini').lower()
+            backend = LocalContextCacheBackend() if backend_name == 'local' else GeminiContextCacheBackend()
+        self.backend = backend
+        self.ttl = ttl if ttl is not None else _env_float('GEMINI_CONTEXT_CACHE_TTL', 600)
+        # Provider minimum önbellek boyutunun altındaki önekler için deneme yapma (~4 karakter/token)
+        self.min_chars = int(_env_float('GEMINI_CONTEXT_CACHE_MIN_CHARS', 8000))
+        self.max_handles = int(_env_float('GEMINI_CONTEXT_CACHE_MAX', 32))
+        self.renew_margin = 30.0
+        self.failure_backoff = 300.0
+        self._handles: "OrderedDict[str, ContextHandle]" = OrderedDict()
+        self._failed: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    @staticmethod
+    def _key(api_key: str, model: str, system_prompt: Optional[str], static_context: Optional[str]) -> str:
+        material = '\x00'.join([
+            hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16],
+            model or '', system_prompt or '', static_context or '',
+        ])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def get_handle(self, api_key: str, model: str, system_prompt: Optional[str],
+                   static_context: Optional[str]) -> Optional[ContextHandle]:
+        """Geçerli handle'ı döndürür, yoksa oluşturur; uygun değilse None (satır içi gönder)."""
+        if not self.enabled or not api_key:
+            return None
+        if len(system_prompt or '') + len(static_context or '') < self.min_chars:
+            return None
+        key = self._key(api_key, model, system_prompt, static_context)
+        now = time.monotonic()
+        with self._guard:
+            handle = self._handles.get(key)
+            if handle and handle.is_valid(now, self.renew_margin):
+                self._handles.move_to_end(key)
+                handle.uses += 1
+                provider_metrics.incr('context_cache', model, 'hit')
+                return handle
+            if self._failed.get(key, 0) > now:
+                return None
+        with self._lock_for(key):
+            with self._guard:
+                handle = self._handles.get(key)
+                if handle and handle.is_valid(time.monotonic(), self.renew_margin):
+                    handle.uses += 1
+                    return handle
+            try:
+                handle = self.backend.create(api_key, model, system_prompt, static_context, self.ttl)
+            except Exception:
+                provider_metrics.incr('context_cache', model, 'create_failed')
+                with self._guard:
+                    self._failed[key] = time.monotonic() + self.failure_backoff
+                return None
+            provider_metrics.incr('context_cache', model, 'created')
+            with self._guard:
+                self._handles[key] = handle
+                self._handles.move_to_end(key)
+                # Fazla handle'lar bellekten atılır; provider tarafında TTL ile kendiliğinden silinir
+                while len(self._handles) > self.max_handles:
+                    self._handles.popitem(last=False)
+            handle.uses += 1
+            return handle
+
+    def invalidate(self, name: str) -> None:
+        """Provider handle'ı tanımazsa (süresi dolmuş/silinmiş) bellekten düşürür."""
+        with self._guard:
+            for key, handle in list(self._handles.items()):
+                if handle.name == name:
+                    del self._handles[key]
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._guard:
+            return {
+                'enabled': self.enabled,
+                'backend': type(self.backend).__name__,
+                'handles': [
+                    {'name': h.name, 'uses': h.uses, 'expires_in': round(max(0.0, h.expires_at - now))}
+                    for h in self._handles.values()
+                ],
+            }
+
+
+# Uygulama genelinde paylaşılan örnek
+context_cache = ContextCacheManager()
@@ -56,6 +56,12 @@ class ProviderFactory:
             service = cls.get_service(provider_type, **kwargs)
             if not service:
                 return {"success": False, "error": f"Desteklenmeyen provider türü: {provider_type}"}
+            if hasattr(service, 'probe'):
+                # Hafif probe; paylaşılan servisin api_key/model durumunu değiştirmez
+                result = service.probe(api_key, model)
+                if result.get('success'):
+                    result['message'] = 'Bağlantı başarılı'
+                return result
             service.set_api_key(api_key)
             if model and hasattr(service, 'set_model'):
                 service.set_model(model)
@@ -69,8 +75,8 @@ class ProviderFactory:
             service = cls.get_service(provider_type)
             if not service:
                 return {"success": False, "error": f"Desteklenmeyen provider türü: {provider_type}"}
-            if api_key and hasattr(service, 'set_api_key'):
-                service.set_api_key(api_key)
+            if api_key and hasattr(service, 'configured'):
+                service = service.configured(api_key)
             if hasattr(service, 'get_available_models'):
                 models = service.get_available_models()
                 return {"success": True, "models": models, "count": len(models)}
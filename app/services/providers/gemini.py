@@ -4,10 +4,19 @@
 # Google Gemini entegrasyonu. app.services.providers altına taşındı.
 # =============================================================================
 
+import copy
 import requests
 import json
-from typing import Dict, Any, Optional, List
+import time
+from typing import Dict, Any, Optional, List, Iterator
 from datetime import datetime
+from app.services.providers.resilience import send_with_resilience, http_error_details
+from app.services.providers.response_cache import response_cache
+from app.services.providers.context_cache import context_cache
+from app.services.providers.streaming import STREAM_POLICY, iter_sse_data, replay_cached
+
+# Sağlık kontrolü (probe) zaman aşımı: (bağlantı, okuma) sn
+PROBE_TIMEOUT = (3, 5)
 
 class GeminiService:
     """
@@ -35,6 +44,18 @@ class GeminiService:
         """
         self.model_name = model_name
         
+    def configured(self, api_key: str, model_name: str = None) -> 'GeminiService':
+        """
+        Bu çağrıya özel anahtar/model ile yapılandırılmış kopya döndürür.
+        ProviderFactory örneği paylaşıldığı için eşzamanlı istekler set_api_key
+        ile birbirinin anahtarını ezmesin diye çağrı başına kopya kullanılır.
+        """
+        service = copy.copy(self)
+        service.api_key = api_key
+        if model_name:
+            service.model_name = model_name
+        return service
+        
     def set_parameters(self, max_tokens: int = None, temperature: float = None, 
                       top_p: float = None, top_k: int = None):
         """
@@ -51,43 +72,122 @@ class GeminiService:
             
         # silent update; no logging
     
+    def _generation_config(self) -> Dict[str, Any]:
+        return {
+            "maxOutputTokens": self.max_tokens,
+            "temperature": self.temperature,
+            "topP": self.top_p,
+            "topK": self.top_k
+        }
+    
+    def _build_payload(self, prompt: str, system_prompt: Optional[str], conversation_history: Optional[List[Dict]],
+                       static_context: Optional[str], generation_config: Dict[str, Any],
+                       cached_content: Optional[str] = None) -> Dict[str, Any]:
+        """
+        generateContent / streamGenerateContent istek gövdesi.
+        cached_content verilirse sistem talimatı ve statik bağlam provider
+        önbelleğinden referansla kullanılır.
+        """
+        contents = []
+        
+        # Statik bağlam (önbellekte değilse) ilk kullanıcı turu olarak eklenir
+        if static_context and not cached_content:
+            contents.append({
+                "role": "user",
+                "parts": [{"text": static_context}]
+            })
+        
+        # Konuşma geçmişini ekle
+        if conversation_history:
+            for message in conversation_history:
+                role = "user" if message.get("is_user", True) else "model"
+                contents.append({
+                    "role": role,
+                    "parts": [{"text": message.get("content", "")}] 
+                })
+        
+        # Mevcut mesajı ekle
+        contents.append({
+            "role": "user",
+            "parts": [{"text": prompt}]
+        })
+        
+        payload = {
+            "contents": contents,
+            "generationConfig": generation_config,
+            "safetySettings": [
+                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"}
+            ]
+        }
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        elif system_prompt:
+            # Native sistem talimatı (sahte kullanıcı/model turu yerine)
+            payload["systemInstruction"] = {"parts": [{"text": system_prompt}]}
+        return payload
+    
+    def _post(self, url: str, headers: Dict[str, str], build_payload, handle, stream: bool = False) -> requests.Response:
+        """
+        İsteği gönderir; önbellek handle'ı provider tarafında geçersizse (400/403/404)
+        handle'ı düşürüp öneki satır içi göndererek bir kez tekrarlar.
+        """
+        policy = STREAM_POLICY if stream else None
+        use_handle = bool(handle and handle.remote)
+        payload = build_payload(handle.name if use_handle else None)
+        response = send_with_resilience(
+            'gemini', self.model_name,
+            lambda timeout: requests.post(url, headers=headers, json=payload, timeout=timeout, stream=stream),
+            policy
+        )
+        if use_handle and response.status_code in (400, 403, 404):
+            response.close()
+            context_cache.invalidate(handle.name)
+            payload = build_payload(None)
+            response = send_with_resilience(
+                'gemini', self.model_name,
+                lambda timeout: requests.post(url, headers=headers, json=payload, timeout=timeout, stream=stream),
+                policy
+            )
+        return response
+    
+    def _response_cache_key(self, prompt: str, system_prompt: Optional[str], conversation_history: Optional[List[Dict]],
+                            static_context: Optional[str], generation_config: Dict[str, Any],
+                            cache: bool) -> Optional[str]:
+        """Çağrı yanıt önbelleğine uygunsa anahtarı, değilse None döner."""
+        if not response_cache.applies(self.model_name, self.temperature, cache):
+            return None
+        return response_cache.key_for('gemini', self.model_name, generation_config, prompt,
+                                      conversation_history, "\n".join(filter(None, [system_prompt, static_context])))
+    
     def generate_content(self, prompt: str, system_prompt: str = None, 
-                        conversation_history: List[Dict] = None) -> Dict[str, Any]:
+                        conversation_history: List[Dict] = None, cache: bool = False,
+                        static_context: str = None) -> Dict[str, Any]:
         """
         Gemini'den içerik üret
+        
+        system_prompt native systemInstruction olarak gönderilir. static_context,
+        istekler arasında değişmeyen büyük bağlamdır (örn. katalog); context cache
+        açıksa provider'a bir kez yüklenip cachedContent ile referanslanır.
+        cache=True (veya temperature 0) ise aynı model/parametre/bağlam için
+        önbellekteki yanıt döner ("cached": True).
         """
         if not self.api_key:
             raise ValueError("API anahtarı ayarlanmamış")
             
         try:
-            # Konuşma geçmişini hazırla
-            contents = []
+            generation_config = self._generation_config()
+            cache_key = self._response_cache_key(prompt, system_prompt, conversation_history, static_context,
+                                                 generation_config, cache)
+            cached = response_cache.get(cache_key)
+            if cached:
+                return cached
             
-            # Sistem mesajı varsa ekle
-            if system_prompt:
-                contents.append({
-                    "role": "user",
-                    "parts": [{"text": system_prompt}]
-                })
-                contents.append({
-                    "role": "model",
-                    "parts": [{"text": "Anladım, sistem talimatlarını aldım."}]
-                })
-            
-            # Konuşma geçmişini ekle
-            if conversation_history:
-                for message in conversation_history:
-                    role = "user" if message.get("is_user", True) else "model"
-                    contents.append({
-                        "role": role,
-                        "parts": [{"text": message.get("content", "")}] 
-                    })
-            
-            # Mevcut mesajı ekle
-            contents.append({
-                "role": "user",
-                "parts": [{"text": prompt}]
-            })
+            # Sabit önek provider'da önbellekteyse referansla gönderilir
+            handle = context_cache.get_handle(self.api_key, self.model_name, system_prompt, static_context) \
+                if (system_prompt or static_context) else None
             
             # API isteği hazırla
             url = f"{self.base_url}/models/{self.model_name}:generateContent"
@@ -96,25 +196,14 @@ class GeminiService:
                 "x-goog-api-key": self.api_key
             }
             
-            payload = {
-                "contents": contents,
-                "generationConfig": {
-                    "maxOutputTokens": self.max_tokens,
-                    "temperature": self.temperature,
-                    "topP": self.top_p,
-                    "topK": self.top_k
-                },
-                "safetySettings": [
-                    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"}
-                ]
-            }
-            
             # silent request; no logging
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = self._post(
+                url, headers,
+                lambda cached_content: self._build_payload(prompt, system_prompt, conversation_history, static_context,
+                                                           generation_config, cached_content),
+                handle
+            )
             response.raise_for_status()
             
             result = response.json()
@@ -125,7 +214,7 @@ class GeminiService:
                 if "content" in candidate and "parts" in candidate["content"]:
                     generated_text = candidate["content"]["parts"][0].get("text", "")
                     
-                    return {
+                    generated = {
                         "success": True,
                         "content": generated_text,
                         "model": self.model_name,
@@ -133,6 +222,8 @@ class GeminiService:
                         "finish_reason": candidate.get("finishReason", "STOP"),
                         "timestamp": datetime.now().isoformat()
                     }
+                    response_cache.put(cache_key, generated)
+                    return generated
                 else:
                     return {"success": False, "error": "Geçersiz yanıt formatı", "raw_response": result}
             else:
@@ -141,19 +232,112 @@ class GeminiService:
         except requests.exceptions.Timeout:
             return {"success": False, "error": "API isteği zaman aşımına uğradı"}
         except requests.exceptions.RequestException as e:
-            return {"success": False, "error": f"API isteği hatası: {str(e)}"}
+            return {"success": False, "error": f"API isteği hatası: {str(e)}", **http_error_details(e)}
         except Exception as e:
             return {"success": False, "error": f"Beklenmeyen hata: {str(e)}"}
     
+    def stream_content(self, prompt: str, system_prompt: str = None, conversation_history: List[Dict] = None,
+                       static_context: str = None, on_response=None, cache: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        streamGenerateContent (SSE) ile içeriği parça parça üretir.
+        
+        Olaylar: {"type": "delta", "text": ...} ve son olarak
+        {"type": "done", "usage": ..., "finish_reason": ...} veya {"type": "error", ...}.
+        on_response(response) upstream yanıtı okunmaya başlamadan çağrılır; çağıran
+        taraf yanıtı başka bir thread'den kapatarak üretimi iptal edebilir.
+        Yanıt önbelleği generate_content ile aynıdır: isabette upstream açılmaz,
+        yanıt tek delta olarak verilir; tamamlanan akış önbelleğe yazılır.
+        """
+        if not self.api_key:
+            raise ValueError("API anahtarı ayarlanmamış")
+        # Paylaşılan servis durumu üretim sürerken değişebilir; istek parametrelerini şimdi sabitle
+        api_key, model_name = self.api_key, self.model_name
+        generation_config = self._generation_config()
+        cache_key = self._response_cache_key(prompt, system_prompt, conversation_history, static_context,
+                                             generation_config, cache)
+        cached = response_cache.get(cache_key)
+        if cached:
+            return replay_cached(cached)
+        handle = context_cache.get_handle(api_key, model_name, system_prompt, static_context) \
+            if (system_prompt or static_context) else None
+        url = f"{self.base_url}/models/{model_name}:streamGenerateContent?alt=sse"
+        headers = {"Content-Type": "application/json", "x-goog-api-key": api_key}
+        build_payload = lambda cached_content: self._build_payload(
+            prompt, system_prompt, conversation_history, static_context, generation_config, cached_content)
+        
+        def events() -> Iterator[Dict[str, Any]]:
+            response = None
+            try:
+                response = self._post(url, headers, build_payload, handle, stream=True)
+                if on_response:
+                    on_response(response)
+                response.raise_for_status()
+                # Yalnızca provider son adayı (finishReason) gönderdiyse akış tamamlanmıştır
+                usage, finish_reason = {}, None
+                parts: List[str] = []
+                for chunk in iter_sse_data(response):
+                    usage = chunk.get("usageMetadata") or usage
+                    for candidate in chunk.get("candidates") or []:
+                        finish_reason = candidate.get("finishReason") or finish_reason
+                        for part in (candidate.get("content") or {}).get("parts") or []:
+                            if part.get("text"):
+                                parts.append(part["text"])
+                                yield {"type": "delta", "text": part["text"]}
+                # İptalle kapatılan / yarıda kopan akış kısmi metni önbelleğe yazmasın
+                if finish_reason:
+                    response_cache.put(cache_key, {
+                        "success": True, "content": "".join(parts), "model": model_name,
+                        "usage": usage, "finish_reason": finish_reason, "timestamp": datetime.now().isoformat()
+                    })
+                yield {"type": "done", "model": model_name, "usage": usage, "finish_reason": finish_reason}
+            except requests.exceptions.Timeout:
+                yield {"type": "error", "error": "API isteği zaman aşımına uğradı"}
+            except requests.exceptions.RequestException as e:
+                yield {"type": "error", "error": f"API isteği hatası: {str(e)}", **http_error_details(e)}
+            except Exception as e:
+                yield {"type": "error", "error": f"Beklenmeyen hata: {str(e)}"}
+            finally:
+                if response is not None:
+                    response.close()
+        
+        return events()
+    
+    def probe(self, api_key: str = None, model_name: str = None) -> Dict[str, Any]:
+        """
+        Hafif sağlık kontrolü: içerik üretmeden model metadata uç noktasını çağırır
+        (GET /models/{model}). Paylaşılan servis durumunu değiştirmemek için anahtar
+        ve model parametre olarak verilebilir.
+        """
+        api_key = api_key or self.api_key
+        model_name = model_name or self.model_name
+        if not api_key:
+            return {"success": False, "error": "API anahtarı ayarlanmamış"}
+        started = time.monotonic()
+        try:
+            response = requests.get(
+                f"{self.base_url}/models/{model_name}",
+                headers={"x-goog-api-key": api_key},
+                timeout=PROBE_TIMEOUT
+            )
+            latency_ms = int((time.monotonic() - started) * 1000)
+            if response.status_code >= 400:
+                return {"success": False, "error": f"HTTP {response.status_code}", "status_code": response.status_code,
+                        "latency_ms": latency_ms, "model": model_name}
+            return {"success": True, "latency_ms": latency_ms, "model": model_name}
+        except requests.exceptions.RequestException as e:
+            return {"success": False, "error": f"API isteği hatası: {str(e)}",
+                    "latency_ms": int((time.monotonic() - started) * 1000), "model": model_name}
+    
     def test_connection(self) -> Dict[str, Any]:
-        """Gemini API bağlantısını test et"""
+        """Gemini API bağlantısını test et (içerik üretmeden, model metadata ile)"""
         if not self.api_key:
             return {"success": False, "error": "API anahtarı ayarlanmamış"}
             
         try:
-            result = self.generate_content("Merhaba, nasılsın?")
+            result = self.probe()
             if result.get("success"):
-                return {"success": True, "message": "Gemini API bağlantısı başarılı", "model": self.model_name}
+                return {"success": True, "message": "Gemini API bağlantısı başarılı", "model": self.model_name,
+                        "latency_ms": result.get("latency_ms")}
             else:
                 return {"success": False, "error": result.get("error", "Bilinmeyen hata")}
         except Exception as e:
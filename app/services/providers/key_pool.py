@@ -0,0 +1,170 @@
+# =============================================================================
+# API KEY POOL (Providers)
+# =============================================================================
+# Bir model/provider için birden fazla API anahtarı arasında yük dağıtımı:
+# - least_loaded (varsayılan) veya round_robin seçim
+# - 429 / kota hatası veren anahtarlar geçici olarak havuzdan çıkarılır
+#   (tekrarlayan hatalarda süre katlanarak uzar)
+# - Anahtar bazında kullanım ve sağlık bilgisi tutulur
+# Anahtarın kendisi yerine kısa hash'i saklanır/raporlanır.
+# =============================================================================
+
+import os
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.services.providers.metrics import provider_metrics
+
+# Anahtarı geçici olarak devre dışı bırakan durum kodları (429: hız, 402: kredi/kota)
+EJECT_STATUS = {402, 429}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def key_id(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+
+class KeyHealth:
+    """Tek bir anahtarın kullanım ve sağlık durumu."""
+
+    def __init__(self):
+        self.inflight = 0
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+        self.consecutive_ejections = 0
+        self.ejected_until = 0.0
+        self.last_used = 0.0
+        self.last_status: Optional[int] = None
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            'inflight': self.inflight,
+            'requests': self.requests,
+            'errors': self.errors,
+            'ejections': self.ejections,
+            'ejected': self.is_ejected(now),
+            'ejected_for': round(max(0.0, self.ejected_until - now), 1),
+            'last_status': self.last_status,
+        }
+
+
+class ApiKeyPool:
+    """
+    Anahtar havuzları için seçim ve sağlık takibi.
+    Sağlık anahtar bazında globaldir; round-robin sırası havuz bazındadır.
+    """
+
+    def __init__(self, strategy: Optional[str] = None):
+        self.strategy = (strategy or os.getenv('KEY_POOL_STRATEGY', 'least_loaded')).lower()
+        self.base_eject = _env_float('KEY_POOL_EJECT_SECONDS', 60)
+        self.max_eject = _env_float('KEY_POOL_MAX_EJECT_SECONDS', 900)
+        self._health: Dict[str, KeyHealth] = {}
+        self._rr: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _h(self, api_key: str) -> KeyHealth:
+        kid = key_id(api_key)
+        health = self._health.get(kid)
+        if health is None:
+            health = self._health[kid] = KeyHealth()
+        return health
+
+    def select(self, pool_id: str, keys: List[str], exclude: Iterable[str] = ()) -> Optional[str]:
+        """
+        Havuzdan bir anahtar seçer. Tüm anahtarlar çıkarılmışsa en erken
+        dönecek olanı döndürür (istek tamamen reddedilmesin).
+        """
+        excluded = set(exclude)
+        candidates = [k for k in dict.fromkeys(keys) if k and k not in excluded]
+        if not candidates:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            healthy = [k for k in candidates if not self._h(k).is_ejected(now)]
+            if not healthy:
+                return min(candidates, key=lambda k: self._h(k).ejected_until)
+            start = self._rr.get(pool_id, 0)
+            self._rr[pool_id] = start + 1
+            # Round-robin sırası, least_loaded'da eşitlik bozucu olarak da kullanılır
+            ordered = healthy[start % len(healthy):] + healthy[:start % len(healthy)]
+            if self.strategy == 'round_robin':
+                return ordered[0]
+            return min(ordered, key=lambda k: self._h(k).inflight)
+
+    def acquire(self, api_key: str) -> None:
+        with self._lock:
+            health = self._h(api_key)
+            health.inflight += 1
+            health.requests += 1
+            health.last_used = time.monotonic()
+
+    def release(self, api_key: str, ok: bool, status_code: Optional[int] = None,
+                retry_after: Optional[float] = None) -> None:
+        """Çağrı sonucunu kaydeder; 429/kota hatasında anahtarı geçici olarak çıkarır."""
+        now = time.monotonic()
+        with self._lock:
+            health = self._h(api_key)
+            health.inflight = max(0, health.inflight - 1)
+            health.last_status = status_code
+            if ok:
+                health.consecutive_ejections = 0
+                return
+            health.errors += 1
+            if status_code in EJECT_STATUS:
+                health.consecutive_ejections += 1
+                health.ejections += 1
+                duration = min(self.max_eject, self.base_eject * (2 ** (health.consecutive_ejections - 1)))
+                if retry_after:
+                    duration = max(duration, min(self.max_eject, retry_after))
+                health.ejected_until = now + duration
+                provider_metrics.incr('key_pool', key_id(api_key), 'ejected')
+
+    @contextmanager
+    def lease(self, api_key: str):
+        """acquire/release sarmalayıcısı; sonuç lease.report(...) ile bildirilir."""
+        lease = _KeyLease(self, api_key)
+        self.acquire(api_key)
+        try:
+            yield lease
+        finally:
+            lease.finish()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [dict(key=kid, **h.to_dict(now)) for kid, h in self._health.items()]
+
+
+class _KeyLease:
+    def __init__(self, pool: ApiKeyPool, api_key: str):
+        self._pool = pool
+        self._api_key = api_key
+        self._ok = False
+        self._status_code: Optional[int] = None
+        self._retry_after: Optional[float] = None
+
+    def report(self, result: Dict[str, Any]) -> None:
+        """Provider sonuç sözlüğünden başarı/durum kodu bilgisini alır."""
+        self._ok = bool(result.get('success'))
+        self._status_code = result.get('status_code')
+        self._retry_after = result.get('retry_after')
+
+    def finish(self) -> None:
+        self._pool.release(self._api_key, self._ok, self._status_code, self._retry_after)
+
+
+# Uygulama genelinde paylaşılan örnek
+api_key_pool = ApiKeyPool()
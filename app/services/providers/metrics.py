@@ -0,0 +1,126 @@
+# =============================================================================
+# PROVIDER METRICS (Providers)
+# =============================================================================
+# Provider çağrıları için süreç içi metrikler: deneme sayaçları ve
+# (provider, model) bazında kayan gecikme örnekleri (p50/p95/p99).
+# =============================================================================
+
+import time
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ProviderMetrics:
+    """
+    Provider denemelerini kaydeden thread-safe metrik deposu.
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._latencies: Dict[Tuple[str, str], deque] = {}
+        self._counters: Dict[Tuple[str, str, str], int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._observations: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record_attempt(self, provider: str, model: Optional[str], outcome: str, latency: float,
+                       attempt: int = 1, hedged: bool = False) -> None:
+        """
+        Tek bir HTTP denemesini kaydeder.
+
+        Args:
+            provider: Provider adı ('gemini', 'openrouter', ...)
+            model: İstek yapılan model kimliği
+            outcome: 'success', 'http_429', 'http_503', 'timeout', 'error', ...
+            latency: Saniye cinsinden süre
+            attempt: Kaçıncı deneme (1'den başlar)
+            hedged: Hedge (yedek) isteği mi
+        """
+        key = (provider, model or '')
+        with self._lock:
+            self._bump(provider, model, f'attempt.{outcome}')
+            if attempt > 1:
+                self._bump(provider, model, 'attempt.retry')
+            if hedged:
+                self._bump(provider, model, 'attempt.hedged')
+            if outcome == 'success':
+                samples = self._latencies.get(key)
+                if samples is None:
+                    samples = self._latencies[key] = deque(maxlen=self.window)
+                samples.append(latency)
+
+    def _bump(self, provider: str, model: Optional[str], name: str, value: int = 1) -> None:
+        key = (provider, model or '', name)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def incr(self, provider: str, model: Optional[str], name: str, value: int = 1) -> None:
+        with self._lock:
+            self._bump(provider, model, name, value)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Genel amaçlı örnek kaydı (örn. kuyruk bekleme süresi)."""
+        with self._lock:
+            samples = self._observations.get(name)
+            if samples is None:
+                samples = self._observations[name] = deque(maxlen=self.window)
+            samples.append(value)
+
+    @staticmethod
+    def _quantile(samples: List[float], q: float) -> Optional[float]:
+        if not samples:
+            return None
+        samples = sorted(samples)
+        return samples[min(len(samples) - 1, max(0, int(round(q * (len(samples) - 1)))))]
+
+    def percentile(self, provider: str, model: Optional[str], q: float, min_samples: int = 1) -> Optional[float]:
+        """Başarılı denemelerin gecikme yüzdeliğini döndürür (yeterli örnek yoksa None)."""
+        with self._lock:
+            samples = list(self._latencies.get((provider, model or ''), ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return self._quantile(samples, q)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Admin/izleme için metriklerin anlık görüntüsü."""
+        with self._lock:
+            counters = dict(self._counters)
+            latency_keys = list(self._latencies.keys())
+            gauges = dict(self._gauges)
+            observations = {name: list(samples) for name, samples in self._observations.items()}
+        models: Dict[str, Dict[str, Any]] = {}
+        for (provider, model, name), value in counters.items():
+            entry = models.setdefault(f"{provider}:{model}", {'provider': provider, 'model': model, 'counters': {}})
+            entry['counters'][name] = value
+        for provider, model in latency_keys:
+            entry = models.setdefault(f"{provider}:{model}", {'provider': provider, 'model': model, 'counters': {}})
+            entry['latency'] = {
+                'p50': self.percentile(provider, model, 0.50),
+                'p95': self.percentile(provider, model, 0.95),
+                'p99': self.percentile(provider, model, 0.99),
+            }
+        observed = {
+            name: {
+                'count': len(samples),
+                'p50': self._quantile(samples, 0.50),
+                'p95': self._quantile(samples, 0.95),
+                'max': max(samples) if samples else None,
+            }
+            for name, samples in observations.items()
+        }
+        return {'models': list(models.values()), 'gauges': gauges, 'observations': observed, 'timestamp': time.time()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+
+
+# Uygulama genelinde paylaşılan örnek
+provider_metrics = ProviderMetrics()
@@ -4,11 +4,20 @@
 # OpenRouter entegrasyonu. app.services.providers altına taşındı.
 # =============================================================================
 
+import copy
 import requests
 import json
 import os
+import time
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator
+from app.services.providers.resilience import send_with_resilience, http_error_details
+from app.services.providers.response_cache import response_cache
+from app.services.providers.catalog_cache import catalog_cache
+from app.services.providers.streaming import STREAM_POLICY, iter_sse_data, replay_cached
+
+# Sağlık kontrolü (probe) zaman aşımı: (bağlantı, okuma) sn
+PROBE_TIMEOUT = (3, 5)
 
 class OpenRouterService:
     """OpenRouter API servisi"""
@@ -32,28 +41,69 @@ class OpenRouterService:
     def set_model(self, model: str):
         self.model = model
         
+    def configured(self, api_key: str, model: str = None) -> 'OpenRouterService':
+        """Bu çağrıya özel anahtar/model ile yapılandırılmış kopya (paylaşılan örnek değişmez)."""
+        service = copy.copy(self)
+        service.api_key = api_key
+        if model:
+            service.model = model
+        return service
+        
     def set_site_info(self, site_url: str = None, site_name: str = None):
         if site_url:
             self.site_url = site_url
         if site_name:
             self.site_name = site_name
     
+    def probe(self, api_key: str = None, model: str = None) -> Dict[str, Any]:
+        """
+        Hafif sağlık kontrolü: içerik üretmeden anahtarı (GET /auth/key) ve modelin
+        katalogda olduğunu (önbellekli /models) doğrular.
+        """
+        api_key = api_key or self.api_key
+        model = model or self.model
+        if not api_key:
+            return {"success": False, "error": "API anahtarı tanımlanmamış"}
+        started = time.monotonic()
+        try:
+            response = requests.get(
+                f"{self.base_url}/auth/key",
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=PROBE_TIMEOUT
+            )
+            latency_ms = int((time.monotonic() - started) * 1000)
+            if response.status_code >= 400:
+                return {"success": False, "error": f"HTTP {response.status_code}", "status_code": response.status_code,
+                        "latency_ms": latency_ms, "model": model}
+            if model and not catalog_cache.lookup('openrouter', api_key, lambda: self._fetch_models(api_key), model):
+                return {"success": False, "error": "Model katalogda bulunamadı", "latency_ms": latency_ms, "model": model}
+            return {"success": True, "latency_ms": latency_ms, "model": model}
+        except requests.exceptions.RequestException as e:
+            return {"success": False, "error": f"API isteği hatası: {str(e)}",
+                    "latency_ms": int((time.monotonic() - started) * 1000), "model": model}
+    
     def test_connection(self) -> Dict[str, Any]:
         try:
             if not self.api_key:
                 return {"success": False, "error": "API anahtarı tanımlanmamış"}
-            test_result = self.generate_content(prompt="Test", conversation_history=[])
-            return {"success": test_result["success"], "message": "OpenRouter bağlantısı başarılı" if test_result["success"] else "Bağlantı hatası", "error": test_result.get("error")}
+            test_result = self.probe()
+            return {"success": test_result["success"], "message": "OpenRouter bağlantısı başarılı" if test_result["success"] else "Bağlantı hatası", "error": test_result.get("error"), "latency_ms": test_result.get("latency_ms")}
         except Exception as e:
             return {"success": False, "error": f"Bağlantı testi hatası: {str(e)}"}
     
     def get_available_models(self) -> List[Dict[str, Any]]:
+        """Model listesini önbellekten döndürür (TTL + arka plan yenileme)."""
+        if not self.api_key:
+            return []
+        api_key = self.api_key
+        return catalog_cache.get_models('openrouter', api_key, lambda: self._fetch_models(api_key))
+
+    def _fetch_models(self, api_key: str) -> List[Dict[str, Any]]:
+        """/models listesini doğrudan provider'dan indirir."""
         try:
-            if not self.api_key:
-                return []
             url = f"{self.base_url}/models"
-            headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
-            response = requests.get(url, headers=headers)
+            headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+            response = requests.get(url, headers=headers, timeout=30)
             response.raise_for_status()
             data = response.json()
             models = []
@@ -70,35 +120,65 @@ class OpenRouterService:
         except Exception as e:
             return []
     
+    def _build_request(self, prompt: str, conversation_history: Optional[List[Dict]], kwargs: Dict[str, Any]):
+        """chat/completions için (url, headers, data) üretir."""
+        messages = []
+        # Sistem talimatı native "system" rolüyle; sabit bağlam ilk kullanıcı turu olarak
+        # gönderilir (değişmeyen önek, provider tarafı prefix cache'ten yararlanır)
+        system_prompt = kwargs.get("system_prompt")
+        static_context = kwargs.get("static_context")
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        if static_context:
+            messages.append({"role": "user", "content": static_context})
+        if conversation_history:
+            for msg in conversation_history:
+                role = "user" if msg.get("is_user", True) else "assistant"
+                messages.append({"role": role, "content": msg.get("content", "")})
+        messages.append({"role": "user", "content": prompt})
+        url = f"{self.base_url}/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": self.site_url,
+            "X-Title": self.site_name
+        }
+        data = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": kwargs.get("temperature", 0.7),
+            "max_tokens": kwargs.get("max_tokens", 2000),
+            "top_p": kwargs.get("top_p", 0.9),
+            "frequency_penalty": kwargs.get("frequency_penalty", 0),
+            "presence_penalty": kwargs.get("presence_penalty", 0)
+        }
+        data = {k: v for k, v in data.items() if v is not None}
+        return url, headers, data
+    
+    def _response_cache_key(self, prompt: str, conversation_history: Optional[List[Dict]], data: Dict[str, Any],
+                            kwargs: Dict[str, Any]) -> Optional[str]:
+        """Çağrı yanıt önbelleğine uygunsa anahtarı, değilse None döner."""
+        if not response_cache.applies(self.model, data.get("temperature"), kwargs.get("cache", False)):
+            return None
+        params = {k: v for k, v in data.items() if k not in ("model", "messages", "stream")}
+        return response_cache.key_for('openrouter', self.model, params, prompt, conversation_history,
+                                      "\n".join(filter(None, [kwargs.get("system_prompt"), kwargs.get("static_context")])))
+    
     def generate_content(self, prompt: str, conversation_history: List[Dict] = None, **kwargs) -> Dict[str, Any]:
         try:
             if not self.api_key:
                 return {"success": False, "error": "API anahtarı tanımlanmamış"}
             if not self.model:
                 return {"success": False, "error": "Model tanımlanmamış"}
-            messages = []
-            if conversation_history:
-                for msg in conversation_history:
-                    role = "user" if msg.get("is_user", True) else "assistant"
-                    messages.append({"role": role, "content": msg.get("content", "")})
-            messages.append({"role": "user", "content": prompt})
-            url = f"{self.base_url}/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": self.site_url,
-                "X-Title": self.site_name
-            }
-            data = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": kwargs.get("temperature", 0.7),
-                "max_tokens": kwargs.get("max_tokens", 2000),
-                "top_p": kwargs.get("top_p", 0.9),
-                "frequency_penalty": kwargs.get("frequency_penalty", 0),
-                "presence_penalty": kwargs.get("presence_penalty", 0)
-            }
-            data = {k: v for k, v in data.items() if v is not None}
+            system_prompt = kwargs.get("system_prompt")
+            static_context = kwargs.get("static_context")
+            url, headers, data = self._build_request(prompt, conversation_history, kwargs)
+            messages = data["messages"]
+            # temperature 0 veya cache=True ise aynı model/parametre/bağlam için önbellekteki yanıt döner
+            cache_key = self._response_cache_key(prompt, conversation_history, data, kwargs)
+            cached = response_cache.get(cache_key)
+            if cached:
+                return cached
             # Optional safe debug log
             if self.debug:
                 try:
@@ -113,7 +193,10 @@ class OpenRouterService:
                 except Exception:
                     pass
 
-            response = requests.post(url=url, headers=headers, json=data)
+            response = send_with_resilience(
+                'openrouter', self.model,
+                lambda timeout: requests.post(url=url, headers=headers, json=data, timeout=timeout)
+            )
             if self.debug:
                 try:
                     logging.warning("[OpenRouter] Response status=%s", response.status_code)
@@ -130,7 +213,7 @@ class OpenRouterService:
             if "choices" in result and len(result["choices"]) > 0:
                 content = result["choices"][0]["message"]["content"]
                 usage = result.get("usage", {})
-                return {
+                generated = {
                     "success": True,
                     "content": content,
                     "usage": {
@@ -141,20 +224,95 @@ class OpenRouterService:
                     "model": self.model,
                     "provider": "OpenRouter"
                 }
+                response_cache.put(cache_key, generated)
+                return generated
             else:
                 return {"success": False, "error": "Geçersiz yanıt formatı"}
         except requests.exceptions.RequestException as e:
-            return {"success": False, "error": f"API isteği hatası: {str(e)}"}
+            return {"success": False, "error": f"API isteği hatası: {str(e)}", **http_error_details(e)}
         except Exception as e:
             return {"success": False, "error": f"İçerik oluşturma hatası: {str(e)}"}
     
+    def stream_content(self, prompt: str, conversation_history: List[Dict] = None, on_response=None,
+                       **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        chat/completions'ı "stream": true ile çağırır ve içeriği parça parça üretir.
+        
+        Olaylar: {"type": "delta", "text": ...} ve son olarak
+        {"type": "done", "usage": ..., "finish_reason": ...} veya {"type": "error", ...}.
+        on_response(response) upstream yanıtı okunmaya başlamadan çağrılır; çağıran
+        taraf yanıtı başka bir thread'den kapatarak üretimi iptal edebilir.
+        Yanıt önbelleği generate_content ile aynıdır: isabette upstream açılmaz,
+        yanıt tek delta olarak verilir; tamamlanan akış önbelleğe yazılır.
+        """
+        if not self.api_key:
+            raise ValueError("API anahtarı tanımlanmamış")
+        if not self.model:
+            raise ValueError("Model tanımlanmamış")
+        # Paylaşılan servis durumu üretim sürerken değişebilir; isteği şimdi oluştur
+        model = self.model
+        url, headers, data = self._build_request(prompt, conversation_history, kwargs)
+        cache_key = self._response_cache_key(prompt, conversation_history, data, kwargs)
+        cached = response_cache.get(cache_key)
+        if cached:
+            return replay_cached(cached)
+        data["stream"] = True
+        
+        def events() -> Iterator[Dict[str, Any]]:
+            response = None
+            try:
+                response = send_with_resilience(
+                    'openrouter', model,
+                    lambda timeout: requests.post(url=url, headers=headers, json=data, timeout=timeout, stream=True),
+                    STREAM_POLICY
+                )
+                if on_response:
+                    on_response(response)
+                response.raise_for_status()
+                usage, finish_reason = {}, None
+                parts: List[str] = []
+                for chunk in iter_sse_data(response):
+                    if chunk.get("error"):
+                        # Akış başladıktan sonra oluşan provider hatası
+                        error = chunk["error"]
+                        yield {"type": "error", "error": error.get("message") if isinstance(error, dict) else str(error)}
+                        return
+                    usage = chunk.get("usage") or usage
+                    for choice in chunk.get("choices") or []:
+                        finish_reason = choice.get("finish_reason") or finish_reason
+                        text = (choice.get("delta") or {}).get("content")
+                        if text:
+                            parts.append(text)
+                            yield {"type": "delta", "text": text}
+                usage = {
+                    "prompt_tokens": usage.get("prompt_tokens", 0),
+                    "completion_tokens": usage.get("completion_tokens", 0),
+                    "total_tokens": usage.get("total_tokens", 0)
+                }
+                # İptalle kapatılan / yarıda kopan akışta finish_reason gelmez; kısmi metin saklanmaz
+                if finish_reason:
+                    response_cache.put(cache_key, {
+                        "success": True, "content": "".join(parts), "usage": usage,
+                        "model": model, "provider": "OpenRouter", "finish_reason": finish_reason
+                    })
+                yield {"type": "done", "model": model, "usage": usage, "finish_reason": finish_reason}
+            except requests.exceptions.RequestException as e:
+                yield {"type": "error", "error": f"API isteği hatası: {str(e)}", **http_error_details(e)}
+            except Exception as e:
+                yield {"type": "error", "error": f"İçerik oluşturma hatası: {str(e)}"}
+            finally:
+                if response is not None:
+                    response.close()
+        
+        return events()
+    
     def get_model_info(self, model_name: str) -> Dict[str, Any]:
         try:
-            models = self.get_available_models()
-            for model in models:
-                if model["id"] == model_name or model["name"] == model_name:
-                    return model
-            return {}
+            if not self.api_key:
+                return {}
+            api_key = self.api_key
+            model = catalog_cache.lookup('openrouter', api_key, lambda: self._fetch_models(api_key), model_name)
+            return model or {}
         except Exception as e:
             return {}
     
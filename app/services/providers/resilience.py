@@ -0,0 +1,234 @@
+# =============================================================================
+# PROVIDER RESILIENCE (Providers)
+# =============================================================================
+# Provider HTTP çağrıları için dayanıklılık katmanı:
+# - Geçici hatalarda (429, 5xx, timeout, bağlantı hatası) sınırlı sayıda
+#   üstel geri çekilme + jitter ile yeniden deneme
+# - Retry-After başlığına uyma
+# - Deneme başına (connect, read) timeout ve toplam süre sınırı
+# - Opsiyonel hedging: p95 gecikme aşılınca ikinci istek, ilk dönen kazanır
+# Her deneme provider_metrics üzerine kaydedilir.
+# =============================================================================
+
+import os
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait, TimeoutError as FutureTimeout
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+
+import requests
+
+from app.services.providers.metrics import provider_metrics
+from app.services.providers.circuit_breaker import circuit_breakers
+
+# Yeniden denenebilir HTTP durum kodları
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    return str(os.getenv(name, '1' if default else '0')).lower() in ('1', 'true', 'yes', 'on')
+
+
+class RetryPolicy:
+    """
+    Yeniden deneme / timeout / hedging ayarları.
+    Verilmeyen değerler ortam değişkenlerinden (PROVIDER_*) okunur.
+    """
+
+    def __init__(self, max_retries: Optional[int] = None, backoff_base: Optional[float] = None,
+                 backoff_max: Optional[float] = None, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None, max_retry_after: Optional[float] = None,
+                 deadline: Optional[float] = None, hedge: Optional[bool] = None,
+                 hedge_quantile: float = 0.95, hedge_min_samples: Optional[int] = None):
+        self.max_retries = int(max_retries if max_retries is not None else _env_float('PROVIDER_MAX_RETRIES', 2))
+        self.backoff_base = backoff_base if backoff_base is not None else _env_float('PROVIDER_BACKOFF_BASE', 0.5)
+        self.backoff_max = backoff_max if backoff_max is not None else _env_float('PROVIDER_BACKOFF_MAX', 8)
+        self.connect_timeout = connect_timeout if connect_timeout is not None else _env_float('PROVIDER_CONNECT_TIMEOUT', 5)
+        self.read_timeout = read_timeout if read_timeout is not None else _env_float('PROVIDER_READ_TIMEOUT', 60)
+        self.max_retry_after = max_retry_after if max_retry_after is not None else _env_float('PROVIDER_MAX_RETRY_AFTER', 20)
+        self.deadline = deadline if deadline is not None else _env_float('PROVIDER_DEADLINE', 120)
+        self.hedge = hedge if hedge is not None else _env_bool('PROVIDER_HEDGE', False)
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = int(hedge_min_samples if hedge_min_samples is not None else _env_float('PROVIDER_HEDGE_MIN_SAMPLES', 20))
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: [0, min(max, base * 2^(attempt-1))] aralığında rastgele bekleme."""
+        cap = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempt - 1)))
+        return random.uniform(0, cap)
+
+    def hedge_delay(self, provider: str, model: Optional[str]) -> Optional[float]:
+        """Hedge isteğinin ne zaman atılacağı (yeterli örnek yoksa None)."""
+        if not self.hedge:
+            return None
+        return provider_metrics.percentile(provider, model, self.hedge_quantile, min_samples=self.hedge_min_samples)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After başlığını (saniye veya HTTP tarihi) saniyeye çevirir."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
+
+
+def http_error_details(exc: Exception) -> dict:
+    """RequestException'dan durum kodu ve Retry-After bilgisini çıkarır."""
+    response = getattr(exc, 'response', None)
+    if response is None:
+        return {}
+    return {
+        'status_code': response.status_code,
+        'retry_after': parse_retry_after(response.headers.get('Retry-After')),
+    }
+
+
+# Hedge istekleri için paylaşılan havuz; kaybeden istek arka planda tamamlanır
+_hedge_executor = ThreadPoolExecutor(
+    max_workers=int(_env_float('PROVIDER_HEDGE_WORKERS', 16)),
+    thread_name_prefix='provider-hedge'
+)
+
+SendFn = Callable[[Tuple[float, float]], requests.Response]
+
+
+def _timed_send(provider: str, model: Optional[str], send: SendFn, timeout: Tuple[float, float],
+                attempt: int, hedged: bool) -> requests.Response:
+    started = time.monotonic()
+    try:
+        response = send(timeout)
+    except requests.exceptions.Timeout:
+        provider_metrics.record_attempt(provider, model, 'timeout', time.monotonic() - started, attempt, hedged)
+        raise
+    except requests.exceptions.RequestException:
+        provider_metrics.record_attempt(provider, model, 'error', time.monotonic() - started, attempt, hedged)
+        raise
+    outcome = 'success' if response.status_code < 400 else f'http_{response.status_code}'
+    provider_metrics.record_attempt(provider, model, outcome, time.monotonic() - started, attempt, hedged)
+    return response
+
+
+def _send_attempt(provider: str, model: Optional[str], send: SendFn, timeout: Tuple[float, float],
+                  attempt: int, policy: RetryPolicy) -> requests.Response:
+    delay = policy.hedge_delay(provider, model)
+    if delay is None:
+        return _timed_send(provider, model, send, timeout, attempt, False)
+
+    primary = _hedge_executor.submit(_timed_send, provider, model, send, timeout, attempt, False)
+    try:
+        return primary.result(timeout=delay)
+    except FutureTimeout:
+        pass
+
+    hedge = _hedge_executor.submit(_timed_send, provider, model, send, timeout, attempt, True)
+    pending = {primary, hedge}
+    fallback = None
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            exc = future.exception()
+            if exc is not None:
+                error = exc
+                continue
+            response = future.result()
+            if response.status_code not in RETRYABLE_STATUS:
+                return response
+            fallback = response
+    if fallback is not None:
+        return fallback
+    raise error
+
+
+def send_with_resilience(provider: str, model: Optional[str], send: SendFn,
+                         policy: Optional[RetryPolicy] = None) -> requests.Response:
+    """
+    send(timeout) çağrısını yeniden deneme, Retry-After ve hedging ile çalıştırır.
+
+    Args:
+        provider: Metrikler için provider adı
+        model: Metrikler için model kimliği
+        send: (connect, read) timeout alıp requests.Response döndüren fonksiyon
+        policy: RetryPolicy (verilmezse ortamdan okunan varsayılan)
+
+    Returns:
+        requests.Response: Son yanıt (yeniden denenemeyen ya da denemeler bitmiş)
+
+    Raises:
+        CircuitOpenError: Provider veya model devresi açıksa
+        requests.exceptions.RequestException: Tüm denemeler istisna ile bittiyse
+    """
+    policy = policy or default_policy
+    # Devre açıksa provider'a gitmeden hemen hata ver (CircuitOpenError)
+    circuit_breakers.check(provider, model)
+    started = time.monotonic()
+    response = None
+    try:
+        response = _send_with_retries(provider, model, send, policy, started)
+        return response
+    finally:
+        # 4xx (429 hariç) çağıran tarafın hatasıdır; provider sağlığını etkilemez
+        ok = response is not None and response.status_code < 500 and response.status_code not in RETRYABLE_STATUS
+        circuit_breakers.record(provider, model, ok, time.monotonic() - started)
+
+
+def _send_with_retries(provider: str, model: Optional[str], send: SendFn, policy: RetryPolicy,
+                       started: float) -> requests.Response:
+    attempt = 0
+    response = None
+    error = None
+    while True:
+        attempt += 1
+        remaining = policy.deadline - (time.monotonic() - started)
+        timeout = (policy.connect_timeout, max(1.0, min(policy.read_timeout, remaining)))
+        try:
+            response = _send_attempt(provider, model, send, timeout, attempt, policy)
+            error = None
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            response, error = None, e
+
+        if response is not None and response.status_code not in RETRYABLE_STATUS:
+            return response
+        if attempt > policy.max_retries:
+            break
+
+        delay = policy.backoff(attempt)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                # Sunucu makul olmayan bir süre istiyorsa beklemeden dön
+                if retry_after > policy.max_retry_after:
+                    return response
+                delay = max(delay, retry_after)
+        if time.monotonic() - started + delay >= policy.deadline:
+            break
+        if response is not None:
+            # Yeniden denenecek yanıtın bağlantısını bırak (stream=True isteklerde açık kalırdı)
+            response.close()
+        time.sleep(delay)
+
+    if response is not None:
+        return response
+    raise error
+
+
+# Ortamdan okunan varsayılan politika
+default_policy = RetryPolicy()
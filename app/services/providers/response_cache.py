@@ -0,0 +1,159 @@
+# =============================================================================
+# RESPONSE CACHE (Providers)
+# =============================================================================
+# Deterministik istekler için tamamlama (completion) önbelleği.
+# - Anahtar: (provider, request_model_name, örnekleme parametreleri,
+#   normalize edilmiş bağlam) üzerinden SHA-256
+# - Yalnızca temperature == 0 iken veya çağıran açıkça istediğinde devreye girer
+# - LRU + TTL tahliye, kayıt sayısı ve toplam boyut sınırı
+# - Model bazında etkinleştirme (RESPONSE_CACHE_MODELS)
+# Önbellekten dönen yanıtlar "cached": True ile işaretlenir.
+# =============================================================================
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.providers.metrics import provider_metrics
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _normalize_text(text: Any) -> str:
+    # Baştaki/sondaki boşluklar ve ardışık boşluklar yanıtı değiştirmez; anahtara katma
+    return ' '.join(str(text or '').split())
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU + TTL completion önbelleği.
+
+    Kullanım:
+        key = response_cache.key_for('gemini', model, params, prompt, history, system_prompt)
+        hit = response_cache.get(key)
+        ...
+        response_cache.put(key, result)
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        self.enabled = str(os.getenv('RESPONSE_CACHE_ENABLED', '1')).lower() in ('1', 'true', 'yes', 'on')
+        self.max_entries = int(max_entries if max_entries is not None else _env_float('RESPONSE_CACHE_MAX_ENTRIES', 1000))
+        self.ttl = ttl if ttl is not None else _env_float('RESPONSE_CACHE_TTL', 3600)
+        self.max_bytes = int(max_bytes if max_bytes is not None else _env_float('RESPONSE_CACHE_MAX_BYTES', 20 * 1024 * 1024))
+        # Virgülle ayrılmış request_model_name listesi; '*' tüm modeller
+        models = os.getenv('RESPONSE_CACHE_MODELS', '*')
+        self.models = {m.strip() for m in models.split(',') if m.strip()}
+        self.disabled: set = set()
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def model_enabled(self, model: Optional[str]) -> bool:
+        if (model or '') in self.disabled:
+            return False
+        return '*' in self.models or (model or '') in self.models
+
+    def set_model_enabled(self, model: str, enabled: bool) -> None:
+        if enabled:
+            self.disabled.discard(model)
+            self.models.add(model)
+        else:
+            self.disabled.add(model)
+
+    def applies(self, model: Optional[str], temperature: Optional[float], requested: bool = False) -> bool:
+        """Bu çağrı önbelleğe uygun mu? (temperature 0 veya açık istek + model etkin)"""
+        if not self.enabled or not self.model_enabled(model):
+            return False
+        return bool(requested) or (temperature is not None and float(temperature) == 0.0)
+
+    @staticmethod
+    def key_for(provider: str, model: Optional[str], params: Dict[str, Any], prompt: str,
+                conversation_history: Optional[List[Dict[str, Any]]] = None,
+                system_prompt: Optional[str] = None) -> str:
+        context = [
+            ['user' if m.get('is_user', True) else 'model', _normalize_text(m.get('content'))]
+            for m in (conversation_history or [])
+        ]
+        material = json.dumps({
+            'p': provider,
+            'm': model,
+            'params': {k: v for k, v in sorted((params or {}).items()) if v is not None},
+            's': _normalize_text(system_prompt),
+            'c': context,
+            'q': _normalize_text(prompt),
+        }, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not key:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                provider_metrics.incr('response_cache', None, 'miss')
+                return None
+            expires_at, size, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._bytes -= size
+                provider_metrics.incr('response_cache', None, 'miss')
+                return None
+            self._entries.move_to_end(key)
+        provider_metrics.incr('response_cache', None, 'hit')
+        return dict(value, cached=True)
+
+    def put(self, key: Optional[str], result: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Yalnızca başarılı sonuçları saklar; sınırlar aşılırsa en eski kayıtları atar."""
+        if not key or not result.get('success'):
+            return
+        value = {k: v for k, v in result.items() if k != 'cached'}
+        try:
+            size = len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+        except (TypeError, ValueError):
+            return
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (expires_at, size, value)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                provider_metrics.incr('response_cache', None, 'evicted')
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'models': sorted(self.models),
+                'disabled_models': sorted(self.disabled),
+            }
+
+
+# Uygulama genelinde paylaşılan örnek
+response_cache = ResponseCache()
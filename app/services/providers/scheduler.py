@@ -0,0 +1,277 @@
+# =============================================================================
+# PROVIDER SCHEDULER (Providers)
+# =============================================================================
+# ProviderFactory servislerinin önünde çalışan zamanlayıcı:
+# - Provider ve API anahtarı bazında eşzamanlılık sınırı
+# - Provider ve API anahtarı bazında token-bucket hız sınırı
+# - Kuyrukta kullanıcı bazında adil paylaşım (round-robin)
+# - Bekleme eşiği aşılınca SchedulerRejected (-> HTTP 429 + Retry-After)
+# Kuyruk derinliği ve bekleme süreleri provider_metrics'e yazılır.
+# =============================================================================
+
+import os
+import math
+import time
+import hashlib
+import threading
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.providers.metrics import provider_metrics
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _limit(provider: str, name: str, default: float) -> float:
+    """SCHEDULER_<PROVIDER>_<NAME> varsa onu, yoksa SCHEDULER_<NAME> değerini kullanır."""
+    specific = os.getenv(f"SCHEDULER_{provider.upper()}_{name}")
+    if specific is not None:
+        try:
+            return float(specific)
+        except ValueError:
+            pass
+    return _env_float(f"SCHEDULER_{name}", default)
+
+
+class SchedulerRejected(Exception):
+    """Kuyruk bekleme eşiği aşıldı; istemci Retry-After sonra tekrar denemeli."""
+
+    def __init__(self, provider: str, retry_after: int):
+        super().__init__(f"{provider} için istek kuyruğu dolu, {retry_after} sn sonra tekrar deneyin")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Dakikalık hız ve patlama kapasitesi ile token bucket (rate <= 0 ise sınırsız)."""
+
+    def __init__(self, rate_per_min: float, burst: float):
+        self.rate = max(0.0, rate_per_min) / 60.0
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Bir token için beklenmesi gereken süre (0 ise hemen alınabilir)."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        if self.rate > 0:
+            self._refill()
+            self.tokens -= 1
+
+
+class FairQueue:
+    """Kullanıcı bazında round-robin sıralı bekleme kuyruğu."""
+
+    def __init__(self):
+        self._by_user: "OrderedDict[Any, deque]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return sum(len(q) for q in self._by_user.values())
+
+    def push(self, user: Any, ticket: object) -> None:
+        self._by_user.setdefault(user, deque()).append(ticket)
+
+    def head(self) -> Optional[object]:
+        for q in self._by_user.values():
+            return q[0]
+        return None
+
+    def position(self, ticket: object) -> int:
+        """Bileti önünde bekleyen istek sayısı (kabaca, round-robin turlarına göre)."""
+        for user, q in self._by_user.items():
+            if ticket in q:
+                idx = list(q).index(ticket)
+                return idx * len(self._by_user) + list(self._by_user.keys()).index(user)
+        return 0
+
+    def pop_head(self) -> None:
+        """Sıradaki bileti çıkarır ve kullanıcıyı turun sonuna taşır."""
+        for user in list(self._by_user.keys()):
+            q = self._by_user[user]
+            q.popleft()
+            del self._by_user[user]
+            if q:
+                self._by_user[user] = q
+            return
+
+    def remove(self, ticket: object) -> None:
+        for user in list(self._by_user.keys()):
+            q = self._by_user[user]
+            if ticket in q:
+                q.remove(ticket)
+                if not q:
+                    del self._by_user[user]
+                return
+
+
+class _Lane:
+    """Tek bir (provider, key_scope) için kuyruk, eşzamanlılık ve hız durumu."""
+
+    def __init__(self, provider: str):
+        self.queue = FairQueue()
+        self.inflight = 0
+        self.concurrency = int(_limit(provider, 'KEY_CONCURRENCY', 4))
+        self.bucket = TokenBucket(_limit(provider, 'KEY_RATE_PER_MIN', 60), _limit(provider, 'KEY_BURST', 10))
+        # Ortalama slot tutma süresi (Retry-After tahmini için EWMA)
+        self.avg_hold = 5.0
+
+
+class _Lease:
+    def __init__(self, scheduler: 'ProviderScheduler', provider: str, lane_key: Tuple[str, str]):
+        self._scheduler = scheduler
+        self._provider = provider
+        self._lane_key = lane_key
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._scheduler._release(self._provider, self._lane_key, time.monotonic() - self._started)
+
+
+class ProviderScheduler:
+    """
+    Provider çağrıları için adil paylaşımlı zamanlayıcı.
+
+    Kullanım:
+        with provider_scheduler.slot('gemini', api_key, user_id):
+            service.generate_content(...)
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._lanes: Dict[Tuple[str, str], _Lane] = {}
+        self._provider_inflight: Dict[str, int] = {}
+        self._provider_buckets: Dict[str, TokenBucket] = {}
+        self.enabled = str(os.getenv('PROVIDER_SCHEDULER', '1')).lower() in ('1', 'true', 'yes', 'on')
+        self.max_wait = _env_float('SCHEDULER_MAX_WAIT', 10)
+
+    @staticmethod
+    def _key_scope(api_key: Optional[str]) -> str:
+        if not api_key:
+            return 'anonymous'
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+    def _lane(self, provider: str, key_scope: str) -> _Lane:
+        lane = self._lanes.get((provider, key_scope))
+        if lane is None:
+            lane = self._lanes[(provider, key_scope)] = _Lane(provider)
+        return lane
+
+    def _provider_bucket(self, provider: str) -> TokenBucket:
+        bucket = self._provider_buckets.get(provider)
+        if bucket is None:
+            bucket = self._provider_buckets[provider] = TokenBucket(
+                _limit(provider, 'PROVIDER_RATE_PER_MIN', 0), _limit(provider, 'PROVIDER_BURST', 20)
+            )
+        return bucket
+
+    def _publish_depth(self, provider: str) -> None:
+        depth = sum(len(lane.queue) for (p, _), lane in self._lanes.items() if p == provider)
+        provider_metrics.set_gauge(f"scheduler.queue_depth.{provider}", depth)
+        provider_metrics.set_gauge(f"scheduler.inflight.{provider}", self._provider_inflight.get(provider, 0))
+
+    def acquire(self, provider: str, api_key: Optional[str], user_id: Any = None,
+                max_wait: Optional[float] = None) -> _Lease:
+        """
+        Provider slotu alır; gerekirse kullanıcı bazında adil kuyrukta bekler.
+
+        Raises:
+            SchedulerRejected: Bekleme süresi eşiği aşılırsa
+        """
+        provider = (provider or '').lower()
+        lane_key = (provider, self._key_scope(api_key))
+        if not self.enabled:
+            return _Lease(self, provider, lane_key)
+
+        max_wait = self.max_wait if max_wait is None else max_wait
+        provider_cap = int(_limit(provider, 'PROVIDER_CONCURRENCY', 16))
+        ticket = object()
+        started = time.monotonic()
+        with self._cond:
+            lane = self._lane(*lane_key)
+            lane.queue.push(user_id, ticket)
+            self._publish_depth(provider)
+            while True:
+                wait_for = None
+                if lane.queue.head() is ticket \
+                        and lane.inflight < lane.concurrency \
+                        and self._provider_inflight.get(provider, 0) < provider_cap:
+                    rate_wait = max(lane.bucket.wait_time(), self._provider_bucket(provider).wait_time())
+                    if rate_wait <= 0:
+                        lane.bucket.take()
+                        self._provider_bucket(provider).take()
+                        lane.queue.pop_head()
+                        lane.inflight += 1
+                        self._provider_inflight[provider] = self._provider_inflight.get(provider, 0) + 1
+                        self._publish_depth(provider)
+                        waited = time.monotonic() - started
+                        provider_metrics.observe(f"scheduler.wait.{provider}", waited)
+                        provider_metrics.incr(provider, None, 'scheduler.granted')
+                        # Sıra değişti; diğer bekleyenler tekrar kontrol etsin
+                        self._cond.notify_all()
+                        return _Lease(self, provider, lane_key)
+                    wait_for = rate_wait
+
+                remaining = max_wait - (time.monotonic() - started)
+                if remaining <= 0:
+                    ahead = lane.queue.position(ticket)
+                    lane.queue.remove(ticket)
+                    self._publish_depth(provider)
+                    self._cond.notify_all()
+                    provider_metrics.incr(provider, None, 'scheduler.rejected')
+                    provider_metrics.observe(f"scheduler.wait.{provider}", time.monotonic() - started)
+                    retry_after = max(1, int(math.ceil((ahead + 1) * lane.avg_hold / max(1, lane.concurrency))))
+                    raise SchedulerRejected(provider, retry_after)
+                self._cond.wait(min(remaining, wait_for) if wait_for else remaining)
+
+    def _release(self, provider: str, lane_key: Tuple[str, str], held: float) -> None:
+        with self._cond:
+            lane = self._lane(*lane_key)
+            lane.inflight = max(0, lane.inflight - 1)
+            lane.avg_hold = 0.8 * lane.avg_hold + 0.2 * held
+            self._provider_inflight[provider] = max(0, self._provider_inflight.get(provider, 0) - 1)
+            self._publish_depth(provider)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, provider: str, api_key: Optional[str], user_id: Any = None, max_wait: Optional[float] = None):
+        lease = self.acquire(provider, api_key, user_id, max_wait=max_wait)
+        try:
+            yield lease
+        finally:
+            lease.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'providers': {p: n for p, n in self._provider_inflight.items()},
+                'lanes': [
+                    {'provider': p, 'key_scope': k, 'queued': len(lane.queue), 'inflight': lane.inflight,
+                     'concurrency': lane.concurrency, 'avg_hold': round(lane.avg_hold, 3)}
+                    for (p, k), lane in self._lanes.items()
+                ],
+            }
+
+
+# Uygulama genelinde paylaşılan örnek
+provider_scheduler = ProviderScheduler()
@@ -0,0 +1,49 @@
+# =============================================================================
+# PROVIDER STREAMING (Providers)
+# =============================================================================
+# Provider'ların SSE (text/event-stream) yanıtlarını okumak için ortak
+# yardımcılar. Streaming istekler parça parça okunduğundan, istek iptal
+# edildiğinde yanıt başka bir thread'den kapatılarak upstream çağrısı
+# beklenmeden sonlandırılabilir.
+# =============================================================================
+
+import json
+from typing import Any, Dict, Iterator
+
+import requests
+
+from app.services.providers.resilience import RetryPolicy
+
+# Streaming isteklerde hedge yapılmaz: kaybeden yanıtın gövdesi açık kalırdı
+STREAM_POLICY = RetryPolicy(hedge=False)
+
+
+def replay_cached(result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Önbellekteki tamamlanmış yanıtı stream olayları olarak verir: içerik tek
+    bir delta, ardından "cached": True işaretli done olayı.
+    """
+    if result.get('content'):
+        yield {'type': 'delta', 'text': result['content']}
+    yield {'type': 'done', 'model': result.get('model'), 'usage': result.get('usage', {}),
+           'finish_reason': result.get('finish_reason'), 'cached': True}
+
+
+def iter_sse_data(response: requests.Response) -> Iterator[Dict[str, Any]]:
+    """
+    SSE yanıtındaki `data:` satırlarını JSON olarak döndürür.
+    Yorum satırları (':' ile başlayan) ve '[DONE]' işareti atlanır.
+    """
+    # chunk_size=None: parçalar geldiği anda okunur (varsayılan 512 bayt tamponu ilk token'ı geciktirir).
+    # text/event-stream charset belirtmezse requests ISO-8859-1 varsayar; satırlar UTF-8 çözülür.
+    for raw in response.iter_lines(chunk_size=None):
+        line = raw.decode('utf-8', errors='replace')
+        if not line or line.startswith(':') or not line.startswith('data:'):
+            continue
+        data = line[5:].strip()
+        if not data or data == '[DONE]':
+            continue
+        try:
+            yield json.loads(data)
+        except ValueError:
+            continue
@@ -5,23 +5,38 @@
 # =============================================================================
 
 import json
+import time
 from typing import Dict, Any, List
 
 from app.services.providers.gemini import GeminiService
 from app.database.db_connection import execute_query
+from app.services.telemetry_service import TelemetryService
 
 
 
 class RecommendationsService:
     def __init__(self):
         self.gemini = GeminiService()
+        # _ensure_gemini_credentials ile seçilen model satırı (telemetri için)
+        self.model: Dict[str, Any] = {}
+
+    def generate(self, **kwargs) -> Dict[str, Any]:
+        """
+        Gemini çağrısı; sohbet yolundaki gibi telemetriye kaydedilir.
+        Önbellekten dönen yanıtlar provider çağrısı olmadığı için kaydedilmez.
+        """
+        started = time.monotonic()
+        result = self.gemini.generate_content(**kwargs)
+        if not result.get('cached'):
+            TelemetryService.record_call(self.model, result, time.monotonic() - started)
+        return result
 
     def _ensure_gemini_credentials(self) -> bool:
         try:
             # Prefer explicit gemini 2.5 flash, else fallback to any gemini flash
             row = execute_query(
                 """
-                SELECT model_name, request_model_name, api_key
+                SELECT model_id, model_name, request_model_name, api_key
                 FROM models
                 WHERE LOWER(provider_type) = 'gemini' AND api_key IS NOT NULL AND api_key <> ''
                 ORDER BY
@@ -40,6 +55,12 @@ class RecommendationsService:
             model_name = row[0]['model_name']
             request_model_name = row[0].get('request_model_name') or model_name
             api_key = row[0]['api_key']
+            self.model = {
+                'model_id': row[0].get('model_id'),
+                'model_name': model_name,
+                'request_model_name': request_model_name,
+                'provider_type': 'gemini',
+            }
             self.gemini.set_api_key(api_key)
             self.gemini.set_model(request_model_name)
             # Make responses more deterministic for recommendations
@@ -108,18 +129,21 @@ class RecommendationsService:
             "- Do not include anything else than the JSON object."
         )
 
-        payload = {
+        # Katalog sorgudan bağımsız sabit önek; context cache açıksa provider'a bir kez yüklenir
+        catalog = json.dumps({
             'catalog': {
                 'models': compact_models,
                 'categories': compact_categories
-            },
-            'user_query': query
-        }
+            }
+        }, ensure_ascii=False, sort_keys=True)
 
         try:
-            result = self.gemini.generate_content(
-                prompt=json.dumps(payload, ensure_ascii=False),
-                system_prompt=system_prompt
+            result = self.generate(
+                prompt=json.dumps({'user_query': query}, ensure_ascii=False),
+                system_prompt=system_prompt,
+                static_context=catalog,
+                # Aynı sorgu + katalog için tekrar üretme
+                cache=True
             )
             if not result.get('success'):
                 return { 'success': False, 'error': result.get('error', 'Generation failed') }
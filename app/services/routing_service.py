@@ -0,0 +1,164 @@
+# =============================================================================
+# ROUTING SERVICE
+# =============================================================================
+# Kategori bazlı "auto" yönlendirme: sohbet bir kategoriye bağlıysa her mesaj
+# için o kategorinin model_categories kümesinden bir model seçilir.
+# - Model başına kayan (EWMA) gecikme ve hata oranı tahmini tutulur
+# - Skor = gecikme * (1 + ceza * hata_oranı); en düşük skor kazanır
+# - Hiç başarılı çağrısı olmayan modelin skoru sonsuzdur; hata oranı eşiği
+#   aşan modeller (hepsi aşmadıkça) sıralamaya alınmaz
+# - Az örneği olan modeller ve epsilon olasılıkla rastgele model denenir (keşif)
+# - Devresi açık modeller atlanır
+# Seçim ve gerekçesi mesajla birlikte (messages.route_reason) saklanır.
+# =============================================================================
+
+import os
+import time
+import random
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.database.repositories.model_repository import ModelRepository
+from app.services.providers.circuit_breaker import circuit_breakers
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class _ModelEstimate:
+    """Tek bir model için kayan gecikme / hata tahmini."""
+
+    def __init__(self):
+        self.latency_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self.samples = 0
+        self.updated = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'latency_ms': round(self.latency_ms) if self.latency_ms is not None else None,
+            'error_rate': round(self.error_rate, 4),
+            'samples': self.samples,
+        }
+
+
+class ModelRouter:
+    """
+    Gecikme ve hata farkındalıklı model seçici.
+
+    Kullanım:
+        model, reason = model_router.choose(category_id)
+        ...
+        model_router.observe(model['model_id'], ok, latency_seconds)
+    """
+
+    # Kategori aday listesinin DB'den yeniden okunma aralığı
+    CANDIDATE_CACHE_SECONDS = 30
+
+    def __init__(self):
+        self.alpha = _env_float('ROUTING_EWMA_ALPHA', 0.2)
+        self.explore_rate = _env_float('ROUTING_EXPLORE_RATE', 0.1)
+        self.min_samples = int(_env_float('ROUTING_MIN_SAMPLES', 3))
+        self.error_penalty = _env_float('ROUTING_ERROR_PENALTY', 4.0)
+        self.max_error_rate = _env_float('ROUTING_MAX_ERROR_RATE', 0.5)
+        self._estimates: Dict[int, _ModelEstimate] = {}
+        self._candidates: Dict[int, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random()
+
+    def observe(self, model_id: Optional[int], ok: bool, latency: float) -> None:
+        """Bir çağrının sonucunu modelin tahminine işler (latency saniye)."""
+        if model_id is None:
+            return
+        with self._lock:
+            est = self._estimates.get(model_id)
+            if est is None:
+                est = self._estimates[model_id] = _ModelEstimate()
+            est.samples += 1
+            est.updated = time.monotonic()
+            est.error_rate = (1 - self.alpha) * est.error_rate + self.alpha * (0.0 if ok else 1.0)
+            # Hatalı çağrılar genelde hızlı döner; gecikme tahminini bozmasın
+            if ok:
+                latency_ms = latency * 1000.0
+                est.latency_ms = latency_ms if est.latency_ms is None \
+                    else (1 - self.alpha) * est.latency_ms + self.alpha * latency_ms
+
+    def candidates(self, category_id: int) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._candidates.get(category_id)
+        if cached and now - cached[0] < self.CANDIDATE_CACHE_SECONDS:
+            return cached[1]
+        rows = ModelRepository.get_routable_models(category_id)
+        with self._lock:
+            self._candidates[category_id] = (now, rows)
+        return rows
+
+    def invalidate(self, category_id: Optional[int] = None) -> None:
+        with self._lock:
+            if category_id is None:
+                self._candidates.clear()
+            else:
+                self._candidates.pop(category_id, None)
+
+    def _score(self, est: _ModelEstimate) -> float:
+        # Yalnızca hata gözlenmiş modelin gecikmesi bilinmiyor; en hızlı sayılmasın
+        if est.latency_ms is None:
+            return float('inf')
+        return est.latency_ms * (1 + self.error_penalty * est.error_rate)
+
+    def choose(self, category_id: int, exclude: Iterable[int] = ()) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Kategori için model seçer.
+
+        Returns:
+            Tuple[model | None, reason]: reason kısa, insan tarafından okunabilir gerekçe
+        """
+        excluded = set(exclude)
+        rows = [r for r in self.candidates(category_id) if r.get('model_id') not in excluded]
+        usable = [
+            r for r in rows
+            if not circuit_breakers.is_open((r.get('provider_type') or '').lower(),
+                                            r.get('request_model_name') or r.get('model_name'))
+        ]
+        if not usable:
+            if not rows:
+                return None, 'no_candidates'
+            # Hepsinin devresi açık: yine de bir model dene, istek tamamen düşmesin
+            usable = rows
+
+        if len(usable) == 1:
+            return usable[0], 'only_candidate'
+
+        with self._lock:
+            estimates = {r['model_id']: self._estimates.get(r['model_id']) or _ModelEstimate() for r in usable}
+            cold = [r for r in usable if estimates[r['model_id']].samples < self.min_samples]
+            if cold:
+                pick = self._random.choice(cold)
+                return pick, f"explore:cold samples={estimates[pick['model_id']].samples}"
+            if self._random.random() < self.explore_rate:
+                pick = self._random.choice(usable)
+                est = estimates[pick['model_id']]
+                return pick, f"explore:random latency={est.latency_ms or 0:.0f}ms err={est.error_rate:.0%}"
+            # Rastgele keşif tüm adayları kapsar; hatalı model toparlanırsa yeniden seçilebilir
+            healthy = [r for r in usable if estimates[r['model_id']].error_rate <= self.max_error_rate]
+            ranked = sorted(healthy or usable, key=lambda r: self._score(estimates[r['model_id']]))
+            best = ranked[0]
+            est = estimates[best['model_id']]
+            latency = f"{est.latency_ms:.0f}ms" if est.latency_ms is not None else 'n/a'
+            return best, (
+                f"best latency={latency} err={est.error_rate:.0%} "
+                f"of={len(healthy or usable)}/{len(usable)}"
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {str(mid): est.to_dict() for mid, est in self._estimates.items()}
+
+
+# Uygulama genelinde paylaşılan örnek
+model_router = ModelRouter()
@@ -0,0 +1,213 @@
+# =============================================================================
+# TELEMETRY SERVICE
+# =============================================================================
+# Her provider çağrısı için model, provider, durum, gecikme, ilk token süresi
+# (streaming) ve token sayılarını kaydeder. Kayıtlar bellekte tamponlanır ve
+# arka plan thread'i ile provider_calls tablosuna toplu yazılır; istek
+# yolunda DB'ye yazılmaz.
+# Admin için model bazında p50/p95 gecikme ve tokens/sec özetleri üretir.
+# =============================================================================
+
+import os
+import atexit
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+from app.database.repositories.telemetry_repository import TelemetryRepository
+from app.services.providers.metrics import ProviderMetrics, provider_metrics
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def normalize_usage(usage: Optional[Dict[str, Any]]) -> Dict[str, Optional[int]]:
+    """
+    Provider usage bilgisini ortak alanlara çevirir.
+    Gemini: promptTokenCount / candidatesTokenCount / totalTokenCount
+    OpenRouter: prompt_tokens / completion_tokens / total_tokens
+    """
+    usage = usage or {}
+
+    def _int(*names):
+        for name in names:
+            value = usage.get(name)
+            if value is not None:
+                try:
+                    return int(value)
+                except (TypeError, ValueError):
+                    return None
+        return None
+
+    return {
+        'prompt_tokens': _int('prompt_tokens', 'promptTokenCount'),
+        'completion_tokens': _int('completion_tokens', 'candidatesTokenCount'),
+        'total_tokens': _int('total_tokens', 'totalTokenCount'),
+    }
+
+
+class TelemetryBuffer:
+    """
+    Çağrı kayıtları için sınırlı bellek tamponu.
+    Tampon `batch_size`'a ulaşınca veya `flush_interval` saniyede bir yazılır;
+    DB erişilemezse en eski kayıtlar `max_buffer` sınırında düşürülür.
+    """
+
+    def __init__(self):
+        self.enabled = str(os.getenv('TELEMETRY_ENABLED', '1')).lower() in ('1', 'true', 'yes', 'on')
+        self.batch_size = int(_env_float('TELEMETRY_BATCH_SIZE', 200))
+        self.flush_interval = _env_float('TELEMETRY_FLUSH_SECONDS', 5)
+        self.max_buffer = int(_env_float('TELEMETRY_MAX_BUFFER', 10000))
+        self._rows: deque = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='telemetry-flush', daemon=True)
+            self._worker.start()
+
+    def record(self, row: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._cond:
+            if len(self._rows) >= self.max_buffer:
+                self._rows.popleft()
+                self.dropped += 1
+                provider_metrics.incr('telemetry', None, 'dropped')
+            self._rows.append(row)
+            self._ensure_worker()
+            if len(self._rows) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self) -> int:
+        """Tampondaki kayıtları yazar; yazılan kayıt sayısını döndürür."""
+        with self._flush_lock:
+            with self._cond:
+                rows = list(self._rows)
+                self._rows.clear()
+            if not rows:
+                return 0
+            if TelemetryRepository.insert_calls(rows):
+                return len(rows)
+            # Yazılamadı: kayıtları (sınır dahilinde) tamponun başına geri koy
+            with self._cond:
+                room = max(0, self.max_buffer - len(self._rows))
+                keep = rows[-room:] if room else []
+                self.dropped += len(rows) - len(keep)
+                self._rows.extendleft(reversed(keep))
+            provider_metrics.incr('telemetry', None, 'flush_failed')
+            return 0
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._rows)
+
+
+# Uygulama genelinde paylaşılan tampon
+telemetry_buffer = TelemetryBuffer()
+atexit.register(telemetry_buffer.flush)
+
+
+class TelemetryService:
+
+    @staticmethod
+    def record_call(model: Dict[str, Any], result: Dict[str, Any], latency: float,
+                    ttft: Optional[float] = None, chat_id: Optional[str] = None,
+                    user_id: Optional[int] = None) -> None:
+        """Tek bir provider çağrısını tampona ekler (süreler saniye cinsinden)."""
+        try:
+            usage = normalize_usage(result.get('usage'))
+            telemetry_buffer.record({
+                'model_id': model.get('model_id'),
+                'provider_type': (model.get('provider_type') or '').lower() or 'unknown',
+                'request_model_name': model.get('request_model_name') or model.get('model_name'),
+                'chat_id': chat_id,
+                'user_id': user_id,
+                'status': 'success' if result.get('success') else 'error',
+                'status_code': result.get('status_code'),
+                'latency_ms': int(round(latency * 1000)),
+                'ttft_ms': int(round(ttft * 1000)) if ttft is not None else None,
+                **usage,
+            })
+        except Exception:
+            pass
+
+    @staticmethod
+    def model_stats(hours: int = 24) -> Dict[str, Any]:
+        """
+        Son `hours` saat için model bazında özet:
+        çağrı/hata sayısı, p50/p95 gecikme, p50 ilk token süresi ve p50 tokens/sec.
+        """
+        try:
+            hours = max(1, min(24 * 30, int(hours)))
+            rows = TelemetryRepository.list_recent_calls(hours)
+            groups: Dict[Any, Dict[str, Any]] = {}
+            for row in rows:
+                key = row.get('model_id') or (row.get('provider_type'), row.get('request_model_name'))
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = {
+                        'model_id': row.get('model_id'),
+                        'model_name': row.get('model_name') or row.get('request_model_name'),
+                        'provider_type': row.get('provider_type'),
+                        'calls': 0, 'errors': 0, 'tokens': 0,
+                        '_latency': [], '_ttft': [], '_tps': [],
+                    }
+                group['calls'] += 1
+                if row.get('status') != 'success':
+                    group['errors'] += 1
+                    continue
+                latency_ms = row.get('latency_ms') or 0
+                ttft_ms = row.get('ttft_ms')
+                tokens = row.get('completion_tokens') or 0
+                group['tokens'] += tokens
+                group['_latency'].append(latency_ms)
+                if ttft_ms is not None:
+                    group['_ttft'].append(ttft_ms)
+                # Üretim süresi: streaming'de ilk token sonrası, aksi halde toplam süre
+                gen_ms = latency_ms - ttft_ms if ttft_ms is not None and latency_ms > ttft_ms else latency_ms
+                if tokens and gen_ms > 0:
+                    group['_tps'].append(tokens * 1000.0 / gen_ms)
+
+            data = []
+            for group in groups.values():
+                latency = group.pop('_latency')
+                ttft = group.pop('_ttft')
+                tps = group.pop('_tps')
+                p50_tps = ProviderMetrics._quantile(tps, 0.5)
+                group.update({
+                    'error_rate': round(group['errors'] / group['calls'], 4) if group['calls'] else 0.0,
+                    'p50_ms': ProviderMetrics._quantile(latency, 0.5),
+                    'p95_ms': ProviderMetrics._quantile(latency, 0.95),
+                    'ttft_p50_ms': ProviderMetrics._quantile(ttft, 0.5),
+                    'tokens_per_sec': round(p50_tps, 1) if p50_tps is not None else None,
+                })
+                data.append(group)
+            data.sort(key=lambda g: g['calls'], reverse=True)
+            return {'success': True, 'data': data, 'hours': hours, 'sampled_calls': len(rows),
+                    'pending': telemetry_buffer.pending(), 'dropped': telemetry_buffer.dropped}
+        except Exception as e:
+            return {'success': False, 'error': 'Telemetri özeti alınamadı'}
+
+
+if __name__ == '__main__':
+    # Cron ile eski kayıtları temizlemek için: python -m app.services.telemetry_service [gün]
+    import sys
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else int(_env_float('TELEMETRY_RETENTION_DAYS', 30))
+    TelemetryRepository.purge_older_than(days)
@@ -6,6 +6,7 @@
 import { DOMUtils } from '../utils/dom-utils.js';
 import { Helpers } from '../utils/helpers.js';
 import { i18n } from '../utils/i18n.js';
+import { chatHydrator, ChatHydrator } from '../data/chat-hydrator.js';
 
 export class ChatPane {
     constructor(id, modelName, modelId, eventManager) {
@@ -24,6 +25,7 @@ export class ChatPane {
         this.lastActivity = null;
         this.voiceActive = false; // ses kaydı açık mı
         this.recognition = null; // SpeechRecognition örneği
+        this.pendingRequestIds = new Set(); // devam eden /send istekleri (iptal için)
         
         // Pane elementini oluştur
         this.createElement();
@@ -99,22 +101,11 @@ export class ChatPane {
         } else {
             // Sunucudan chat bilgisi ve mesajları yükle
             try {
-                const [chatRes, msgRes] = await Promise.all([
-                    fetch(`/api/chats/${paneId}`),
-                    fetch(`/api/chats/${paneId}/messages?limit=100`)
-                ]);
-                const chatJson = await chatRes.json();
-                const msgJson = await msgRes.json();
-                if (chatJson && chatJson.success && chatJson.chat) {
-                    modelName = chatJson.chat.model_name || fallbackModelName;
-                    modelId = chatJson.chat.model_id || 1;
-                }
-                if (msgJson && msgJson.success && Array.isArray(msgJson.messages)) {
-                    messages = msgJson.messages.map(m => ({
-                        type: m.is_user ? 'user' : 'assistant',
-                        content: m.content,
-                        timestamp: m.timestamp ? Date.parse(m.timestamp) : Date.now()
-                    }));
+                const hydrated = await chatHydrator.load(paneId);
+                if (hydrated && hydrated.chat) {
+                    modelName = hydrated.chat.model_name || fallbackModelName;
+                    modelId = hydrated.chat.model_id || 1;
+                    messages = ChatHydrator.toPaneMessages(hydrated.messages);
                 }
             } catch (e) {
                 messages = [];
@@ -562,26 +553,23 @@ export class ChatPane {
         // Typing indicator göster
         this.showTypingIndicator();
         
+        // Pane kapanırsa sunucu bu kimlikle üretimi iptal edebilir
+        const requestId = (window.crypto && crypto.randomUUID)
+            ? crypto.randomUUID()
+            : `${Date.now()}-${Math.random().toString(16).slice(2)}`;
+        this.pendingRequestIds.add(requestId);
+        
         try {
-            // Backend'e mesaj gönder
-            const response = await fetch(`/api/chats/${this.id}/send`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    chat_id: this.id,
-                    message: userMessage,
-                    model_id: this.modelId
-                })
-            });
-            
-            const result = await response.json();
+            // Backend'e mesaj gönder; yanıt SSE olarak akar, bağlantı koparsa kaldığı yerden devam eder
+            const result = await this.streamAIResponse(userMessage, requestId);
             
             // Typing indicator'ı gizle
             this.hideTypingIndicator();
             
-            if (result.success) {
+            if (result.cancelled) {
+                // Üretim iptal edildi (pane kapatıldı); gösterilecek yanıt yok
+                return;
+            } else if (result.success) {
                 // AI yanıtını ekle
                 this.addMessage({
                     type: 'assistant',
@@ -628,9 +616,126 @@ export class ChatPane {
                 error: error.message,
                 pane: this
             });
+        } finally {
+            this.pendingRequestIds.delete(requestId);
+        }
+    }
+
+    /**
+     * Mesajı /stream ile gönder ve yanıt parçalarını canlı göster.
+     * Bağlantı koparsa /stream/<requestId> ile Last-Event-ID vererek devam eder;
+     * üretim sunucuda sürdüğü için yanıt yeniden üretilmez.
+     * @param {string} userMessage - Kullanıcı mesajı
+     * @param {string} requestId - İstek kimliği (iptal / devam / idempotency)
+     * @returns {Promise<Object>} /send ile aynı biçimde sonuç
+     */
+    async streamAIResponse(userMessage, requestId) {
+        const state = { lastEventId: 0, text: '', result: null };
+        const maxResumes = 3;
+        let response = await fetch(`/api/chats/${this.id}/stream`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream',
+                'X-Request-Id': requestId,
+                // Aynı istek tekrar gönderilirse (ağ yeniden denemesi) sunucu tek yanıt üretir
+                'Idempotency-Key': requestId,
+            },
+            body: JSON.stringify({
+                chat_id: this.id,
+                message: userMessage,
+                model_id: this.modelId,
+                request_id: requestId
+            })
+        });
+
+        for (let attempt = 0; ; attempt++) {
+            const contentType = response.headers.get('Content-Type') || '';
+            if (!contentType.includes('text/event-stream')) {
+                // Doğrulama hataları vb. JSON döner
+                return await response.json();
+            }
+            try {
+                await this.readEventStream(response, state);
+            } catch (e) {
+                // Bağlantı koptu; aşağıda devam edilir
+            }
+            if (state.result) return state.result;
+            if (attempt >= maxResumes || !this.pendingRequestIds.has(requestId)) {
+                throw new Error(i18n.t('connection_lost'));
+            }
+            await new Promise(resolve => setTimeout(resolve, 500 * (attempt + 1)));
+            response = await fetch(`/api/chats/${this.id}/stream/${encodeURIComponent(requestId)}`, {
+                headers: { 'Accept': 'text/event-stream', 'Last-Event-ID': String(state.lastEventId) }
+            });
         }
     }
 
+    /**
+     * SSE gövdesini oku; delta/reset olaylarını canlı metne uygula
+     * @param {Response} response
+     * @param {Object} state - { lastEventId, text, result }
+     */
+    async readEventStream(response, state) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (done) return;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const block = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                let id = null, event = 'message', data = '';
+                block.split('\n').forEach(line => {
+                    if (line.startsWith('id:')) id = parseInt(line.slice(3).trim(), 10);
+                    else if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data += line.slice(5).trim();
+                });
+                if (!data) continue;
+                if (id) state.lastEventId = id;
+                const payload = JSON.parse(data);
+                if (event === 'delta') {
+                    state.text += payload.text || '';
+                    this.updateStreamingText(state.text);
+                } else if (event === 'reset') {
+                    state.text = '';
+                    this.updateStreamingText('');
+                } else if (event === 'done' || event === 'error') {
+                    state.result = payload;
+                    try { await reader.cancel(); } catch (_) {}
+                    return;
+                }
+            }
+        }
+    }
+
+    /**
+     * Akan yanıt metnini typing indicator yerinde göster (son hali addMessage ile işlenir)
+     * @param {string} text
+     */
+    updateStreamingText(text) {
+        const typingElement = document.getElementById(`typing-${this.id}`);
+        if (!typingElement) return;
+        const content = DOMUtils.$('.message-content', typingElement);
+        if (!content) return;
+        if (!text) {
+            content.innerHTML = '<div class="typing-dots"><span></span><span></span><span></span></div>';
+            return;
+        }
+        let textEl = DOMUtils.$('.message-text', content);
+        if (!textEl) {
+            content.innerHTML = '';
+            textEl = DOMUtils.createElement('div', { className: 'message-text' });
+            content.appendChild(textEl);
+        }
+        textEl.textContent = text;
+        const messagesContainer = DOMUtils.$('.pane-messages', this.element);
+        if (messagesContainer) messagesContainer.scrollTop = messagesContainer.scrollHeight;
+    }
+
     /**
      * AI yanıtı oluştur
      * @param {string} userMessage - Kullanıcı mesajı
@@ -4,6 +4,7 @@
  */
 
 import { i18n } from '../utils/i18n.js';
+import { bootstrap } from './bootstrap.js';
 
 export class AssistantService {
     constructor(stateManager, eventManager) {
@@ -26,10 +27,13 @@ export class AssistantService {
             const modelService = window.ZekaiApp?.services?.modelService;
             const models = Array.isArray(modelService?.models) ? modelService.models : [];
 
-            // fetch categories dynamically
-            const catRes = await fetch('/api/categories/');
-            const catJson = await catRes.json();
-            const categories = (catJson && catJson.success && Array.isArray(catJson.data)) ? catJson.data : [];
+            // categories: embedded catalog first, API as fallback
+            let categories = bootstrap.get('catalog')?.categories;
+            if (!Array.isArray(categories)) {
+                const catRes = await fetch('/api/categories/');
+                const catJson = await catRes.json();
+                categories = (catJson && catJson.success && Array.isArray(catJson.data)) ? catJson.data : [];
+            }
 
             // compact models to avoid leaking sensitive data like api keys
             const compactModels = models.map(m => ({
@@ -0,0 +1,48 @@
+/**
+ * Bootstrap
+ * /chat sayfasına gömülen başlangıç verisini (#app-bootstrap) okur.
+ * Katalog kalıcıdır; sohbet listeleri yalnızca ilk çizimde kullanılır (take),
+ * sonraki yenilemeler API'den gelir.
+ */
+
+class Bootstrap {
+    constructor() {
+        this.data = null;
+        this.parsed = false;
+    }
+
+    read() {
+        if (!this.parsed) {
+            this.parsed = true;
+            try {
+                const el = document.getElementById('app-bootstrap');
+                this.data = el ? JSON.parse(el.textContent || 'null') : null;
+            } catch (_) {
+                this.data = null;
+            }
+        }
+        return this.data || {};
+    }
+
+    /**
+     * Bölümü döndür (yoksa null)
+     * @param {'user'|'branding'|'catalog'|'chats'} key
+     */
+    get(key) {
+        return this.read()[key] ?? null;
+    }
+
+    /**
+     * Bölümü bir kez döndür; sonraki çağrılar null alır ve API'ye gider
+     * @param {string} key
+     */
+    take(key) {
+        const value = this.get(key);
+        if (this.data) {
+            this.data[key] = null;
+        }
+        return value;
+    }
+}
+
+export const bootstrap = new Bootstrap();
@@ -0,0 +1,134 @@
+/**
+ * Chat Hydrator
+ * Pane geri yüklemede chat bilgisi + son mesajları toplu olarak yükler.
+ * Aynı tick içinde istenen chat'ler tek /api/chats/hydrate isteğinde birleştirilir.
+ * Daha önce yüklenen chat yeniden açıldığında yalnızca yeni mesajlar istenir
+ * (?since=cursor + If-None-Match); değişmeyen chat 304 ile gövdesiz döner.
+ */
+
+const HYDRATE_MAX_CHATS = 16;
+
+class ChatHydrator {
+    constructor() {
+        this.pending = new Map(); // chatId -> [{ resolve, reject }]
+        this.timer = null;
+        this.limit = 100;
+        this.cache = new Map(); // chatId -> { chat, messages, has_more, cursor, etag }
+    }
+
+    /**
+     * Tek chat'i yükle (aynı tick'teki diğer isteklerle birleştirilir)
+     * @param {string} chatId
+     * @returns {Promise<{chat: Object, messages: Array, has_more: boolean}|null>} Bulunamazsa null
+     */
+    load(chatId) {
+        if (this.cache.has(chatId)) {
+            return this.sync(chatId);
+        }
+        return new Promise((resolve, reject) => {
+            const waiters = this.pending.get(chatId) || [];
+            waiters.push({ resolve, reject });
+            this.pending.set(chatId, waiters);
+            if (!this.timer) {
+                this.timer = setTimeout(() => this.flush(), 0);
+            }
+        });
+    }
+
+    async flush() {
+        this.timer = null;
+        const batch = new Map(this.pending);
+        this.pending.clear();
+        const ids = Array.from(batch.keys());
+        for (let i = 0; i < ids.length; i += HYDRATE_MAX_CHATS) {
+            const chunk = ids.slice(i, i + HYDRATE_MAX_CHATS);
+            try {
+                const response = await fetch('/api/chats/hydrate', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ chat_ids: chunk, limit: this.limit })
+                });
+                const result = await response.json();
+                if (!result || !result.success) {
+                    throw new Error(result?.error || 'hydrate failed');
+                }
+                chunk.forEach(id => {
+                    const entry = (result.chats || {})[id] || null;
+                    if (entry) {
+                        this.remember(id, entry);
+                    }
+                    batch.get(id).forEach(w => w.resolve(entry));
+                });
+            } catch (e) {
+                chunk.forEach(id => batch.get(id).forEach(w => w.reject(e)));
+            }
+        }
+    }
+
+    /**
+     * Önbellekteki chat'i son cursor'dan itibaren senkronize et
+     * @param {string} chatId
+     */
+    async sync(chatId) {
+        const cached = this.cache.get(chatId);
+        const params = new URLSearchParams({ limit: this.limit });
+        if (cached.cursor != null) {
+            params.set('since', cached.cursor);
+        }
+        const headers = cached.etag ? { 'If-None-Match': cached.etag } : {};
+        try {
+            const response = await fetch(`/api/chats/${chatId}/messages?${params}`, { headers });
+            if (response.status === 304) {
+                return cached;
+            }
+            if (response.status === 404) {
+                this.cache.delete(chatId);
+                return null;
+            }
+            const result = await response.json();
+            if (!result || !result.success) {
+                throw new Error(result?.error || 'sync failed');
+            }
+            // Cursor'dan sonraki (ör. tamamlanmamış) mesajlar sunucudaki güncel halleriyle değiştirilir
+            const kept = cached.messages.filter(m => cached.cursor != null && m.message_id <= cached.cursor);
+            const merged = kept.concat(result.messages || []);
+            const trimmed = merged.length > this.limit;
+            Object.assign(cached, {
+                messages: trimmed ? merged.slice(-this.limit) : merged,
+                has_more: cached.has_more || trimmed,
+                cursor: result.cursor ?? cached.cursor,
+                etag: result.complete ? response.headers.get('ETag') : null
+            });
+            return cached;
+        } catch (e) {
+            // Senkronizasyon başarısızsa tam yükleme yapılır
+            this.cache.delete(chatId);
+            return this.load(chatId);
+        }
+    }
+
+    remember(chatId, entry) {
+        const messages = entry.messages || [];
+        let cursor = null;
+        for (const m of messages) {
+            if (m.is_complete === false) break;
+            cursor = m.message_id;
+        }
+        this.cache.set(chatId, Object.assign(entry, { cursor, etag: null }));
+    }
+
+    /**
+     * Sunucu mesajlarını pane mesaj biçimine çevir
+     * @param {Array} messages
+     */
+    static toPaneMessages(messages = []) {
+        return messages.map(m => ({
+            type: m.is_user ? 'user' : 'assistant',
+            content: m.content,
+            timestamp: m.timestamp ? Date.parse(m.timestamp) : Date.now()
+        }));
+    }
+}
+
+export const chatHydrator = new ChatHydrator();
+export { ChatHydrator };
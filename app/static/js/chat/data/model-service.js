@@ -5,6 +5,7 @@
 
 import { Helpers } from '../utils/helpers.js';
 import { i18n } from '../utils/i18n.js';
+import { bootstrap } from './bootstrap.js';
 
 export class ModelService {
     constructor(stateManager, eventManager) {
@@ -14,6 +15,7 @@ export class ModelService {
         this.activeModel = null;
         this.modelConfigs = new Map();
         this.isLoaded = false;
+        this.catalogVersion = null;
     }
 
     /**
@@ -51,8 +53,14 @@ export class ModelService {
     async loadModels() {
         this.isLoaded = false;
         try {
-            const response = await fetch('/api/models');
-            const result = await response.json();
+            // İlk yüklemede sayfaya gömülü katalog kullanılır
+            const catalog = this.catalogVersion ? null : bootstrap.get('catalog');
+            const result = catalog
+                ? { success: true, data: catalog.models }
+                : await (await fetch('/api/models')).json();
+            if (catalog) {
+                this.catalogVersion = catalog.version;
+            }
             
             if (result.success) {
                 this.models = result.data.map(model => this.transformModelData(model));
@@ -99,7 +107,6 @@ export class ModelService {
             isAvailable: Boolean(dbModel.is_active),
             isPinned: false, // Default value
             modelId: dbModel.model_id,
-            apiKey: dbModel.api_key,
             createdAt: dbModel.created_at,
             updatedAt: dbModel.updated_at
         };
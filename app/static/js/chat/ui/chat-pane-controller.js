@@ -7,6 +7,7 @@ import { DOMUtils } from '../utils/dom-utils.js';
 import { Helpers } from '../utils/helpers.js';
 import { ChatPane } from '../core/chat-pane.js';
 import { i18n } from '../utils/i18n.js';
+import { chatHydrator, ChatHydrator } from '../data/chat-hydrator.js';
 
 export class ChatPaneController {
     constructor(stateManager, eventManager) {
@@ -71,6 +72,33 @@ export class ChatPaneController {
         // State listener'ları kur
         this.setupStateListeners();
 
+        // Sayfadan ayrılınca devam eden üretimleri iptal et (yanıtı okuyacak kimse kalmaz)
+        window.addEventListener('pagehide', () => {
+            this.chatPanes.forEach(pane => this.cancelPendingRequests(pane, true));
+        });
+
+    }
+
+    /**
+     * Pane'in devam eden AI isteklerini sunucuda iptal et
+     * @param {ChatPane} pane
+     * @param {boolean} useBeacon - Sayfa kapanırken sendBeacon kullan
+     */
+    cancelPendingRequests(pane, useBeacon = false) {
+        if (!pane || !pane.pendingRequestIds || !pane.pendingRequestIds.size) return;
+        const url = `/api/chats/${pane.id}/cancel`;
+        if (useBeacon && navigator.sendBeacon) {
+            pane.pendingRequestIds.forEach(requestId => {
+                const body = new Blob([JSON.stringify({ request_id: requestId })], { type: 'application/json' });
+                navigator.sendBeacon(url, body);
+            });
+            return;
+        }
+        fetch(url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({})
+        }).catch(() => {});
     }
 
     /**
@@ -298,26 +326,15 @@ export class ChatPaneController {
         let reserved = true;
 
         try {
-            const [chatRes, msgRes] = await Promise.all([
-                fetch(`/api/chats/${chatId}`),
-                fetch(`/api/chats/${chatId}/messages?limit=100`)
-            ]);
-            const chatJson = await chatRes.json();
-            const msgJson = await msgRes.json();
-
-            if (!chatJson || !chatJson.success || !chatJson.chat) {
+            // Aynı anda geri yüklenen pane'ler tek hydrate isteğinde birleşir
+            const hydrated = await chatHydrator.load(chatId);
+            if (!hydrated || !hydrated.chat) {
                 throw new Error('Chat bulunamadı');
             }
 
-            const modelName = chatJson.chat.model_name || 'Chat';
-            const modelId = chatJson.chat.model_id || 1;
-            const messages = (msgJson && msgJson.success && Array.isArray(msgJson.messages))
-                ? msgJson.messages.map(m => ({
-                    type: m.is_user ? 'user' : 'assistant',
-                    content: m.content,
-                    timestamp: m.timestamp ? Date.parse(m.timestamp) : Date.now()
-                }))
-                : [];
+            const modelName = hydrated.chat.model_name || 'Chat';
+            const modelId = hydrated.chat.model_id || 1;
+            const messages = ChatHydrator.toPaneMessages(hydrated.messages);
 
             // İlk pane ise empty state'i temizle
             if (this.chatPanes.size === 0) {
@@ -381,22 +398,11 @@ export class ChatPaneController {
         } else {
             // Sunucudan chat ve mesajları yükle
             try {
-                const [chatRes, msgRes] = await Promise.all([
-                    fetch(`/api/chats/${paneId}`),
-                    fetch(`/api/chats/${paneId}/messages?limit=100`)
-                ]);
-                const chatJson = await chatRes.json();
-                const msgJson = await msgRes.json();
-                if (chatJson && chatJson.success && chatJson.chat) {
-                    modelName = chatJson.chat.model_name || fallbackModelName;
-                    modelId = chatJson.chat.model_id || 1;
-                }
-                if (msgJson && msgJson.success && Array.isArray(msgJson.messages)) {
-                    messages = msgJson.messages.map(m => ({
-                        type: m.is_user ? 'user' : 'assistant',
-                        content: m.content,
-                        timestamp: m.timestamp ? Date.parse(m.timestamp) : Date.now()
-                    }));
+                const hydrated = await chatHydrator.load(paneId);
+                if (hydrated && hydrated.chat) {
+                    modelName = hydrated.chat.model_name || fallbackModelName;
+                    modelId = hydrated.chat.model_id || 1;
+                    messages = ChatHydrator.toPaneMessages(hydrated.messages);
                 }
             } catch (e) {}
         }
@@ -698,8 +704,11 @@ export class ChatPaneController {
         const pane = this.chatPanes.get(paneId);
         if (!pane) return;
 
-        // Backend: chat'i pasif (is_active = 0) yap (history'den açılan zaten pasif olabilir)
-        if (!pane.fromHistory) {
+        // Backend: chat'i pasif (is_active = 0) yap (history'den açılan zaten pasif olabilir).
+        // Delete uç noktası devam eden üretimleri de iptal eder; history pane'i için ayrıca iptal et.
+        if (pane.fromHistory) {
+            this.cancelPendingRequests(pane);
+        } else {
             (async () => {
                 try {
                     const res = await fetch(`/api/chats/${paneId}/delete`, { method: 'DELETE' });
@@ -167,39 +167,67 @@ export class ModalController {
         if (closeBtn) DOMUtils.on(closeBtn, 'click', () => this.closeModal(modal));
         DOMUtils.on(modal, 'click', (e) => { if (e.target === modal) this.closeModal(modal); });
 
+        const container = DOMUtils.$('.chat-list-modal', modal);
+        const renderChats = (list) => {
+            if (!container) return;
+            if (!list.length) {
+                container.innerHTML = `<div class="no-models">${i18n.t?.('no_chat_history') || 'Geçmiş sohbet yok'}</div>`;
+                return;
+            }
+            container.innerHTML = list.map(c => {
+                const code = String(c.chat_id || c.id || '').toString().split('-').pop();
+                const name = c.model_name || c.title || 'Chat';
+                return `
+                    <div class="chat-row-item" data-pane-id="${c.chat_id || c.id}" data-model-name="${name}">
+                        <div class="model-icon"><i class="fas fa-robot"></i></div>
+                        <div class="info">
+                            <div class="name">${name} <span class="chat-code">#${code}</span></div>
+                            <div class="preview">${c.title && c.title !== name ? Helpers.escapeHtml(c.title) : ''}</div>
+                        </div>
+                    </div>
+                `;
+            }).join('');
+            // Bind clicks -> open read-only history pane
+            DOMUtils.$$('.chat-row-item', container).forEach(item => {
+                DOMUtils.on(item, 'click', (e) => {
+                    const pid = item.getAttribute('data-pane-id');
+                    const modelName = item.getAttribute('data-model-name');
+                    if (!pid) return;
+                    this.eventManager.emit('history:selected', { paneId: pid, modelName });
+                    this.closeModal(modal);
+                });
+            });
+        };
+
+        // Arama: sunucudaki başlık dizini (tüm sohbetler, yalnızca ilk sayfa değil)
+        let archived = [];
+        let searchSeq = 0;
+        const searchInput = DOMUtils.$('.chat-history-search-input', modal);
+        if (searchInput) {
+            DOMUtils.on(searchInput, 'input', async () => {
+                const q = (searchInput.value || '').trim();
+                const seq = ++searchSeq;
+                if (!q) {
+                    renderChats(archived);
+                    return;
+                }
+                try {
+                    const res = await fetch(`/api/chats/autocomplete?q=${encodeURIComponent(q)}&limit=30`);
+                    const json = await res.json();
+                    // Yazmaya devam edildiyse eski yanıt yok sayılır
+                    if (seq !== searchSeq) return;
+                    renderChats((json && json.success && Array.isArray(json.data)) ? json.data : []);
+                } catch (_) {}
+            });
+        }
+
         (async () => {
-            const container = DOMUtils.$('.chat-list-modal', modal);
             if (!container) return;
             try {
-                const res = await fetch('/api/chats/list?active=true');
+                const res = await fetch('/api/chats/overview');
                 const json = await res.json();
-                const list = (json && json.success && Array.isArray(json.chats)) ? json.chats : [];
-                if (!list.length) {
-                    container.innerHTML = `<div class="no-models">${i18n.t?.('no_active_chats') || 'Aktif sohbet yok'}</div>`;
-                    return;
-                }
-                container.innerHTML = list.map(c => {
-                    const code = String(c.chat_id || c.id || '').toString().split('-').pop();
-                    const name = c.model_name || c.title || 'Chat';
-                    return `
-                        <div class="chat-row-item" data-pane-id="${c.chat_id || c.id}">
-                            <div class="model-icon"><i class="fas fa-robot"></i></div>
-                            <div class="info">
-                                <div class="name">${name} <span class="chat-code">#${code}</span></div>
-                                <div class="preview"></div>
-                            </div>
-                        </div>
-                    `;
-                }).join('');
-                // Bind clicks -> restore existing chat pane
-                DOMUtils.$$('.chat-row-item', container).forEach(item => {
-                    DOMUtils.on(item, 'click', (e) => {
-                        const pid = item.getAttribute('data-pane-id');
-                        if (!pid) return;
-                        this.eventManager.emit('pane:restore-requested', { paneId: pid });
-                        this.closeModal(modal);
-                    });
-                });
+                archived = (json && json.success && Array.isArray(json.archived?.chats)) ? json.archived.chats : [];
+                if (!searchInput || !searchInput.value.trim()) renderChats(archived);
             } catch (_) {
                 if (container) container.innerHTML = `<div class=\"no-models\">${i18n.t?.('load_failed') || 'Yüklenemedi'}</div>`;
             }
@@ -229,7 +257,9 @@ export class ModalController {
                         .chat-row-item .name { font-weight:600; color: var(--text); overflow:hidden; text-overflow: ellipsis; white-space: nowrap; }
                         .chat-row-item .preview { font-size:12px; color: var(--muted); overflow:hidden; text-overflow: ellipsis; white-space: nowrap; }
                         .no-models { color: var(--muted); font-size: 12px; padding: 8px 12px; }
+                        .chat-history-search input { width: 100%; padding: 10px 12px; margin-bottom: 8px; border-radius: 10px; border: 1px solid var(--border); background: var(--surface); color: var(--text); }
                     </style>
+                    <div class="chat-history-search"><input type="text" class="chat-history-search-input" placeholder="${i18n.t?.('search') || 'Ara'}..." /></div>
                     <div class="chat-list-modal"></div>
                 </div>
             </div>
@@ -243,9 +273,9 @@ export class ModalController {
             const container = DOMUtils.$('.chat-list-modal', modal);
             if (!container) return;
             try {
-                const res = await fetch('/api/chats/list?active=false');
+                const res = await fetch('/api/chats/overview');
                 const json = await res.json();
-                const list = (json && json.success && Array.isArray(json.chats)) ? json.chats : [];
+                const list = (json && json.success && Array.isArray(json.archived?.chats)) ? json.archived.chats : [];
                 if (!list.length) {
                     container.innerHTML = `<div class="no-models">${i18n.t?.('no_chat_history') || 'Geçmiş sohbet yok'}</div>`;
                     return;
@@ -289,6 +319,9 @@ export class ModalController {
         const state = {
             models: [],
             query: '',
+            // Sunucu aramasının sıraladığı model ID'leri (null: yerel filtre)
+            rankedIds: null,
+            searchSeq: 0,
             loading: true
         };
 
@@ -301,6 +334,11 @@ export class ModalController {
         const filterModels = () => {
             const q = (state.query || '').toLowerCase();
             let list = [...state.models];
+            if (q && state.rankedIds) {
+                // Sunucu sıralaması korunur
+                const byId = new Map(list.map(m => [m.model_id || m.id, m]));
+                return state.rankedIds.map(id => byId.get(id)).filter(Boolean);
+            }
             if (q) {
                 list = list.filter(m => {
                     const name = (m.name || m.model_name || '').toLowerCase();
@@ -456,9 +494,23 @@ export class ModalController {
 
         const searchInput = DOMUtils.$('.models-manage-search-input', modal);
         if (searchInput) {
-            DOMUtils.on(searchInput, 'input', () => {
+            DOMUtils.on(searchInput, 'input', async () => {
                 state.query = searchInput.value || '';
+                state.rankedIds = null;
                 renderList();
+                const q = state.query.trim();
+                if (!q) return;
+                const seq = ++state.searchSeq;
+                try {
+                    const res = await fetch(`/api/models/autocomplete?q=${encodeURIComponent(q)}&limit=50`);
+                    const json = await res.json();
+                    // Yazmaya devam edildiyse eski yanıt yok sayılır
+                    if (seq !== state.searchSeq || !(json && json.success && Array.isArray(json.data))) return;
+                    state.rankedIds = json.data.map(m => m.model_id);
+                    renderList();
+                } catch (_) {
+                    // Yerel filtre ile devam
+                }
             });
         }
 
@@ -6,6 +6,7 @@
 import { DOMUtils } from '../utils/dom-utils.js';
 import { Helpers } from '../utils/helpers.js';
 import { i18n } from '../utils/i18n.js';
+import { bootstrap } from '../data/bootstrap.js';
 
 export class SidebarController {
     constructor(stateManager, eventManager) {
@@ -29,21 +30,19 @@ export class SidebarController {
         const historyListEl = this.historyListEl || DOMUtils.$('#history-list');
         if (!activeListEl && !historyListEl) return;
 
-        // Aktif sohbetleri getir
+        // Aktif ve geçmiş (pasif) sohbetler tek istekte; ilk çizimde sayfaya gömülü liste kullanılır
         try {
-            const resActive = await fetch('/api/chats/list?active=true');
-            const jsonActive = await resActive.json();
-            if (jsonActive && jsonActive.success && Array.isArray(jsonActive.chats)) {
-                this.renderActiveChatsFromServer(jsonActive.chats, activeListEl);
-            }
-        } catch (e) {}
-
-        // Geçmiş (pasif) sohbetleri getir
-        try {
-            const resHist = await fetch('/api/chats/list?active=false');
-            const jsonHist = await resHist.json();
-            if (jsonHist && jsonHist.success && Array.isArray(jsonHist.chats)) {
-                this.renderHistoryChatsFromServer(jsonHist.chats, historyListEl);
+            const embedded = bootstrap.take('chats');
+            const json = embedded
+                ? { success: true, ...embedded }
+                : await (await fetch('/api/chats/overview')).json();
+            if (json && json.success) {
+                if (Array.isArray(json.active?.chats)) {
+                    this.renderActiveChatsFromServer(json.active.chats, activeListEl);
+                }
+                if (Array.isArray(json.archived?.chats)) {
+                    this.renderHistoryChatsFromServer(json.archived.chats, historyListEl);
+                }
             }
         } catch (e) {}
     }
@@ -624,8 +623,10 @@ export class SidebarController {
             if (!container) return;
             container.innerHTML = `<div class="no-models">${i18n.t('categories_loading')}</div>`;
 
-            const res = await fetch('/api/categories/');
-            const json = await res.json();
+            const embedded = bootstrap.get('catalog')?.categories;
+            const json = Array.isArray(embedded)
+                ? { success: true, data: embedded }
+                : await (await fetch('/api/categories/')).json();
             if (!json.success) {
                 container.innerHTML = `<div class="no-models">${i18n.t('categories_failed')}</div>`;
                 return;
@@ -669,8 +670,12 @@ export class SidebarController {
                     });
                 });
                 container.appendChild(item);
-                // Prefetch models for this category in background
-                this.prefetchCategoryModels(cat.category_id);
+                // Prefetch models for this category in background (boş kategoriler için istek atılmaz)
+                if (cat.model_count === 0) {
+                    this.categoryModelsCache.set(cat.category_id, []);
+                } else {
+                    this.prefetchCategoryModels(cat.category_id);
+                }
             });
         } catch (e) {}
     }
@@ -1035,8 +1040,10 @@ export class SidebarController {
 
         // Admin: profil ayarlarına Admin Panel bağlantısı ekle
         try {
-            fetch('/auth/check-auth')
-                .then(res => res.ok ? res.json() : null)
+            const embeddedUser = bootstrap.get('user');
+            (embeddedUser
+                ? Promise.resolve({ authenticated: true, user: embeddedUser })
+                : fetch('/auth/check-auth').then(res => res.ok ? res.json() : null))
                 .then(data => {
                     if (!data || !data.authenticated || !data.user || !data.user.is_admin) return;
                     const settingsWrap = DOMUtils.$('.profile-settings', card);
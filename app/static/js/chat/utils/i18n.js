@@ -125,6 +125,7 @@ const translations = {
       close: 'Kapat',
       error_prefix: 'Hata: {{msg}}',
       connection_error: 'Bağlantı hatası: {{msg}}',
+      connection_lost: 'Yanıt akışı kesildi',
       
       // Welcome messages
       welcome_gemini: 'Merhaba, ben Gemini. Bugün size nasıl yardımcı olabilirim?',
@@ -322,6 +323,7 @@ const translations = {
       close: 'Close',
       error_prefix: 'Error: {{msg}}',
       connection_error: 'Connection error: {{msg}}',
+      connection_lost: 'Response stream was interrupted',
       
       // Welcome messages
       welcome_gemini: 'Hello, I\'m Gemini. How can I help you today?',
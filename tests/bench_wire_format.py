@@ -0,0 +1,90 @@
+"""
+Wire format benchmark: 10k mesajlı bir chat'in yanıt boyutu ve serileştirme süresi.
+
+Çalıştırma (proje kökünden):
+    python tests/bench_wire_format.py [mesaj_sayısı]
+
+Veritabanı gerekmez; satırlar sentetik üretilir ve ChatService._format_message
+ile API'nin döndürdüğü biçime çevrilir.
+"""
+
+import sys
+import os
+import gzip
+import time
+from datetime import datetime, timedelta
+
+# Projenin kök dizinini sys.path'e ekle
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, PACKAGE_PARENT)
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.services.chat_service import ChatService
+from app.routes import wire_format
+from app.routes.wire_format import OrjsonProvider, columnar
+
+REPEAT = 5
+
+
+def make_rows(count):
+    start = datetime(2026, 1, 1, 9, 0, 0)
+    rows = []
+    for i in range(count):
+        when = start + timedelta(seconds=i * 7)
+        is_user = i % 2 == 0
+        rows.append({
+            'message_id': i + 1,
+            'chat_id': 'bench-chat',
+            'model_id': None if is_user else 3,
+            'route_reason': None,
+            'content': ("Bu bir kullanıcı sorusudur, örnek metin. " * 2) if is_user
+                       else ("Yanıt paragrafı: açıklama, kod ve liste içerir. " * 8),
+            'is_user': is_user,
+            'is_complete': True,
+            'timestamp': when,
+            'created_at': when,
+        })
+    return rows
+
+
+def timed(fn):
+    best = float('inf')
+    result = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rows = make_rows(count)
+
+    (messages, format_s) = timed(lambda: [ChatService._format_message(r) for r in rows])
+    payload = {'success': True, 'messages': messages, 'count': len(messages)}
+    compact = dict(payload, messages=columnar(messages, drop=('created_at',)), format='columnar')
+
+    app = Flask(__name__)
+    providers = {'default': DefaultJSONProvider(app)}
+    if wire_format.orjson is not None:
+        providers['orjson'] = OrjsonProvider(app)
+
+    print(f"{count} mesaj; _format_message: {format_s * 1000:.1f} ms")
+    print(f"{'biçim':<24}{'bayt':>12}{'gzip':>12}{'süre (ms)':>12}")
+    for name, provider in providers.items():
+        for label, body in (('json', payload), ('compact', compact)):
+            data, seconds = timed(lambda: provider.dumps(body, separators=(',', ':')).encode('utf-8'))
+            print(f"{label + '/' + name:<24}{len(data):>12}{len(gzip.compress(data)):>12}{seconds * 1000:>12.1f}")
+    if wire_format.msgpack is not None:
+        data, seconds = timed(lambda: wire_format.msgpack.packb(compact, default=str, use_bin_type=True))
+        print(f"{'msgpack':<24}{len(data):>12}{len(gzip.compress(data)):>12}{seconds * 1000:>12.1f}")
+    else:
+        print("msgpack kurulu değil; MessagePack ölçümü atlandı")
+
+
+if __name__ == '__main__':
+    main()
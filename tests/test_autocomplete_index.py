@@ -0,0 +1,72 @@
+import sys
+import os
+
+# Projenin kök dizinini sys.path'e ekle
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, PACKAGE_PARENT)
+
+from app.services.autocomplete_index import PrefixIndex, tokenize
+
+
+def _models(*rows):
+    return PrefixIndex([
+        ({'model_id': i, 'model_name': name, 'provider_name': provider}, [
+            ('model_name', name, 3.0),
+            ('provider_name', provider, 1.0),
+        ])
+        for i, (name, provider) in enumerate(rows, start=1)
+    ])
+
+
+INDEX = _models(
+    ('GPT-4o mini', 'OpenAI'),
+    ('GPT-4o', 'OpenAI'),
+    ('Claude 3.5 Sonnet', 'Anthropic'),
+    ('Gemini 2.5 Flash', 'Google'),
+    ('Işık Sohbet', 'Yerel'),
+)
+
+
+def _ids(results):
+    return [r['model_id'] for r in results]
+
+
+def test_tokenize_folds_case_and_turkish_letters():
+    assert tokenize('Işık ŞEKER-çay') == ['isik', 'seker', 'cay']
+
+
+def test_prefix_match_ranks_exact_and_shorter_names_first():
+    results = INDEX.search('gpt 4o')
+    assert _ids(results) == [2, 1]
+    assert results[0]['match'] == 'model_name'
+
+
+def test_every_query_word_must_match():
+    assert _ids(INDEX.search('gpt flash')) == []
+    assert _ids(INDEX.search('gem fla')) == [4]
+
+
+def test_model_name_outranks_provider_name():
+    index = _models(('Assistant', 'Claude'), ('Claude Haiku', 'Anthropic'))
+    results = index.search('claude')
+    assert _ids(results) == [2, 1]
+    assert [r['match'] for r in results] == ['model_name', 'provider_name']
+
+
+def test_fuzzy_match_tolerates_typos():
+    assert _ids(INDEX.search('cluade')) == [3]
+    assert _ids(INDEX.search('sonet'))[0] == 3
+
+
+def test_turkish_fold_in_search():
+    assert _ids(INDEX.search('ISIK')) == [5]
+    assert _ids(INDEX.search('ışık')) == [5]
+
+
+def test_limit_tiebreak_and_payload_untouched():
+    index = _models(('Chat A', 'X'), ('Chat B', 'X'), ('Chat C', 'X'))
+    results = index.search('chat', limit=2, tiebreak=lambda payload: -payload['model_id'])
+    assert _ids(results) == [3, 2]
+    assert 'score' not in index.payloads[0]
+    assert index.search('   ') == []
@@ -0,0 +1,83 @@
+import sys
+import os
+
+# Projenin kök dizinini sys.path'e ekle
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, PACKAGE_PARENT)
+
+import pytest
+
+from app.services.catalog_index import (
+    CatalogIndex, _IndexState, decode_cursor, encode_cursor, fold, parse_query
+)
+
+
+def _index(count=25):
+    """Katalog önbelleği yerine sabit satırlarla kurulmuş dizin."""
+    models = [{
+        'model_id': i,
+        'model_name': f"{'Işık' if i % 2 else 'gpt'}-{i:02d}",
+        'provider_name': 'Gemini' if i % 3 == 0 else 'OpenRouter',
+        'is_active': i % 5 != 0,
+        'categories': [{'category_id': i % 4}],
+    } for i in range(1, count + 1)]
+    state = _IndexState('v1', models)
+    index = CatalogIndex()
+    index._current = lambda: state
+    return index
+
+
+def _all_pages(index, **filters):
+    pages = [index.query(limit=4, **filters)]
+    while pages[-1]['next_cursor']:
+        pages.append(index.query(limit=4, cursor=pages[-1]['next_cursor'], **filters))
+    return pages
+
+
+def test_cursor_paging_visits_every_row_once():
+    index = _index()
+    pages = _all_pages(index)
+    ids = [m['model_id'] for page in pages for m in page['data']]
+    assert sorted(ids) == list(range(1, 26))
+    assert len(ids) == len(set(ids))
+    assert pages[-1]['next_cursor'] is None
+
+
+def test_total_does_not_shrink_with_cursor():
+    index = _index()
+    pages = _all_pages(index, provider='openrouter', active=True)
+    expected = len([i for i in range(1, 26) if i % 3 and i % 5])
+    assert {page['total'] for page in pages} == {expected}
+    assert sum(page['count'] for page in pages) == expected
+
+
+def test_search_total_and_paging_with_turkish_fold():
+    index = _index()
+    pages = _all_pages(index, q='ISIK')
+    names = [m['model_name'] for page in pages for m in page['data']]
+    assert len(names) == 13 and all(n.startswith('Işık') for n in names)
+    assert {page['total'] for page in pages} == {13}
+
+
+def test_exact_page_has_no_next_cursor():
+    index = _index(8)
+    page = index.query(limit=8)
+    assert page['count'] == 8 and page['next_cursor'] is None
+
+
+def test_category_match_any_and_all():
+    index = _index()
+    any_ids = {m['model_id'] for m in index.query(category_ids=[1, 2], limit=100)['data']}
+    assert any_ids == {i for i in range(1, 26) if i % 4 in (1, 2)}
+    assert index.query(category_ids=[1, 2], match='all', limit=100)['total'] == 0
+
+
+def test_cursor_round_trip_and_invalid_values():
+    key = (fold('Işık-01'), 1)
+    assert decode_cursor(encode_cursor(key)) == key
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+    with pytest.raises(ValueError):
+        parse_query({'limit': 'x'})
+    assert parse_query({'categories': '1,2', 'active': 'true'}) == {'category_ids': [1, 2], 'active': True}
@@ -0,0 +1,58 @@
+import sys
+import os
+
+# Projenin kök dizinini sys.path'e ekle
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, PACKAGE_PARENT)
+
+from app.services.chat_list_cache import ChatListCache
+
+
+def _loader(calls, name):
+    def load():
+        calls.append(name)
+        return {'success': True, 'model_name': name}
+    return load
+
+
+def test_cached_until_invalidated():
+    cache = ChatListCache()
+    calls = []
+    assert cache.get_or_load(1, 20, _loader(calls, 'a'))['model_name'] == 'a'
+    assert cache.get_or_load(1, 20, _loader(calls, 'b'))['model_name'] == 'a'
+    cache.invalidate(1)
+    assert cache.get_or_load(1, 20, _loader(calls, 'b'))['model_name'] == 'b'
+    assert calls == ['a', 'b']
+
+
+def test_failed_load_is_not_cached():
+    cache = ChatListCache()
+    cache.get_or_load(1, 20, lambda: {'success': False})
+    calls = []
+    assert cache.get_or_load(1, 20, _loader(calls, 'a'))['success']
+    assert calls == ['a']
+
+
+def test_clear_drops_every_user_and_bumps_versions():
+    cache = ChatListCache()
+    calls = []
+    cache.get_or_load(1, 20, _loader(calls, 'old'))
+    cache.get_or_load(2, 20, _loader(calls, 'old'))
+    versions = (cache.version(1), cache.version(2))
+    cache.clear()
+    assert (cache.version(1), cache.version(2)) != versions
+    assert cache.get_or_load(1, 20, _loader(calls, 'new'))['model_name'] == 'new'
+    assert cache.get_or_load(2, 20, _loader(calls, 'new'))['model_name'] == 'new'
+
+
+def test_clear_during_load_prevents_storing_stale_result():
+    cache = ChatListCache()
+
+    def load():
+        cache.clear()   # okuma sürerken model yeniden adlandırıldı
+        return {'success': True, 'model_name': 'stale'}
+
+    cache.get_or_load(1, 20, load)
+    calls = []
+    assert cache.get_or_load(1, 20, _loader(calls, 'fresh'))['model_name'] == 'fresh'
@@ -0,0 +1,96 @@
+import sys
+import os
+
+# Projenin kök dizinini sys.path'e ekle
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, PACKAGE_PARENT)
+
+import pytest
+
+from app.services.providers.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError
+)
+
+
+def _breaker(**kwargs):
+    options = dict(window=10, min_calls=4, failure_rate=0.5, open_seconds=30.0)
+    options.update(kwargs)
+    return CircuitBreaker('test', **options)
+
+
+def _expire(breaker):
+    """Açık kalma süresini beklemeden doldurur."""
+    breaker.opened_at -= breaker.open_seconds + 1
+
+
+def test_stays_closed_below_min_calls_and_threshold():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record(False, 0.1)
+    assert breaker.state == CLOSED
+    breaker = _breaker()
+    for ok in (True, True, True, False):
+        breaker.record(ok, 0.1)
+    assert breaker.state == CLOSED and breaker.allow() is None
+
+
+def test_opens_at_failure_rate_and_rejects():
+    breaker = _breaker()
+    for ok in (True, False, True, False):
+        breaker.record(ok, 0.1)
+    assert breaker.state == OPEN
+    assert 0 < breaker.allow() <= 30
+
+
+def test_slow_successes_count_as_failures():
+    breaker = _breaker(slow_call_seconds=1.0)
+    for _ in range(4):
+        breaker.record(True, 2.0)
+    assert breaker.state == OPEN
+
+
+def test_half_open_allows_limited_probes_then_closes():
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(False, 0.1)
+    _expire(breaker)
+    assert breaker.allow() is None
+    assert breaker.state == HALF_OPEN
+    # half_open_calls=1: ikinci deneme sonuç gelene kadar bekler
+    assert breaker.allow() is not None
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+    assert breaker.status()['calls'] == 0
+
+
+def test_half_open_failure_reopens():
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(False, 0.1)
+    _expire(breaker)
+    assert breaker.allow() is None
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN and breaker.allow() > 0
+
+
+def test_release_returns_half_open_probe():
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(False, 0.1)
+    _expire(breaker)
+    assert breaker.allow() is None
+    breaker.release()
+    assert breaker.allow() is None
+
+
+def test_registry_rejects_when_model_circuit_is_open():
+    registry = CircuitBreakerRegistry()
+    registry.enabled = True
+    for _ in range(5):
+        registry.record('gemini', 'flash', False, 0.1)
+    assert registry.is_open('gemini', 'flash')
+    assert not registry.is_open('gemini', 'pro')
+    with pytest.raises(CircuitOpenError):
+        registry.check('gemini', 'flash')
+    registry.check('gemini', 'pro')
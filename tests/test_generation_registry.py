@@ -0,0 +1,48 @@
+import sys
+import os
+import time
+import threading
+
+# Projenin kök dizinini sys.path'e ekle
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, PACKAGE_PARENT)
+
+from app.services import generation_registry as registry_module
+from app.services.generation_registry import GenerationRegistry
+
+
+class _SlowGeneration(registry_module.Generation):
+    """Kayıt penceresini genişletir: arama ile ekleme arasında yarış varsa görünür olur."""
+
+    def __init__(self, *args, **kwargs):
+        time.sleep(0.05)
+        super().__init__(*args, **kwargs)
+
+
+def test_get_or_register_creates_once_under_concurrency(monkeypatch):
+    monkeypatch.setattr(registry_module, 'Generation', _SlowGeneration)
+    registry = GenerationRegistry()
+    barrier = threading.Barrier(4)
+    results = []
+
+    def post():
+        barrier.wait()
+        results.append(registry.get_or_register('chat-1', 'req-1', user_id=7))
+
+    threads = [threading.Thread(target=post) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert sorted(created for _, created in results) == [False, False, False, True]
+    assert len({id(generation) for generation, _ in results}) == 1
+    assert registry.get('chat-1', 'req-1') is results[0][0]
+
+
+def test_get_or_register_without_request_id_always_creates():
+    registry = GenerationRegistry()
+    first, created_first = registry.get_or_register('chat-1', None)
+    second, created_second = registry.get_or_register('chat-1', None)
+    assert created_first and created_second
+    assert first.request_id != second.request_id
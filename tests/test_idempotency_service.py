@@ -0,0 +1,83 @@
+import sys
+import os
+import threading
+
+# Projenin kök dizinini sys.path'e ekle
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, PACKAGE_PARENT)
+
+import pytest
+
+from app.services.idempotency_service import IdempotencyStore, IdempotencyConflict
+
+
+def test_success_is_replayed_without_running_again():
+    store = IdempotencyStore()
+    calls = []
+    fn = lambda state: calls.append(1) or {'success': True, 'n': len(calls)}
+    first, replayed_first = store.run('u1', 'k', {'m': 'hi'}, fn)
+    second, replayed_second = store.run('u1', 'k', {'m': 'hi'}, fn)
+    assert (replayed_first, replayed_second) == (False, True)
+    assert first == second and len(calls) == 1
+
+
+def test_same_key_with_different_body_conflicts():
+    store = IdempotencyStore()
+    store.run('u1', 'k', {'m': 'hi'}, lambda state: {'success': True})
+    with pytest.raises(IdempotencyConflict):
+        store.run('u1', 'k', {'m': 'other'}, lambda state: {'success': True})
+    # Kapsam farklıysa anahtar bağımsızdır
+    _, replayed = store.run('u2', 'k', {'m': 'other'}, lambda state: {'success': True})
+    assert replayed is False
+
+
+def test_failure_is_not_stored_but_state_carries_to_retry():
+    store = IdempotencyStore()
+    seen = []
+
+    def fail(state):
+        state['user_message_id'] = 42
+        return {'success': False}
+
+    def succeed(state):
+        seen.append(dict(state))
+        return {'success': True}
+
+    result, replayed = store.run('u1', 'k', {'m': 'hi'}, fail)
+    assert result == {'success': False} and replayed is False
+    result, replayed = store.run('u1', 'k', {'m': 'hi'}, succeed)
+    assert result == {'success': True} and replayed is False
+    assert seen == [{'user_message_id': 42}]
+    assert store.stats()['retry_states'] == 0
+
+
+def test_retry_state_requires_same_body():
+    store = IdempotencyStore()
+    store.run('u1', 'k', {'m': 'hi'}, lambda state: state.update(x=1) or {'success': False})
+    with pytest.raises(IdempotencyConflict):
+        store.run('u1', 'k', {'m': 'other'}, lambda state: {'success': True})
+
+
+def test_concurrent_duplicates_coalesce():
+    store = IdempotencyStore()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow(state):
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'success': True}
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(store.run('u1', 'k', {}, slow)))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(store.run('u1', 'k', {}, slow)))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert len(calls) == 1
+    assert sorted(replayed for _, replayed in results) == [False, True]
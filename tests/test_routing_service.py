@@ -0,0 +1,88 @@
+import sys
+import os
+
+# Projenin kök dizinini sys.path'e ekle
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, PACKAGE_PARENT)
+
+from app.services.routing_service import ModelRouter, _ModelEstimate
+
+
+def _router(rows):
+    """Aday listesi DB yerine verilen satırlardan gelen, keşfi kapalı router."""
+    router = ModelRouter()
+    router.explore_rate = 0.0
+    router.min_samples = 3
+    router.candidates = lambda category_id: rows
+    return router
+
+
+def _row(model_id):
+    return {'model_id': model_id, 'model_name': f'model-{model_id}', 'provider_type': 'test'}
+
+
+def test_score_without_successful_samples_is_infinite():
+    router = ModelRouter()
+    est = _ModelEstimate()
+    est.error_rate = 1.0
+    assert router._score(est) == float('inf')
+
+
+def test_score_penalizes_error_rate():
+    router = ModelRouter()
+    router.error_penalty = 4.0
+    clean, flaky = _ModelEstimate(), _ModelEstimate()
+    clean.latency_ms = flaky.latency_ms = 100.0
+    flaky.error_rate = 0.25
+    assert router._score(clean) == 100.0
+    assert router._score(flaky) == 200.0
+
+
+def test_choose_skips_model_with_only_failures():
+    router = _router([_row(1), _row(2)])
+    for _ in range(5):
+        router.observe(1, False, 0.01)
+        router.observe(2, True, 2.0)
+    model, reason = router.choose(10)
+    assert model['model_id'] == 2
+    assert reason.startswith('best')
+
+
+def test_choose_excludes_models_above_error_threshold():
+    router = _router([_row(1), _row(2)])
+    router.max_error_rate = 0.3
+    for _ in range(5):
+        router.observe(1, True, 0.1)
+        router.observe(2, True, 1.0)
+    for _ in range(3):
+        router.observe(1, False, 0.01)
+    assert router._estimates[1].error_rate > 0.3
+    model, _ = router.choose(10)
+    assert model['model_id'] == 2
+
+
+def test_choose_prefers_lowest_latency():
+    router = _router([_row(1), _row(2), _row(3)])
+    for _ in range(3):
+        router.observe(1, True, 0.5)
+        router.observe(2, True, 0.1)
+        router.observe(3, True, 0.9)
+    model, _ = router.choose(10)
+    assert model['model_id'] == 2
+
+
+def test_choose_explores_cold_models_first():
+    router = _router([_row(1), _row(2)])
+    for _ in range(3):
+        router.observe(1, True, 0.1)
+    model, reason = router.choose(10)
+    assert model['model_id'] == 2
+    assert reason.startswith('explore:cold')
+
+
+def test_choose_respects_exclude_and_empty_candidates():
+    router = _router([_row(1), _row(2)])
+    model, reason = router.choose(10, exclude=[1])
+    assert model['model_id'] == 2 and reason == 'only_candidate'
+    assert _router([]).choose(10) == (None, 'no_candidates')
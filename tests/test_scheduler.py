@@ -0,0 +1,77 @@
+import sys
+import os
+
+# Projenin kök dizinini sys.path'e ekle
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, PACKAGE_PARENT)
+
+import pytest
+
+from app.services.providers.scheduler import FairQueue, ProviderScheduler, SchedulerRejected, TokenBucket
+
+
+def _drain(queue):
+    order = []
+    while len(queue):
+        order.append(queue.head())
+        queue.pop_head()
+    return order
+
+
+def test_fair_queue_round_robins_between_users():
+    queue = FairQueue()
+    for ticket in ('a1', 'a2', 'a3'):
+        queue.push('alice', ticket)
+    queue.push('bob', 'b1')
+    queue.push('bob', 'b2')
+    assert len(queue) == 5
+    assert _drain(queue) == ['a1', 'b1', 'a2', 'b2', 'a3']
+    assert queue.head() is None
+
+
+def test_fair_queue_position_and_remove():
+    queue = FairQueue()
+    queue.push('alice', 'a1')
+    queue.push('alice', 'a2')
+    queue.push('bob', 'b1')
+    assert queue.position('a1') == 0
+    assert queue.position('b1') == 1
+    assert queue.position('a2') == 2
+    queue.remove('a1')
+    queue.remove('b1')
+    assert queue.head() == 'a2' and len(queue) == 1
+
+
+def test_token_bucket_burst_then_wait():
+    bucket = TokenBucket(rate_per_min=60, burst=2)
+    for _ in range(2):
+        assert bucket.wait_time() == 0
+        bucket.take()
+    assert 0 < bucket.wait_time() <= 1.0
+    # Bir saniyelik birikim bir token ekler
+    bucket.updated -= 1.0
+    assert bucket.wait_time() == 0
+
+
+def test_token_bucket_unlimited_when_rate_is_zero():
+    bucket = TokenBucket(rate_per_min=0, burst=1)
+    for _ in range(100):
+        bucket.take()
+    assert bucket.wait_time() == 0
+
+
+def test_scheduler_rejects_when_lane_is_full_and_release_frees_slot(monkeypatch):
+    monkeypatch.setenv('SCHEDULER_TESTPROV_KEY_CONCURRENCY', '1')
+    scheduler = ProviderScheduler()
+    scheduler.enabled = True
+    lease = scheduler.acquire('testprov', 'k1', user_id=1, max_wait=0.05)
+    with pytest.raises(SchedulerRejected) as rejected:
+        scheduler.acquire('testprov', 'k1', user_id=2, max_wait=0.05)
+    assert rejected.value.retry_after >= 1
+    # Farklı anahtar ayrı kulvardır
+    scheduler.acquire('testprov', 'k2', user_id=2, max_wait=0.05).release()
+    lease.release()
+    lease.release()  # idempotent
+    scheduler.acquire('testprov', 'k1', user_id=2, max_wait=0.05).release()
+    assert all(lane.inflight == 0 for lane in scheduler._lanes.values())
@@ -0,0 +1,106 @@
+import sys
+import os
+import json
+
+# Projenin kök dizinini sys.path'e ekle
+PACKAGE_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PACKAGE_PARENT not in sys.path:
+    sys.path.insert(0, PACKAGE_PARENT)
+
+from app.services.providers import openrouter as openrouter_module
+from app.services.providers.gemini import GeminiService
+from app.services.providers.openrouter import OpenRouterService
+from app.services.providers.response_cache import response_cache
+
+
+class _FakeStream:
+    """SSE gövdesini satır satır veren, iptal/kopma için erken biten yanıt."""
+
+    status_code = 200
+
+    def __init__(self, chunks):
+        self.lines = [f"data: {json.dumps(chunk)}".encode('utf-8') for chunk in chunks]
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, chunk_size=None):
+        return iter(self.lines)
+
+    def close(self):
+        pass
+
+
+def _gemini_chunk(text, finish=None):
+    candidate = {'content': {'parts': [{'text': text}]}}
+    if finish:
+        candidate['finishReason'] = finish
+    return {'candidates': [candidate]}
+
+
+def _openrouter_chunk(text, finish=None):
+    return {'choices': [{'delta': {'content': text}, 'finish_reason': finish}]}
+
+
+def _run_gemini(monkeypatch, chunks, prompt):
+    calls = []
+
+    def post(self, url, headers, build_payload, handle, stream=False):
+        calls.append(url)
+        return _FakeStream(chunks)
+
+    monkeypatch.setattr(GeminiService, '_post', post)
+    service = GeminiService().configured('test-key', 'gemini-test')
+    first = list(service.stream_content(prompt, cache=True))
+    second = list(service.stream_content(prompt, cache=True))
+    return first, second, calls
+
+
+def _run_openrouter(monkeypatch, chunks, prompt):
+    calls = []
+
+    def send(provider, model, request, policy=None):
+        calls.append(model)
+        return _FakeStream(chunks)
+
+    monkeypatch.setattr(openrouter_module, 'send_with_resilience', send)
+    service = OpenRouterService().configured('test-key', 'openrouter/test')
+    first = list(service.stream_content(prompt, cache=True))
+    second = list(service.stream_content(prompt, cache=True))
+    return first, second, calls
+
+
+def test_gemini_truncated_stream_is_not_cached(monkeypatch):
+    response_cache.clear()
+    first, second, calls = _run_gemini(monkeypatch, [_gemini_chunk('yarım')], 'truncated gemini')
+    assert first[-1]['finish_reason'] is None
+    assert len(calls) == 2
+    assert not any(event.get('cached') for event in second)
+
+
+def test_gemini_finished_stream_is_replayed(monkeypatch):
+    response_cache.clear()
+    chunks = [_gemini_chunk('mer'), _gemini_chunk('haba', 'STOP')]
+    _, second, calls = _run_gemini(monkeypatch, chunks, 'finished gemini')
+    assert len(calls) == 1
+    assert second == [
+        {'type': 'delta', 'text': 'merhaba'},
+        {'type': 'done', 'model': 'gemini-test', 'usage': {}, 'finish_reason': 'STOP', 'cached': True},
+    ]
+
+
+def test_openrouter_truncated_stream_is_not_cached(monkeypatch):
+    response_cache.clear()
+    first, second, calls = _run_openrouter(monkeypatch, [_openrouter_chunk('yarım')], 'truncated openrouter')
+    assert first[-1]['finish_reason'] is None
+    assert len(calls) == 2
+    assert not any(event.get('cached') for event in second)
+
+
+def test_openrouter_finished_stream_is_replayed(monkeypatch):
+    response_cache.clear()
+    chunks = [_openrouter_chunk('mer'), _openrouter_chunk('haba', 'stop')]
+    _, second, calls = _run_openrouter(monkeypatch, chunks, 'finished openrouter')
+    assert len(calls) == 1
+    assert second[0] == {'type': 'delta', 'text': 'merhaba'}
+    assert second[-1]['cached'] is True